@@ -8,38 +8,35 @@ class ForwardAction(MoveAction):
     matching card is drawn by the player.
     """
 
-    def __init__(self, dragon, step, volcanoe_zones, caves):
+    def __init__(self, dragon, step, gameboard):
         """
         This method initializes the forward action object.
 
         input:
         - dragon: the dragon instance that is going to move
         - step: the number of steps the dragon is going to move
-        - volcanoe_zones: the volcano zones in the board
-        - caves: the caves in the board
+        - gameboard: the gameboard
 
         return: None
         """
-        super().__init__(dragon, step, volcanoe_zones, caves)
+        super().__init__(dragon, step, gameboard)
 
-    def execute(self):
+    def outcome(self):
         """
-        This method is used to execute the forward action.
-        If destination is not None, the player moves to the destination.
-        It then returns the end turn and end game flag to indicate whether 
-        the player's turn end or the game end.
+        This method is used to find the outcome of the forward action.
+        If destination is not None and unoccupied, the player moves to 
+        the destination. Otherwise, the player's turn ends.
 
-        return: bool, bool
+        return: int or None, int, bool, bool
         """
         if self.destination is not None:
             if self._valid_destination(self.destination):
-                self.dragon.move(self.destination,
-                                 self.volcanoe_zones, self.caves)
-                self.dragon.set_remaining_steps(self.remaining_steps)
+                return (self.destination, self.remaining_steps,
+                        self.end_turn, self.end_game)
             else:
                 self.end_turn = True
                 self.end_game = False
-        return self.end_turn, self.end_game
+        return None, self.remaining_steps, self.end_turn, self.end_game
 
     def _find_destination(self, pos):
         """
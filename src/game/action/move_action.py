@@ -11,24 +11,21 @@ class MoveAction(ABC):
     and the player's turn end.
     """
 
-    def __init__(self, dragon, step, volcanoe_zones, caves):
+    def __init__(self, dragon, step, gameboard):
         """
         This method initializes the move action object.
 
         input:
         - dragon: the dragon instance that is going to move
         - step: the number of steps the dragon is going to move
-        - volcanoe_zones: the volcano zones in the board
-        - caves: the caves in the board
+        - gameboard: the gameboard
 
         return: None
         """
         self.dragon = dragon
         self.step = step
-        self.volcanoe_zones = volcanoe_zones
-        self.caves = caves
-        self.volcano_size = len(volcanoe_zones) * \
-            len(volcanoe_zones[0].get_volcanoes())
+        self.gameboard = gameboard
+        self.volcano_size = gameboard.get_size()
         self.remaining_steps = self.dragon.get_remaining_steps()
         self.end_turn = False   # Flag to check if the player's turn ends
         self.end_game = False   # Flag to check if the game ends
@@ -45,22 +42,33 @@ class MoveAction(ABC):
 
         return: bool
         """
-        if destination >= 0:
-            vzone_index = destination // 3
-            v_index = destination % 3
-            volcano = self.volcanoe_zones[vzone_index].get_volcanoes()[v_index]
-            return volcano.can_enter()
-        else:
-            vol_pos = abs(destination) - 1
-            vzone_index = vol_pos // 3
-            v_index = vol_pos % 3
-            volcano = self.volcanoe_zones[vzone_index].get_volcanoes()[v_index]
-            return self.caves[volcano.get_cave_id()].can_enter()
+        return self.gameboard.is_free(destination)
 
-    @abstractmethod
     def execute(self):
         """
         This method is used to execute the move action.
+        The dragon moves to the destination of the outcome (if any).
+        It then returns the end turn and end game flag to indicate whether 
+        the player's turn end or the game end.
+
+        return: bool, bool
+        """
+        destination, remaining_steps, end_turn, end_game = self.outcome()
+        if destination is not None:
+            self.dragon.move(destination, self.gameboard)
+            self.dragon.set_remaining_steps(remaining_steps)
+        return end_turn, end_game
+
+    @abstractmethod
+    def outcome(self):
+        """
+        This method is used to find the outcome of the move action 
+        without changing the dragon or the gameboard.
+        An action is resolved once, so this method should be called once.
+
+        return: int or None, int, bool, bool (the destination, or None 
+                if the dragon does not move, the remaining steps after 
+                the move and the end turn and end game flag)
         """
         pass
 
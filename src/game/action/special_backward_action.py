@@ -8,19 +8,18 @@ class SpecialBackwardAction(BackwardAction):
     volcano.
     """
 
-    def __init__(self, dragon, step, volcanoe_zones, caves):
+    def __init__(self, dragon, step, gameboard):
         """
         This method initializes the backward action object.
 
         input:
         - dragon: the dragon instance that is going to move
         - step: the number of steps the dragon is going to move
-        - volcanoe_zones: the volcano zones in the board
-        - caves: the caves in the board
+        - gameboard: the gameboard
 
         return: None
         """
-        super().__init__(dragon, step, volcanoe_zones, caves)
+        super().__init__(dragon, step, gameboard)
 
     def _valid_destination(self, destination):
         """
@@ -31,18 +30,17 @@ class SpecialBackwardAction(BackwardAction):
         always check the next volcano until it finds an unoccupied
         volcano.
         """
-        final_destination = None
-        while destination != self.dragon.get_board_pos():
-            vzone_index = destination // 3
-            v_index = destination % 3
-            volcano = self.volcanoe_zones[vzone_index].get_volcanoes()[v_index]
-            # Check whether volcano is occupied
-            if not volcano.can_enter():
-                destination = (destination - 1) % self.volcano_size
-                self.remaining_steps += 1
-            else:
-                final_destination = destination
-                break
+        # The nearest free volcano is found from the occupancy of the 
+        # gameboard instead of checking the volcanoes one by one
+        final_destination, skipped = \
+            self.gameboard.find_free_tile_behind(destination)
+        # The search stops at the dragon's own volcano
+        limit = (destination - self.dragon.get_board_pos()) % self.volcano_size
+        if final_destination is None or skipped >= limit:
+            self.remaining_steps += limit
+            final_destination = None
+        else:
+            self.remaining_steps += skipped
 
         # In extreme case, the number of player is the same as the
         # number of volcanoes, the player will not move.
@@ -51,4 +49,4 @@ class SpecialBackwardAction(BackwardAction):
         # Unoccupied volcano found
         else:
             self.destination = final_destination
-            return True
\ No newline at end of file
+            return True
@@ -9,33 +9,29 @@ class TeleportCaveAction(MoveAction):
     then it will not move backward.
     """
 
-    def __init__(self, dragon, step, volcanoe_zones, caves):
+    def __init__(self, dragon, step, gameboard):
         """
         This method initializes the backward action object.
 
         input:
         - dragon: the dragon instance that is going to move
         - step: the number of steps the dragon is going to move
-        - volcanoe_zones: the volcano zones in the board
-        - caves: the caves in the board
+        - gameboard: the gameboard
 
         return: None
         """
-        super().__init__(dragon, step, volcanoe_zones, caves)
+        super().__init__(dragon, step, gameboard)
 
-    def execute(self):
+    def outcome(self):
         """
-        This method is used to execute the teleport cave action.
-        If destination is not None, the player moves to the destination.
-        It then returns the end turn  and end game flag to indicate 
-        whether the player's turn end.
+        This method is used to find the outcome of the teleport cave 
+        action. If destination is not None, the player moves to the 
+        destination. The player's turn does not end.
 
-        return: bool, bool
+        return: int or None, int, bool, bool
         """
-        if self.destination is not None:
-            self.dragon.move(self.destination, self.volcanoe_zones, self.caves)
-            self.dragon.set_remaining_steps(self.remaining_steps)
-        return self.end_turn, self.end_game
+        return (self.destination, self.remaining_steps,
+                self.end_turn, self.end_game)
 
     def _find_destination(self, pos):
         """
@@ -43,30 +39,23 @@ class TeleportCaveAction(MoveAction):
         It checks whether the dragon in a cave or not.
         If the dragon is currently in a cave, the dragon does not need to
         move. If the dragon is not in a cave, the dragon will move backward
-        until it finds an empty cave. 
+        until it finds an empty cave. The nearest empty cave is looked up 
+        in the gameboard's index of unoccupied caves.
 
         return: int
         """
         # When dragon is out of the cave, the dragon will move backward
         # until it finds an empty cave.
         if pos >= 0:
-            destination = None
-            i = (pos - 1) % self.volcano_size
-            self.remaining_steps += 1
-            while i != pos:
-                vzone_index = i // 3
-                v_index = i % 3
-                volcano = self.volcanoe_zones[vzone_index].get_volcanoes()[
-                    v_index]
-                cave_id = volcano.get_cave_id()
-                if cave_id is not None:
-                    cave = self.caves[cave_id]
-                    if cave.can_enter():
-                        destination = -(i + 1)
-                        self.remaining_steps += 1
-                        break
-                i = (i - 1) % self.volcano_size
-                self.remaining_steps += 1
+            cave_tile, distance = self.gameboard.find_free_cave_behind(pos)
+            if cave_tile is not None:
+                destination = -(cave_tile + 1)
+                # One step for each tile moved and one to enter the cave
+                self.remaining_steps += distance + 1
+            else:
+                destination = None
+                # Every tile is checked before giving up
+                self.remaining_steps += self.volcano_size
 
         # When dragon is in the cave (remain in the cave)
         else:
@@ -0,0 +1,110 @@
+from collections import OrderedDict
+
+
+class AssetCache:
+    """
+    This class is used to cache the loaded and scaled images.
+    The same image is usually loaded many times with the same scale
+    (e.g. every volcano of the same animal, the back of every chit card),
+    so the decoded and scaled surface is kept and shared instead.
+    The least recently used surfaces are evicted when the total size of
+    the cached surfaces exceeds the byte budget.
+    The cache is not specific to images, any surface (e.g. rendered text)
+    can be cached with its own key.
+    """
+    MAX_BYTES = 64 * 1024 * 1024  # Default byte budget (64 MB)
+
+    def __init__(self, max_bytes=MAX_BYTES):
+        """
+        This method initializes the asset cache.
+
+        input:
+        - max_bytes: the maximum number of bytes kept in the cache
+
+        return: None
+        """
+        self.max_bytes = max_bytes
+        self.surfaces = OrderedDict()   # key -> (surface, byte size)
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key):
+        """
+        This method returns the cached surface of the key.
+        The key is a tuple of (path, scale, target size).
+
+        input:
+        - key: the key of the surface
+
+        return: the cached surface, or None if it is not cached
+        """
+        entry = self.surfaces.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self.surfaces.move_to_end(key)
+        return entry[0]
+
+    def put(self, key, surface):
+        """
+        This method stores the surface in the cache and evicts the least
+        recently used surfaces if the byte budget is exceeded.
+        A surface larger than the whole budget is not cached.
+
+        input:
+        - key: the key of the surface
+        - surface: the surface to cache
+
+        return: None
+        """
+        size = AssetCache._surface_bytes(surface)
+        if size > self.max_bytes:
+            return
+        if key in self.surfaces:
+            self.bytes -= self.surfaces.pop(key)[1]
+        self.surfaces[key] = (surface, size)
+        self.bytes += size
+        while self.bytes > self.max_bytes:
+            _, (_, evicted_size) = self.surfaces.popitem(last=False)
+            self.bytes -= evicted_size
+            self.evictions += 1
+
+    def clear(self):
+        """
+        This method removes all the cached surfaces.
+        Should be called when the display mode changes.
+
+        return: None
+        """
+        self.surfaces.clear()
+        self.bytes = 0
+
+    def stats(self):
+        """
+        This method returns the statistics of the cache.
+
+        return: dict
+        """
+        return {
+            "entries": len(self.surfaces),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions
+        }
+
+    @staticmethod
+    def _surface_bytes(surface):
+        """
+        This method returns the number of bytes used by the surface pixels.
+
+        input:
+        - surface: the surface to measure
+
+        return: int
+        """
+        return surface.get_pitch() * surface.get_height()
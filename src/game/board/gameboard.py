@@ -5,8 +5,6 @@ from gamecard.animal_type import AnimalType
 from memorable import Memorable
 
 import random
-import pygame
-import math
 
 
 class GameBoard(Memorable):
@@ -15,30 +13,226 @@ class GameBoard(Memorable):
     The gameboard contains the caves and volcanoe zones.
     The gameboard manages the creation and arrangement of the caves and 
     volcanoe zones.
+    The gameboard does not need a window, the display of the gameboard is 
+    handled by GameBoardView.
+
+    Besides the land objects, the gameboard keeps flat arrays of the board 
+    so a board position is resolved directly:
+    - position >= 0 is the index of a volcano (tile) on the board
+    - position < 0 is the cave next to the tile -(position+1)
+    The occupancy of all the lands is kept in a single integer bitset, 
+    where bit i is tile i and bit (size + i) is the cave next to tile i.
+    The nearest unoccupied tile and the nearest unoccupied cave behind a 
+    tile are both found from the highest free bit below the tile, of the 
+    tile bits and of the cave bits, so an update or a search does a few 
+    integer operations instead of walking the board.
     """
     MIN_CAVE = 4    # Minimum number of caves
 
-    def __init__(self, window, seed, dragons, size, animal_num, cave_pos_ls):
+    def __init__(self, seed, dragons, size, animal_num, cave_pos_ls,
+                 rng=None, dragon_states=None):
         """
         This method initializes the gameboard.
 
         input:
-        - window: the pygame window
         - seed: the random seed for randomization
         - dragons: the list of dragons
         - size: the number of volcanoes
         - animal_num: the number of animal types
         - cave_pos_ls: the list of cave positions (if set by players)
+        - rng: the random.Random used to shuffle the layout, None for 
+               random.Random(seed)
+        - dragon_states: the saved state of each dragon (from Dragon.save), 
+                         None to start the dragons at their caves
 
         return: None
         """
-        self.window = window
         self.seed = seed
+        self.rng = rng if rng is not None else random.Random(seed)
         self.size = size
         self.animal_num = animal_num
+        self.dragons = dragons
         self.volcanoe_zones = self._create_vzones()
+        self.tiles = []             # Tile index -> volcano
+        for volcano_zone in self.volcanoe_zones:
+            self.tiles.extend(volcano_zone.get_volcanoes())
+        self.tile_animals = [volcano.get_animal() for volcano in self.tiles]
+        self.tile_cave = [None] * len(self.tiles)   # Tile index -> cave id
+        self.cave_tile = []                         # Cave id -> tile index
+        self.occupancy = 0          # Occupancy bitset of tiles and caves
         self.caves = self._create_caves(dragons, cave_pos_ls)
-        self._set_position(dragons)
+        self.cave_mask = 0          # Bitset of the tiles next to a cave
+        for tile in self.cave_tile:
+            self.cave_mask |= 1 << tile
+        self._set_dragon_pos(dragons, dragon_states)
+
+    def get_size(self):
+        """
+        The getter method to return the number of volcanoes.
+
+        return: int
+        """
+        return self.size
+
+    def get_dragons(self):
+        """
+        The getter method to return the dragons on the gameboard.
+
+        return: list
+        """
+        return self.dragons
+
+    def land_at(self, pos):
+        """
+        This method returns the land at the board position.
+
+        input:
+        - pos: the board position
+
+        return: Volcano or Cave
+        """
+        if pos >= 0:
+            return self.tiles[pos]
+        return self.caves[self.tile_cave[-pos - 1]]
+
+    def animal_at(self, pos):
+        """
+        This method returns the animal type of the land at the board 
+        position.
+
+        input:
+        - pos: the board position
+
+        return: AnimalType
+        """
+        if pos >= 0:
+            return self.tile_animals[pos]
+        return self.caves[self.tile_cave[-pos - 1]].get_animal()
+
+    def get_cave_id(self, tile):
+        """
+        This method returns the id of the cave next to the tile.
+
+        input:
+        - tile: the tile index
+
+        return: int or None if there is no cave next to the tile
+        """
+        return self.tile_cave[tile]
+
+    def get_cave_tile(self, cave_id):
+        """
+        This method returns the index of the tile next to the cave.
+
+        input:
+        - cave_id: the cave id
+
+        return: int
+        """
+        return self.cave_tile[cave_id]
+
+    def is_free(self, pos):
+        """
+        This method checks if a dragon can enter the land at the board 
+        position (the land is not occupied).
+
+        input:
+        - pos: the board position
+
+        return: bool
+        """
+        return not (self.occupancy >> self._bit(pos)) & 1
+
+    def set_occupied(self, pos, status):
+        """
+        This method sets the occupied status of the land at the board 
+        position.
+
+        input:
+        - pos: the board position
+        - status: True if occupied, False otherwise
+
+        return: None
+        """
+        if status:
+            self.occupancy |= 1 << self._bit(pos)
+        else:
+            self.occupancy &= ~(1 << self._bit(pos))
+        self.land_at(pos).set_occupied_status(status)
+
+    def get_occupancy(self):
+        """
+        The getter method to return the occupancy bitset.
+
+        return: int
+        """
+        return self.occupancy
+
+    def set_occupancy(self, occupancy):
+        """
+        The setter method to restore an occupancy bitset (e.g. returned by
+        get_occupancy). Only the lands whose status changes are updated.
+
+        input:
+        - occupancy: the occupancy bitset
+
+        return: None
+        """
+        changed = self.occupancy ^ occupancy
+        self.occupancy = occupancy
+        while changed:
+            bit = (changed & -changed).bit_length() - 1
+            changed &= changed - 1
+            pos = bit if bit < self.size else -(bit - self.size + 1)
+            status = bool((occupancy >> bit) & 1)
+            self.land_at(pos).set_occupied_status(status)
+
+    def find_free_cave_behind(self, tile):
+        """
+        This method finds the nearest unoccupied cave behind the tile 
+        (moving backward around the board). The cave next to the tile 
+        itself is not considered.
+
+        input:
+        - tile: the tile index
+
+        return: int, int (the tile next to the cave and its distance from 
+                the tile), or None, None if there is no unoccupied cave
+        """
+        # Tiles next to the unoccupied caves, except the tile itself
+        free = self.cave_mask & ~(self.occupancy >> self.size) \
+            & ~(1 << tile)
+        behind = free & ((1 << tile) - 1)   # Free caves next to 0 to tile - 1
+        if behind:
+            cave_tile = behind.bit_length() - 1
+        elif free:
+            # Wrap around the board to the last cave
+            cave_tile = free.bit_length() - 1
+        else:
+            return None, None
+        return cave_tile, (tile - cave_tile) % self.size
+
+    def find_free_tile_behind(self, tile):
+        """
+        This method finds the nearest unoccupied tile at or behind the 
+        tile (moving backward around the board).
+
+        input:
+        - tile: the tile index
+
+        return: int, int (the unoccupied tile and its distance from the 
+                tile), or None, None if all the tiles are occupied
+        """
+        free = ~self.occupancy & ((1 << self.size) - 1)
+        behind = free & ((2 << tile) - 1)   # Free tiles 0 to tile
+        if behind:
+            free_tile = behind.bit_length() - 1
+        elif free:
+            # Wrap around the board to the last free tile
+            free_tile = free.bit_length() - 1
+        else:
+            return None, None
+        return free_tile, (tile - free_tile) % self.size
 
     def get_volcanoe_zones(self):
         """
@@ -56,18 +250,17 @@ class GameBoard(Memorable):
         """
         return self.caves
 
-    def draw(self):
+    def get_lands(self):
         """
-        This method is used to draw the gameboard on the window display.
+        This method returns all the volcanoes and caves in drawing order.
 
-        return: None
+        return: list
         """
-        self.window.fill((221, 209, 178))
+        lands = []
         for volcano_zone in self.volcanoe_zones:
-            for volcano in volcano_zone.get_volcanoes():
-                volcano.draw(self.window)
-        for cave in self.caves:
-            cave.draw(self.window)
+            lands.extend(volcano_zone.get_volcanoes())
+        lands.extend(self.caves)
+        return lands
 
     def save(self):
         """
@@ -90,6 +283,10 @@ class GameBoard(Memorable):
 
         return: None
         """
+        # The compact saves do not keep the volcano zones, which are made
+        # again from the seed
+        if "volcanoe_zones" not in state:
+            return
         for i in range(len(self.volcanoe_zones)):
             self.volcanoe_zones[i].load(state["volcanoe_zones"][i])
 
@@ -121,11 +318,10 @@ class GameBoard(Memorable):
             cave = Cave(i, AnimalType(i), LandType.CAVE, cave_pos_ls[i])
             caves.append(cave)
             vol_pos = abs(cave_pos_ls[i]) - 1
-            vzone_index = vol_pos // 3
-            v_index = vol_pos % 3
-            volcanoes = self.volcanoe_zones[vzone_index].get_volcanoes()
             # Mark the cave id on the corresponding volcano
-            volcanoes[v_index].set_cave_id(i)
+            self.tiles[vol_pos].set_cave_id(i)
+            self.tile_cave[vol_pos] = i
+            self.cave_tile.append(vol_pos)
 
         return caves
 
@@ -146,8 +342,7 @@ class GameBoard(Memorable):
             for _ in range(int(self.size//self.animal_num)):
                 animal_ls.append(AnimalType(i))
         # Shuffle the animal list (same as shuffling the final volcano zones outcome)
-        random.seed(self.seed)
-        random.shuffle(animal_ls)
+        self.rng.shuffle(animal_ls)
 
         # Create volcanoe zones
         volcano_zones = []
@@ -158,102 +353,41 @@ class GameBoard(Memorable):
         # return volcanoe zones
         return volcano_zones
 
-    def _set_position(self, dragons):
+    def _set_dragon_pos(self, dragons, dragon_states=None):
         """
-        This method sets the display position of the caves and volcanoes.
+        This method sets the starting position of the dragons on the caves,
+        or their saved position if the game is resumed.
 
         input:
         - dragons: the list of dragons
+        - dragon_states: the saved state of each dragon, or None
 
         return: None
         """
-        window_w = self.window.get_width()
-        window_h = self.window.get_height()
-
-        self._set_cave_pos(window_w, window_h)
-        self._set_vol_pos(window_w, window_h)
-        self._set_dragon_pos(dragons)
-
-    def _set_cave_pos(self, window_w, window_h):
-        """
-        This method sets the display position of the caves.
-        It arranges the caves in a circular pattern where the radius is 
-        slightly larger than the volcanoes' circular pattern.
-        Tile size and tile density control the radius of the circular 
-        pattern.
-        The higher the tile density, the smaller the interval between the 
-        caves.
-
-        input:
-        - window_w: the width of the window
-        - window_h: the height of the window
-
-        return: None
-        """
-        tile_num = self.size
-        tile_size = 51.5
-        tile_density = 4.5
-
-        for cave in self.caves:
-            i = abs(cave.get_board_pos()) - 1
-            x = window_w // 2 + (tile_size * (tile_num // tile_density)) * (
-                pygame.math.Vector2(1, 0).rotate_rad(
-                    i * 2 * math.pi / tile_num)
-            ).x
-            y = window_h // 2 + (tile_size * (tile_num // tile_density)) * (
-                pygame.math.Vector2(1, 0).rotate_rad(
-                    i * 2 * math.pi / tile_num)
-            ).y
-            cave.set_pos(x, y)
-
-    def _set_vol_pos(self, window_w, window_h):
-        """
-        This method sets the display position of the volcanoes.
-        It arranges the volcanoes in a circular pattern where the radius is 
-        slightly smaller than the caves' circular pattern.
-        Tile size and tile density control the radius of the circular 
-        pattern.
-        The higher the tile density, the smaller the interval between the 
-        volcanoes.
-
-        input:
-        - window_w: the width of the window
-        - window_h: the height of the window
-
-        return: None
-        """
-        tile_num = self.size
-        tile_size = 43
-        tile_density = 4.5
-
-        for i in range(tile_num):
-            x = window_w // 2 + (tile_size * (tile_num // tile_density)) * (
-                pygame.math.Vector2(1, 0).rotate_rad(
-                    i * 2 * math.pi / tile_num)
-            ).x
-            y = window_h // 2 + (tile_size * (tile_num // tile_density)) * (
-                pygame.math.Vector2(1, 0).rotate_rad(
-                    i * 2 * math.pi / tile_num)
-            ).y
+        if dragon_states is not None:
+            for i in range(len(dragons)):
+                dragons[i].move(dragon_states[i]["board_pos"], self)
+                dragons[i].load(dragon_states[i])
+            return
 
-            vzone_index = i // 3
-            v_index = i % 3
-            volcanoes = self.volcanoe_zones[vzone_index].get_volcanoes()
-            volcanoes[v_index].set_pos(x, y)
+        # Set the starting position of the players on the board
+        for i in range(len(dragons)):
+            index = dragons[i].get_id()    # The index of the cave
+            starting_point = self.caves[index].get_board_pos()
+            dragons[i].move(starting_point, self)
+            # Set the remaining steps of the dragons
+            dragons[i].set_remaining_steps(self.size + 2)
 
-    def _set_dragon_pos(self, dragons):
+    def _bit(self, pos):
         """
-        This method sets the starting position of the dragons on the caves.
+        This method returns the bit of the board position in the 
+        occupancy bitset.
 
         input:
-        - dragons: the list of dragons
+        - pos: the board position
 
-        return: None
+        return: int
         """
-        # Set the starting position of the players on the board
-        for i in range(len(dragons)):
-            index = dragons[i].get_id()    # The index of the cave
-            starting_point = self.caves[index].get_board_pos()
-            dragons[i].move(starting_point, self.volcanoe_zones, self.caves)
-            # Set the remaining steps of the dragons
-            dragons[i].set_remaining_steps(self.size + 2)
\ No newline at end of file
+        if pos >= 0:
+            return pos
+        return self.size - pos - 1
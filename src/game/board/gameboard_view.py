@@ -0,0 +1,178 @@
+import pygame
+import math
+
+
+class GameBoardView:
+    """
+    This class is used to display the gameboard on the window.
+    It arranges the caves, volcanoes and dragons of the gameboard on the 
+    window and draws them.
+    The background, volcanoes and caves never change once they are 
+    positioned, so they are rendered once into a static layer.
+    """
+    BG_COLOR = (221, 209, 178)
+
+    def __init__(self, window, gameboard):
+        """
+        This method initializes the gameboard view.
+
+        input:
+        - window: the pygame window
+        - gameboard: the gameboard to display
+
+        return: None
+        """
+        self.window = window
+        self.gameboard = gameboard
+        self.static_layer = None    # Pre-rendered background, volcanoes and caves
+        self.layout_size = None     # The window size the positions are set for
+        self._set_position()
+
+    def draw(self, rect=None):
+        """
+        This method is used to draw the gameboard on the window display.
+        The static layer is drawn instead of every volcano and cave.
+        The layout and the static layer are updated if the window size 
+        changes.
+
+        input:
+        - rect: the area of the window to draw, None for the whole window
+
+        return: None
+        """
+        if self.layout_size != self.window.get_size():
+            self._set_position()
+        if self.static_layer is None:
+            self.static_layer = self._create_static_layer()
+        if rect is None:
+            self.window.blit(self.static_layer, (0, 0))
+        else:
+            self.window.blit(self.static_layer, rect, rect)
+
+    def invalidate_static_layer(self):
+        """
+        This method discards the static layer, so it is rebuilt in the 
+        next draw. Should be called if the layout of the volcanoes or 
+        caves changes.
+
+        return: None
+        """
+        self.static_layer = None
+
+    def get_dirty_rects(self):
+        """
+        This method returns the areas of the volcanoes and caves that 
+        changed since the last call (e.g. a dragon entered or left).
+
+        return: list of pygame.Rect
+        """
+        rects = []
+        for land in self.gameboard.get_lands():
+            if land.is_dirty():
+                if land.get_prev_rect() is not None:
+                    rects.append(land.get_prev_rect())
+                rects.append(land.get_rect())
+                land.clear_dirty()
+        return rects
+
+    def _create_static_layer(self):
+        """
+        This method renders the background, volcanoes and caves into an 
+        offscreen surface of the window size.
+
+        return: pygame.Surface
+        """
+        layer = pygame.Surface(self.window.get_size()).convert()
+        layer.fill(GameBoardView.BG_COLOR)
+        for land in self.gameboard.get_lands():
+            land.draw(layer)
+        return layer
+
+    def _set_position(self):
+        """
+        This method sets the display position of the caves, volcanoes and 
+        dragons for the current window size.
+
+        return: None
+        """
+        window_w = self.window.get_width()
+        window_h = self.window.get_height()
+
+        self._set_cave_pos(window_w, window_h)
+        self._set_vol_pos(window_w, window_h)
+        self._set_dragon_pos()
+        self.layout_size = (window_w, window_h)
+        self.invalidate_static_layer()
+
+    def _set_cave_pos(self, window_w, window_h):
+        """
+        This method sets the display position of the caves.
+        It arranges the caves in a circular pattern where the radius is 
+        slightly larger than the volcanoes' circular pattern.
+        Tile size and tile density control the radius of the circular 
+        pattern.
+        The higher the tile density, the smaller the interval between the 
+        caves.
+
+        input:
+        - window_w: the width of the window
+        - window_h: the height of the window
+
+        return: None
+        """
+        tile_num = self.gameboard.get_size()
+        tile_size = 51.5
+        tile_density = 4.5
+
+        for cave in self.gameboard.get_caves():
+            i = abs(cave.get_board_pos()) - 1
+            x = window_w // 2 + (tile_size * (tile_num // tile_density)) * (
+                pygame.math.Vector2(1, 0).rotate_rad(
+                    i * 2 * math.pi / tile_num)
+            ).x
+            y = window_h // 2 + (tile_size * (tile_num // tile_density)) * (
+                pygame.math.Vector2(1, 0).rotate_rad(
+                    i * 2 * math.pi / tile_num)
+            ).y
+            cave.set_pos(x, y)
+
+    def _set_vol_pos(self, window_w, window_h):
+        """
+        This method sets the display position of the volcanoes.
+        It arranges the volcanoes in a circular pattern where the radius is 
+        slightly smaller than the caves' circular pattern.
+        Tile size and tile density control the radius of the circular 
+        pattern.
+        The higher the tile density, the smaller the interval between the 
+        volcanoes.
+
+        input:
+        - window_w: the width of the window
+        - window_h: the height of the window
+
+        return: None
+        """
+        tile_num = self.gameboard.get_size()
+        tile_size = 43
+        tile_density = 4.5
+
+        for i in range(tile_num):
+            x = window_w // 2 + (tile_size * (tile_num // tile_density)) * (
+                pygame.math.Vector2(1, 0).rotate_rad(
+                    i * 2 * math.pi / tile_num)
+            ).x
+            y = window_h // 2 + (tile_size * (tile_num // tile_density)) * (
+                pygame.math.Vector2(1, 0).rotate_rad(
+                    i * 2 * math.pi / tile_num)
+            ).y
+            self.gameboard.land_at(i).set_pos(x, y)
+
+    def _set_dragon_pos(self):
+        """
+        This method sets the display position of the dragons to the 
+        display position of the land they are on.
+
+        return: None
+        """
+        for dragon in self.gameboard.get_dragons():
+            dragon.move(dragon.get_board_pos(), self.gameboard)
@@ -42,6 +42,8 @@ class Land(Drawable, ABC):
 
         return: None
         """
+        if self.occupied != status:
+            self.mark_dirty()
         self.occupied = status
 
     @abstractmethod
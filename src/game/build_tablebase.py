@@ -0,0 +1,165 @@
+from engine.card_belief import CardBelief
+from engine.game_engine import GameEngine
+from engine.memory_policy import MemoryPolicy
+from engine.simulator import Simulator
+from engine.tablebase import Tablebase
+from engine.tablebase_policy import TablebasePolicy
+from engine.win_solver import WinSolver
+
+import argparse
+import random
+import time
+
+
+class BuildTablebase:
+    """
+    This class is the offline job that writes the tablebase of the bots.
+    Each game (a seed and a number of players, with the standard
+    gameboard settings) is played by the memory policy, and once enough
+    chit cards are seen for the solver, every turn whose state is not in
+    the table yet is solved: the best flip of every state reachable from
+    there is written to the tablebase file. A game is played several
+    times with other card picks, to cover more states, and the games are
+    written with the table, as the game only picks these seeds against
+    the bots. At the end, the games are played again with the tablebase
+    policy to measure the share of the flips found in the table.
+    Run this class with --help to see the options, e.g.
+    python src/game/build_tablebase.py --players 2 3 --games 100
+    """
+
+    def __init__(self, args=None):
+        """
+        This method initializes the job from the command line arguments.
+
+        input:
+        - args: the list of arguments, None for the command line
+
+        return: None
+        """
+        parser = argparse.ArgumentParser(
+            description="Write the tablebase of the Fiery Dragons bots.")
+        parser.add_argument("--games", type=int, default=10,
+                            help="number of games of each number of players")
+        parser.add_argument("--seed", type=int, default=0,
+                            help="seed of the first game")
+        parser.add_argument("--players", type=int, nargs="+", default=[2],
+                            help="numbers of players")
+        parser.add_argument("--runs", type=int, default=10,
+                            help="plays of each game with other card picks")
+        parser.add_argument("--checks", type=int, default=3,
+                            help="plays of each game to measure the hit rate")
+        parser.add_argument("--min-seen", type=int, default=12,
+                            help="chit cards seen before solving")
+        parser.add_argument("--max-states", type=int,
+                            default=WinSolver.MAX_STATES,
+                            help="states searched before giving up")
+        parser.add_argument("--output", default=Tablebase.DEFAULT_PATH,
+                            help="tablebase file to write")
+        self.args = parser.parse_args(args)
+        self.solver = WinSolver(self.args.max_states, every_unseen=True)
+        self.records = {}   # Key -> (chit card index, chance to win)
+
+    def run(self):
+        """
+        Solve the games, write the tablebase file and measure its hit
+        rate.
+
+        return: None
+        """
+        start = time.perf_counter()
+        solved = 0
+        games = []
+        for player_num in self.args.players:
+            for seed in range(self.args.seed,
+                              self.args.seed + self.args.games):
+                turn_num = 0
+                for run in range(self.args.runs):
+                    turn_num += self._solve_game(seed, player_num, run)
+                if turn_num > 0:
+                    games.append((player_num, seed))
+                solved += turn_num
+
+        records = [(key, index, chance)
+                   for key, (index, chance) in self.records.items()]
+        record_num = Tablebase.write(self.args.output, records, games)
+        elapsed = time.perf_counter() - start
+        print(f"{solved} turns of {len(games)} games solved, {record_num} "
+              f"states written to {self.args.output} ({elapsed:.1f}s)")
+
+        hits, flips = self._check(games)
+        if flips > 0:
+            print(f"hit rate: {hits} of {flips} flips ({hits / flips:.1%}) "
+                  f"in {len(games) * self.args.checks} check games")
+
+    def _solve_game(self, seed, player_num, run):
+        """
+        This method plays a game with the memory policy and adds the best
+        flips of every turn that can be solved and is not in the table.
+
+        input:
+        - seed: the seed of the game
+        - player_num: the number of players
+        - run: the number of the play of the game (sets the card picks)
+
+        return: int (the number of turns solved)
+        """
+        engine = GameEngine(seed, player_num)
+        policy = MemoryPolicy(random.Random(f"{seed}/{player_num}/{run}"))
+        belief = CardBelief()
+        policy.set_belief(belief)
+        board_key = Tablebase.board_key(engine)
+        chit_cards = engine.get_chit_cards()
+        known = set()
+        turn_num = 0
+        for _ in range(Simulator.MAX_TURNS):
+            # A turn already in the table was reached from a solved turn
+            if len(known) >= self.args.min_seen and \
+                    Tablebase.state_key(engine, belief, board_key) \
+                    not in self.records and \
+                    self.solver.solve(engine, known) is not None:
+                for key, index, chance in self.solver.best_actions():
+                    self.records[key ^ board_key] = (index, chance)
+                turn_num += 1
+
+            # Play a turn
+            end_turn = False
+            while not end_turn:
+                index = policy.choose(engine)
+                end_turn, end_game = engine.flip(chit_cards[index],
+                                                 policy.choose_move)
+                policy.observe(index, chit_cards[index])
+                known.add(index)
+                if end_game:
+                    return turn_num
+            engine.next_player()
+        return turn_num
+
+    def _check(self, games):
+        """
+        This method plays the games with the tablebase policy, with card
+        picks the table was not built from.
+
+        input:
+        - games: the list of (number of players, seed) of the table
+
+        return: (number of flips found in the table, number of flips)
+        """
+        tablebase = Tablebase(self.args.output)
+        hits = 0
+        flips = 0
+        for player_num, seed in games:
+            simulator = Simulator(player_num)
+            for check in range(self.args.checks):
+                policy = TablebasePolicy(
+                    random.Random(f"check/{seed}/{player_num}/{check}"),
+                    tablebase)
+                simulator.play_game(seed, policy)
+                hits += policy.get_hits()
+                flips += policy.get_hits() + policy.get_misses()
+        tablebase.close()
+        return hits, flips
+
+
+if __name__ == "__main__":
+    build_tablebase = BuildTablebase()
+    build_tablebase.run()
@@ -1,12 +1,11 @@
 from drawable import Drawable
 
-import pygame
-
 
 class Button(Drawable):
     """
     This class is used to create a button object.
     A button object is an object that can be clicked by the user.
+    The clicks are routed to the button by the page through a hit grid.
     """
 
     def __init__(self, image_path, scale):
@@ -20,22 +19,27 @@ class Button(Drawable):
         return: None
         """
         super().__init__(image_path, scale)
-        self.clicked = False
+        self.hit_rect = None
+
+    def set_pos(self, x, y):
+        """
+        Set the display coordinate of the button.
+        The area that can be clicked is computed once here.
+
+        input:
+        - x: the x-coordinate of the button for display
+        - y: the y-coordinate of the button for display
+
+        return: None
+        """
+        super().set_pos(x, y)
+        self.hit_rect = self.get_rect()
 
-    def is_clicked(self):
+    def get_hit_rect(self):
         """
-        This method checks if the button is clicked.
-        If the button is clicked, the method returns True.
+        The getter method to return the area of the button that can be 
+        clicked.
 
-        return: bool
+        return: pygame.Rect
         """
-        rect = self.image.get_rect()
-        rect.center = (self.x, self.y)
-
-        pos = pygame.mouse.get_pos()
-        if rect.collidepoint(pos):
-            if pygame.mouse.get_pressed()[0] and not self.clicked:
-                self.clicked = True
-                return self.clicked
-        if not pygame.mouse.get_pressed()[0]:
-            self.clicked = False
\ No newline at end of file
+        return self.hit_rect
\ No newline at end of file
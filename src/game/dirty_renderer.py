@@ -0,0 +1,136 @@
+import pygame
+
+
+class DirtyRenderer:
+    """
+    This class is used to render a retained list of drawables on top of a
+    background.
+    Instead of redrawing the whole window after every change, only the
+    regions of the drawables that changed since the last render (e.g. a
+    flipped chit card, a moved dragon and the lands it moved between) are
+    redrawn, and only those regions are sent to the display.
+    Full redraws can still be forced, or used all the time by turning off
+    dirty rendering.
+
+    The background and the optional foreground must provide 
+    draw(rect=None) to draw themselves (or a part of themselves) on the 
+    window, and get_dirty_rects() to report the areas of themselves that 
+    changed.
+    """
+
+    def __init__(self, window, background, drawables, foreground=None, 
+                 dirty_rendering=True):
+        """
+        This method initializes the renderer.
+
+        input:
+        - window: the window to render on
+        - background: the background drawn below the drawables
+        - drawables: the list of drawables in drawing order (bottom first)
+        - foreground: the foreground drawn above the drawables
+        - dirty_rendering: False to always redraw the whole window
+
+        return: None
+        """
+        self.window = window
+        self.background = background
+        self.drawables = drawables
+        self.foreground = foreground
+        self.dirty_rendering = dirty_rendering
+        self.full_redraw_needed = True  # Nothing is on the window yet
+
+    def invalidate(self):
+        """
+        This method forces the next render to redraw the whole window.
+        Should be called if something not tracked by the renderer (e.g. a
+        text message) was drawn on the window.
+
+        return: None
+        """
+        self.full_redraw_needed = True
+
+    def render(self, full=False):
+        """
+        This method renders the changed drawables on the window.
+
+        input:
+        - full: True to redraw the whole window
+
+        return: None
+        """
+        if full or self.full_redraw_needed or not self.dirty_rendering:
+            self._render_full()
+        else:
+            self._render_dirty()
+
+    def _render_full(self):
+        """
+        This method redraws the whole window.
+
+        return: None
+        """
+        self.background.draw()
+        self.background.get_dirty_rects()   # Discard, all is redrawn
+        for drawable in self.drawables:
+            drawable.draw(self.window)
+            drawable.clear_dirty()
+        if self.foreground is not None:
+            self.foreground.draw()
+            self.foreground.get_dirty_rects()
+        pygame.display.update()
+        self.full_redraw_needed = False
+
+    def _render_dirty(self):
+        """
+        This method redraws the regions of the changed drawables only.
+        The regions are the area a drawable covered at the last render and
+        the area it covers now.
+
+        return: None
+        """
+        dirty_rects = self.background.get_dirty_rects()
+        if self.foreground is not None:
+            dirty_rects.extend(self.foreground.get_dirty_rects())
+        for drawable in self.drawables:
+            if drawable.is_dirty():
+                if drawable.get_prev_rect() is not None:
+                    dirty_rects.append(drawable.get_prev_rect())
+                if drawable.x is not None:
+                    dirty_rects.append(drawable.get_rect())
+                drawable.clear_dirty()
+        if not dirty_rects:
+            return
+
+        dirty_rects = DirtyRenderer._merge_rects(dirty_rects)
+        for rect in dirty_rects:
+            self.window.set_clip(rect)
+            self.background.draw(rect)
+            for drawable in self.drawables:
+                if drawable.x is not None and \
+                        rect.colliderect(drawable.get_rect()):
+                    drawable.draw(self.window)
+            if self.foreground is not None:
+                self.foreground.draw(rect)
+        self.window.set_clip(None)
+        pygame.display.update(dirty_rects)
+
+    @staticmethod
+    def _merge_rects(rects):
+        """
+        This method merges the overlapping rects, so no region is drawn
+        twice.
+
+        input:
+        - rects: the list of rects
+
+        return: list of rects
+        """
+        merged = []
+        for rect in rects:
+            rect = rect.copy()
+            index = rect.collidelist(merged)
+            while index != -1:
+                rect.union_ip(merged.pop(index))
+                index = rect.collidelist(merged)
+            merged.append(rect)
+        return merged
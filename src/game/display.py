@@ -1,3 +1,6 @@
+from asset_cache import AssetCache
+from font_registry import FontRegistry
+
 import pygame
 import sys
 
@@ -7,11 +10,18 @@ class Display:
     This class is basically the utility class.
     It is used to manipulate the display of the game.
     """
+    ASSET_CACHE = AssetCache()  # Shared by every loaded image in the process
+    FONT_FAMILY = 'arial'
+    FONT_REGISTRY = FontRegistry()
+    TEXT_CACHE = AssetCache(4 * 1024 * 1024)    # Rendered text surfaces
     
     @staticmethod
-    def draw_text(window, text, size, color, x, y, update_display=True):
+    def draw_text(window, text, size, color, x, y, update_display=True, 
+                  antialias=True):
         """
         This method draws text on the window.
+        The rendered text is cached, so the same text is only rendered 
+        once as long as it stays in the cache.
 
         input:
         - window: the window to draw the text on
@@ -21,11 +31,11 @@ class Display:
         - x: the x-coordinate of the text
         - y: the y-coordinate of the text
         - update_display: whether to update the display or not
+        - antialias: whether to render the text with antialiasing
 
         return: None
         """
-        font = pygame.font.SysFont('arial', size)
-        text_output = font.render(text, True, color)
+        text_output = Display.render_text(text, size, color, antialias)
         text_rect = text_output.get_rect()
         text_rect.center = (x, y)
         window.blit(text_output, text_rect)
@@ -33,6 +43,29 @@ class Display:
         if update_display:
             pygame.display.update()
 
+    @staticmethod
+    def render_text(text, size, color, antialias=True):
+        """
+        This method returns the rendered text surface.
+        The font is obtained from the font registry and the rendered 
+        surface is kept in the text cache.
+
+        input:
+        - text: the text to render
+        - size: the size of the text
+        - color: the color of the text
+        - antialias: whether to render the text with antialiasing
+
+        return: the rendered text surface
+        """
+        key = (text, size, tuple(color), antialias)
+        text_output = Display.TEXT_CACHE.get(key)
+        if text_output is None:
+            font = Display.FONT_REGISTRY.get_font(Display.FONT_FAMILY, size)
+            text_output = font.render(text, antialias, color)
+            Display.TEXT_CACHE.put(key, text_output)
+        return text_output
+
     @staticmethod
     def draw_img(window, image, x, y):
         """
@@ -55,15 +88,21 @@ class Display:
         """
         This method loads the background image from the path and 
         scale the image.
+        The scaled image is cached, so the same background is only 
+        decoded once for each window size.
 
         input:
         - path: the path of the background image
 
         return: The scaled background image
         """
-        img = pygame.image.load(path).convert_alpha()
-        img = pygame.transform.smoothscale(
-            img, (window.get_width(), window.get_height()))
+        size = (window.get_width(), window.get_height())
+        key = (path, None, size)
+        img = Display.ASSET_CACHE.get(key)
+        if img is None:
+            img = pygame.image.load(path).convert_alpha()
+            img = pygame.transform.smoothscale(img, size)
+            Display.ASSET_CACHE.put(key, img)
         return img
 
     @staticmethod
@@ -71,6 +110,8 @@ class Display:
         """
         This method loads the image from the path and scale the 
         image.
+        The scaled image is cached and shared, so it must not be drawn 
+        on directly.
 
         input:
         - path: the path of the image
@@ -78,11 +119,15 @@ class Display:
 
         return: The scaled image
         """
-        img = pygame.image.load(path).convert_alpha()
-        width = img.get_width()
-        height = img.get_height()
-        scale_img = pygame.transform.smoothscale(
-            img, (int(width * scale), int(height * scale)))
+        key = (path, scale, None)
+        scale_img = Display.ASSET_CACHE.get(key)
+        if scale_img is None:
+            img = pygame.image.load(path).convert_alpha()
+            width = img.get_width()
+            height = img.get_height()
+            scale_img = pygame.transform.smoothscale(
+                img, (int(width * scale), int(height * scale)))
+            Display.ASSET_CACHE.put(key, scale_img)
         return scale_img
 
     @staticmethod
@@ -1,5 +1,6 @@
 from drawable import Drawable
 from memorable import Memorable
+from engine.zobrist_hash import ZobristHash
 
 
 class Dragon(Drawable, Memorable):
@@ -25,6 +26,8 @@ class Dragon(Drawable, Memorable):
         self.img_path = img_path
         self.board_pos = None
         self.remaining_steps = None
+        self.zobrist = None     # Hash of the game state, if any
+        self.index = None       # Index of the dragon in the hash
 
     def get_id(self):
         """
@@ -80,8 +83,13 @@ class Dragon(Drawable, Memorable):
 
         return: None
         """
+        if self.zobrist is not None:
+            self.zobrist.change(ZobristHash.DRAGON_POS, self.index,
+                                self.board_pos, new_board_pos)
         self.board_pos = new_board_pos
-        super().set_pos(new_xy[0]+10, new_xy[1])
+        # The display position is only set if the board is displayed
+        if new_xy[0] is not None:
+            super().set_pos(new_xy[0]+10, new_xy[1])
 
     def set_remaining_steps(self, steps):
         """
@@ -92,8 +100,32 @@ class Dragon(Drawable, Memorable):
 
         return: None
         """
+        if self.zobrist is not None:
+            self.zobrist.change(ZobristHash.DRAGON_STEPS, self.index,
+                                self.remaining_steps, steps)
         self.remaining_steps = steps
 
+    def set_zobrist(self, zobrist, index):
+        """
+        The setter method to set the hash of the game state that the 
+        dragon updates when it moves. The current position and remaining 
+        steps of the dragon are added to the hash.
+        The dragon is hashed by its index in the game, not its id, as the 
+        id of a dragon depends on its cave (e.g. the second dragon of a 
+        new two-player game has the id 2, but the id 1 once loaded).
+
+        input:
+        - zobrist: the ZobristHash of the game state
+        - index: the index of the dragon in the game
+
+        return: None
+        """
+        self.zobrist = zobrist
+        self.index = index
+        zobrist.change(ZobristHash.DRAGON_POS, index, None, self.board_pos)
+        zobrist.change(ZobristHash.DRAGON_STEPS, index, None,
+                       self.remaining_steps)
+
     def save(self):
         """
         This method is used to save the dragon object.
@@ -116,7 +148,7 @@ class Dragon(Drawable, Memorable):
         """
         self.set_remaining_steps(state["remaining_steps"])
 
-    def move(self, destination, volcanoe_zones, caves):
+    def move(self, destination, gameboard):
         """
         This method moves the dragon to the destination.
         It sets the occupied status of the start land to False
@@ -124,39 +156,14 @@ class Dragon(Drawable, Memorable):
 
         input:
         - destination: the destination index on the game board
-        - volcanoe_zones: the list of volcanoes
-        - caves: the list of caves
+        - gameboard: the gameboard
 
         return: None
         """
-        # Obtain the starting land
+        # Set the starting land's occupied status to False
         if self.board_pos is not None:
-            if self.board_pos >= 0:
-                vzone_index = self.board_pos // 3
-                v_index = self.board_pos % 3
-                start_land = volcanoe_zones[vzone_index].get_volcanoes()[
-                    v_index]
-            else:
-                vol_pos = abs(self.board_pos) - 1
-                vzone_index = vol_pos // 3
-                v_index = vol_pos % 3
-                volcano = volcanoe_zones[vzone_index].get_volcanoes()[v_index]
-                start_land = caves[volcano.get_cave_id()]
-            # Set the starting land's occupied status to False
-            start_land.set_occupied_status(False)
-
-        # Obtain the ending land
-        if destination >= 0:
-            vzone_index = destination // 3
-            v_index = destination % 3
-            end_land = volcanoe_zones[vzone_index].get_volcanoes()[v_index]
-        else:
-            vol_pos = abs(destination) - 1
-            vzone_index = vol_pos // 3
-            v_index = vol_pos % 3
-            volcano = volcanoe_zones[vzone_index].get_volcanoes()[v_index]
-            end_land = caves[volcano.get_cave_id()]
+            gameboard.set_occupied(self.board_pos, False)
 
         # Move the dragon to the destination and update the occupied status
-        end_land.set_occupied_status(True)
-        self.set_pos(destination, end_land.get_pos())
\ No newline at end of file
+        gameboard.set_occupied(destination, True)
+        self.set_pos(destination, gameboard.land_at(destination).get_pos())
\ No newline at end of file
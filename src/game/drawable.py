@@ -1,11 +1,13 @@
 from abc import ABC
-from display import Display
 
 
 class Drawable(ABC):
     """
     Represents an abstract class for a drawable object.
     A drawable object is an object that can be drawn on the screen.
+    The image is only loaded when it is first needed, so drawable objects
+    can be created and used by the game rules without a display (and 
+    without pygame).
     """
 
     def __init__(self, image_path, scale):
@@ -18,9 +20,13 @@ class Drawable(ABC):
 
         return: None
         """
-        self.image = Display.load_img(image_path, scale)
+        self.image_path = image_path
+        self.scale = scale
+        self.loaded_image = None    # Loaded on the first access of image
         self.x = None
         self.y = None
+        self.dirty = True       # Whether it changed since the last render
+        self.prev_rect = None   # The area it covered at the last render
 
     def draw(self, window):
         """
@@ -32,8 +38,39 @@ class Drawable(ABC):
 
         return: None
         """
+        # The import is done inside the method so the game rules can run 
+        # without pygame
+        from display import Display
         Display.draw_img(window, self.image, self.x, self.y)
 
+    @property
+    def image(self):
+        """
+        The image of the drawable object.
+        It is loaded from the image path on the first access.
+
+        return: pygame.Surface
+        """
+        if self.loaded_image is None:
+            from display import Display
+            self.loaded_image = Display.load_img(self.image_path, self.scale)
+        return self.loaded_image
+
+    def set_image_path(self, image_path):
+        """
+        The setter method to change the image of the drawable object.
+        The new image is loaded when it is needed.
+
+        input:
+        - image_path: the new image path of the drawable object
+
+        return: None
+        """
+        if image_path != self.image_path:
+            self.mark_dirty()
+            self.image_path = image_path
+            self.loaded_image = None
+
     def set_pos(self, x, y):
         """
         Set the display coordinate of the drawable object.
@@ -44,6 +81,7 @@ class Drawable(ABC):
 
         return: None
         """
+        self.mark_dirty()
         self.x = x
         self.y = y
 
@@ -53,4 +91,56 @@ class Drawable(ABC):
 
         return: tuple
         """
-        return (self.x, self.y)
\ No newline at end of file
+        return (self.x, self.y)
+
+    def get_rect(self):
+        """
+        This method returns the area covered by the drawable object on 
+        the window.
+
+        return: pygame.Rect
+        """
+        rect = self.image.get_rect()
+        rect.center = (self.x, self.y)
+        return rect
+
+    def get_prev_rect(self):
+        """
+        The getter method to return the area covered by the drawable 
+        object at the last render.
+
+        return: pygame.Rect or None
+        """
+        return self.prev_rect
+
+    def is_dirty(self):
+        """
+        This method checks if the drawable object changed since the last 
+        render.
+
+        return: bool
+        """
+        return self.dirty
+
+    def mark_dirty(self):
+        """
+        This method marks the drawable object as changed, so it is 
+        redrawn in the next render.
+        It must be called before the change, so the area covered at the 
+        last render is remembered.
+
+        return: None
+        """
+        if not self.dirty:
+            self.dirty = True
+            if self.x is not None:
+                self.prev_rect = self.get_rect()
+
+    def clear_dirty(self):
+        """
+        This method marks the drawable object as rendered.
+
+        return: None
+        """
+        self.dirty = False
+        self.prev_rect = None
\ No newline at end of file
@@ -0,0 +1,431 @@
+from engine.card_belief import CardBelief
+from engine.game_engine import GameEngine
+from engine.game_random import GameRandom
+from gamecard.animal_type import AnimalType
+
+import numpy as np
+
+
+class BatchSimulator:
+    """
+    This class plays a batch of games in lockstep with NumPy.
+    Instead of one GameEngine per game, the state of all the games is held
+    in arrays (one row per game): the tile animals, the occupancy, the
+    dragon positions and remaining steps, the chit cards and the reveal
+    masks. Each step flips one chit card in every game at once, with the
+    same rules as ForwardAction, BackwardAction, SpecialBackwardAction
+    and TeleportCaveAction. A game that ends keeps its row until the
+    finished rows are removed from the arrays.
+
+    Board positions use the same encoding as the GameBoard (a tile is
+    >= 0, a cave is -(tile next to it + 1)), and the occupancy has the
+    same layout as the GameBoard occupancy bitset (one column per bit).
+
+    By default, the gameboard and chit cards of a game are shuffled from
+    its seed like the GameEngine does, so a game of a seed has the same
+    layout in both. Shuffling with the NumPy generator instead is faster,
+    but the layouts no longer follow the seeds. The card picks come from
+    the NumPy generator, and they can be recorded to replay the games on
+    the GameEngine.
+    The game results have the same format as the Simulator results.
+
+    The speedup is about 17x over the GameEngine in one process (four
+    players, memory policy: about 15000 games/s, 10000 with the seed
+    layouts, against 850), not the 100x once aimed at. A step still runs
+    a few dozen NumPy operations on the whole batch, and about half of
+    the time is the memory policy ranking every chit card of every game
+    in _choose, so the rate is bound by the number of steps rather than
+    by Python per game.
+    """
+    POLICIES = ("random", "memory")
+    MAX_TURNS = 1000    # Max number of turns before a game is stopped
+    BATCH_SIZE = 4096   # Number of games played in lockstep
+    COMPACT_RATIO = 0.5     # Remove finished rows below this live ratio
+    PIRATE = AnimalType.DRAGON_PIRATE.value
+    SPIRIT = AnimalType.DRAGON_SPIRIT.value
+    NO_IDENTITY = np.iinfo(np.int16).max    # Above every chit card identity
+
+    def __init__(self, player_num, dragon_num=1, size=24, animal_num=4,
+                 policy="memory", max_turns=MAX_TURNS, seed_layouts=True,
+                 rng_mode=GameRandom.STREAMS):
+        """
+        This method initializes the batch simulator.
+        The starting positions, caves and unshuffled chit cards are the
+        same in every game, so they are taken once from a game engine.
+
+        input:
+        - player_num: the number of players
+        - dragon_num: the number of dragons each player possesses
+        - size: the number of volcanoes on the gameboard
+        - animal_num: the number of animal types on the gameboard
+        - policy: the name of the card-pick policy of all the players
+        - max_turns: the max number of turns before a game is stopped
+        - seed_layouts: True to shuffle the layouts from the seeds like
+                        the GameEngine, False to shuffle with NumPy
+        - rng_mode: the mode of the random sub-streams of the seeds
+
+        return: None
+        """
+        if policy not in BatchSimulator.POLICIES:
+            raise ValueError(f"Unknown policy: {policy}")
+        self.player_num = player_num
+        self.dragon_num = dragon_num
+        self.size = size
+        self.animal_num = animal_num
+        self.policy = policy
+        self.max_turns = max_turns
+        self.seed_layouts = seed_layouts
+        self.rng_mode = rng_mode
+
+        template = GameEngine(0, player_num, dragon_num, size, animal_num,
+                              rng_mode=rng_mode)
+        gameboard = template.get_gameboard()
+        dragons = template.get_dragons()
+        self.start_pos = np.array([dragon.get_board_pos()
+                                   for dragon in dragons], dtype=np.int64)
+        self.start_steps = np.array([dragon.get_remaining_steps()
+                                     for dragon in dragons], dtype=np.int64)
+        self.start_occupancy = np.array(
+            [(gameboard.get_occupancy() >> bit) & 1
+             for bit in range(2 * size)], dtype=bool)
+        # Cave animal of the cave next to each tile, -1 if no cave
+        self.cave_animal = np.full(size, -1, dtype=np.int64)
+        self.cave_tiles = []
+        for cave_id in range(len(gameboard.get_caves())):
+            tile = gameboard.get_cave_tile(cave_id)
+            self.cave_animal[tile] = gameboard.animal_at(-(tile + 1)).value
+            self.cave_tiles.append(tile)
+        self.cave_tiles = np.array(self.cave_tiles, dtype=np.int64)
+
+        # The unshuffled animal list of the tiles
+        self.animals = [i for i in range(animal_num)
+                        for _ in range(size // animal_num)]
+        # Undo the shuffle of the template chit cards
+        chit_cards = template.get_chit_cards()
+        order = list(range(len(chit_cards)))
+        template.get_rng().stream(GameRandom.DECK).shuffle(order)
+        self.card_animals = [0] * len(chit_cards)
+        self.card_nums = [0] * len(chit_cards)
+        for i, chit_card in zip(order, chit_cards):
+            self.card_animals[i] = chit_card.get_animal().value
+            self.card_nums[i] = chit_card.get_animal_num()
+
+    def run(self, game_num, first_seed=0, np_seed=None, record=False,
+            batch_size=BATCH_SIZE):
+        """
+        This method plays the games of the seeds from the first seed in
+        batches, and yields the game results as they are done.
+
+        input:
+        - game_num: the number of games
+        - first_seed: the seed of the first game
+        - np_seed: the seed of the NumPy generator for the card picks
+        - record: True to yield the card picks of each game as well
+        - batch_size: the number of games played in lockstep
+
+        return: generator of tuples (the game results, followed by the
+                list of card picks if recorded)
+        """
+        rng = np.random.default_rng(np_seed)
+        last_seed = first_seed + game_num
+        for seed in range(first_seed, last_seed, batch_size):
+            seeds = range(seed, min(seed + batch_size, last_seed))
+            yield from self.play_batch(seeds, rng, record)
+
+    def play_batch(self, seeds, rng, record=False):
+        """
+        This method plays the games of the seeds in lockstep.
+
+        input:
+        - seeds: the seeds of the games
+        - rng: the NumPy generator for the card picks
+        - record: True to return the card picks of each game as well
+
+        return: list of tuples (the game results)
+        """
+        state = self._create_state(seeds, rng)
+        picks = [[] for _ in seeds] if record else None
+        results = []
+        while len(state["seed"]) > 0:
+            cards = self._choose(state, rng)
+            if record:
+                live = ~state["done"]
+                for row, card in zip(state["row"][live], cards[live]):
+                    picks[row].append(int(card))
+            self._flip(state, cards)
+
+            live = ~state["done"]
+            if live.mean() < BatchSimulator.COMPACT_RATIO or not live.any():
+                results.extend(self._results(state, ~live, picks))
+                for key in state:
+                    state[key] = state[key][live]
+        return results
+
+    def _create_state(self, seeds, rng):
+        """
+        This method creates the arrays of the games of the seeds.
+
+        input:
+        - seeds: the seeds of the games
+        - rng: the NumPy generator
+
+        return: dict of arrays
+        """
+        game_num = len(seeds)
+        tile_animals = np.tile(np.array(self.animals, dtype=np.int64),
+                               (game_num, 1))
+        card_order = np.tile(np.arange(len(self.card_animals)),
+                             (game_num, 1))
+        if self.seed_layouts:
+            # Shuffle with the sub-streams like GameEngine
+            for i, seed in enumerate(seeds):
+                game_rng = GameRandom(seed, self.rng_mode)
+                animals = self.animals[:]
+                game_rng.stream(GameRandom.BOARD).shuffle(animals)
+                tile_animals[i] = animals
+                order = list(range(len(self.card_animals)))
+                game_rng.stream(GameRandom.DECK).shuffle(order)
+                card_order[i] = order
+        else:
+            tile_animals = rng.permuted(tile_animals, axis=1)
+            card_order = rng.permuted(card_order, axis=1)
+
+        return {
+            "seed": np.array(seeds, dtype=np.int64),
+            "row": np.arange(game_num),     # Index of the game in the batch
+            "tile_animal": tile_animals,
+            "occupancy": np.tile(self.start_occupancy, (game_num, 1)),
+            "pos": np.tile(self.start_pos, (game_num, 1)),
+            "steps": np.tile(self.start_steps, (game_num, 1)),
+            "card_animal": np.array(self.card_animals)[card_order],
+            "card_num": np.array(self.card_nums)[card_order],
+            # Identity of the chit cards and rank of the penalty ones, for
+            # the memory policy
+            "identity": np.array(
+                [animal * CardBelief.NUM_BITS + num for animal, num in
+                 zip(self.card_animals, self.card_nums)],
+                dtype=np.int16)[card_order],
+            "penalty": np.where(
+                np.array(self.card_animals)[card_order] >=
+                BatchSimulator.PIRATE, 3, 2).astype(np.float32),
+            "revealed": np.zeros(card_order.shape, dtype=bool),
+            "known": np.zeros(card_order.shape, dtype=bool),
+            "player": np.zeros(game_num, dtype=np.int64),
+            "card_reveal": np.zeros(game_num, dtype=np.int64),
+            "turns": np.ones(game_num, dtype=np.int64),
+            "flips": np.zeros(game_num, dtype=np.int64),
+            "pirate_hits": np.zeros(game_num, dtype=np.int64),
+            "spirit_hits": np.zeros(game_num, dtype=np.int64),
+            "winner": np.full(game_num, -1, dtype=np.int64),
+            "done": np.zeros(game_num, dtype=bool)
+        }
+
+    def _choose(self, state, rng):
+        """
+        This method chooses the chit card to flip in every game, with the
+        same preferences as the RandomPolicy or MemoryPolicy. Ties are
+        broken randomly.
+
+        input:
+        - state: the arrays of the games
+        - rng: the NumPy generator
+
+        return: array of the chit card indexes
+        """
+        score = rng.random(state["revealed"].shape, dtype=np.float32)
+        if self.policy == "memory":
+            card_animal = state["card_animal"]
+            # A known chit card is good if a dragon of the player is on its
+            # animal and can move its number of steps
+            dragons = self._player_dragons(state)
+            pos = np.take_along_axis(state["pos"], dragons, 1)
+            steps = np.take_along_axis(state["steps"], dragons, 1)
+            max_steps = np.where(pos >= 0, steps, np.iinfo(np.int64).max)
+            land = self._land_animal(state, pos)
+            good = (land[:, None, :] == card_animal[:, :, None]) & \
+                (state["card_num"][:, :, None] <= max_steps[:, None, :])
+            # Rank 0 good, 1 unknown, 2 no move, 3 penalty
+            rank = state["penalty"] - 2 * good.any(2)
+            # The unseen chit cards are known too if they are all alike
+            unseen = ~state["known"]
+            identity = state["identity"]
+            alike = np.where(unseen, identity, BatchSimulator.NO_IDENTITY) \
+                .min(1) == np.where(unseen, identity, -1).max(1)
+            score += np.where(state["known"] | alike[:, None], rank, 1)
+        score[state["revealed"]] = np.inf
+        return score.argmin(1)
+
+    def _flip(self, state, cards):
+        """
+        This method flips the chit card in every live game and applies the
+        action to the current player's dragon, like GameEngine.flip, then
+        ends the turns and games.
+
+        input:
+        - state: the arrays of the games
+        - cards: the chit card index of every game
+
+        return: None
+        """
+        live = ~state["done"]
+        rows = np.arange(len(cards))
+        animal = state["card_animal"][rows, cards]
+        num = state["card_num"][rows, cards]
+        state["revealed"][rows, cards] = True
+        state["known"][rows, cards] = True
+        state["card_reveal"] += live
+        state["flips"] += live
+        state["pirate_hits"] += live & (animal == BatchSimulator.PIRATE)
+        state["spirit_hits"] += live & (animal == BatchSimulator.SPIRIT)
+
+        # Choose the first valid dragon of the player, the dragon pirate
+        # and dragon spirit are valid for every dragon
+        dragons = self._player_dragons(state)
+        land = self._land_animal(state,
+                                 np.take_along_axis(state["pos"], dragons, 1))
+        valid = land == animal[:, None]
+        penalty = animal >= BatchSimulator.PIRATE
+        has_valid = penalty | valid.any(1)
+        dragon = dragons[rows, np.where(penalty, 0, valid.argmax(1))]
+        pos = state["pos"][rows, dragon]
+        steps = state["steps"][rows, dragon]
+        on_tile = pos >= 0
+
+        end_turn = live & ~has_valid
+        dest = np.zeros_like(pos)
+        new_steps = steps.copy()
+        move = np.zeros_like(live)
+        win = np.zeros_like(live)
+
+        # ForwardAction
+        forward = live & has_valid & ~penalty
+        over = forward & on_tile & (num > steps)
+        exact = forward & on_tile & (num == steps)
+        ahead = forward & ~over & ~exact
+        dest = np.where(ahead & on_tile, (pos + num) % self.size, dest)
+        dest = np.where(ahead & ~on_tile,
+                        (-pos - 1 + num - 1) % self.size, dest)
+        dest = np.where(exact, -((pos + num - 1) % self.size + 1), dest)
+        new_steps = np.where(ahead, steps - num, new_steps)
+        new_steps = np.where(exact, 0, new_steps)
+        free = ~state["occupancy"][rows, self._bit(dest)]
+        move |= (ahead | exact) & free
+        end_turn |= over | ((ahead | exact) & ~free)
+        win |= exact & free
+
+        # SpecialBackwardAction, the dragon stays in a cave
+        pirate = np.flatnonzero(live & (animal == BatchSimulator.PIRATE) &
+                                on_tile)
+        if len(pirate) > 0:
+            back = (pos[pirate] - num[pirate]) % self.size
+            # Free tiles from the destination backward
+            behind = (back[:, None] - np.arange(self.size)) % self.size
+            free_behind = ~state["occupancy"][pirate[:, None], behind]
+            skipped = free_behind.argmax(1)
+            # The search stops at the dragon's own tile
+            limit = (back - pos[pirate]) % self.size
+            found = free_behind.any(1) & (skipped < limit)
+            dest[pirate] = (back - skipped) % self.size
+            new_steps[pirate] = steps[pirate] + num[pirate] + skipped
+            move[pirate] = found
+            end_turn[pirate] |= ~found
+
+        # TeleportCaveAction, the dragon stays in a cave
+        spirit = np.flatnonzero(live & (animal == BatchSimulator.SPIRIT) &
+                                on_tile)
+        if len(spirit) > 0:
+            distance = (pos[spirit, None] - self.cave_tiles[None, :]) % \
+                self.size
+            cave_free = ~state["occupancy"][spirit[:, None],
+                                            self.size + self.cave_tiles]
+            distance = np.where(cave_free & (distance > 0), distance,
+                                self.size)
+            nearest = distance.argmin(1)
+            distance = distance[np.arange(len(spirit)), nearest]
+            dest[spirit] = -(self.cave_tiles[nearest] + 1)
+            new_steps[spirit] = steps[spirit] + distance + 1
+            move[spirit] = distance < self.size
+
+        # Move the dragons
+        moved = rows[move]
+        state["occupancy"][moved, self._bit(pos[move])] = False
+        state["occupancy"][moved, self._bit(dest[move])] = True
+        state["pos"][moved, dragon[move]] = dest[move]
+        state["steps"][moved, dragon[move]] = new_steps[move]
+
+        # End the games and turns
+        state["winner"][win] = state["player"][win]
+        state["done"] |= win
+        end_turn |= live & ~win & \
+            (state["card_reveal"] > state["revealed"].shape[1] - 1)
+        capped = end_turn & (state["turns"] >= self.max_turns)
+        state["done"] |= capped
+        next_turn = end_turn & ~capped
+        state["player"][next_turn] = \
+            (state["player"][next_turn] + 1) % self.player_num
+        state["turns"] += next_turn
+        state["card_reveal"][next_turn] = 0
+        state["revealed"][next_turn] = False
+
+    def _player_dragons(self, state):
+        """
+        This method returns the dragon indexes of the current player of
+        every game.
+
+        input:
+        - state: the arrays of the games
+
+        return: array (one row of dragon indexes per game)
+        """
+        return state["player"][:, None] * self.dragon_num + \
+            np.arange(self.dragon_num)[None, :]
+
+    def _land_animal(self, state, pos):
+        """
+        This method returns the animal of the lands at the positions,
+        like GameBoard.animal_at.
+
+        input:
+        - state: the arrays of the games
+        - pos: the board positions (one row per game)
+
+        return: array of the animal values
+        """
+        tile = np.where(pos >= 0, pos, -pos - 1)
+        tile_animal = np.take_along_axis(state["tile_animal"], tile, 1)
+        return np.where(pos >= 0, tile_animal, self.cave_animal[tile])
+
+    def _bit(self, pos):
+        """
+        This method returns the occupancy column of the board positions,
+        like GameBoard._bit.
+
+        input:
+        - pos: the board positions
+
+        return: array of the occupancy columns
+        """
+        return np.where(pos >= 0, pos, self.size - pos - 1)
+
+    def _results(self, state, finished, picks):
+        """
+        This method returns the results of the finished games.
+
+        input:
+        - state: the arrays of the games
+        - finished: the mask of the finished games
+        - picks: the card picks of the games, None if not recorded
+
+        return: list of tuples (the game results)
+        """
+        results = []
+        for i in np.flatnonzero(finished):
+            winner = int(state["winner"][i])
+            result = (int(state["seed"][i]), winner if winner >= 0 else None,
+                      int(state["turns"][i]), int(state["flips"][i]),
+                      int(state["pirate_hits"][i]),
+                      int(state["spirit_hits"][i]))
+            if picks is not None:
+                result += (picks[state["row"][i]],)
+            results.append(result)
+        return results
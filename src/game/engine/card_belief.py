@@ -0,0 +1,332 @@
+from engine.game_engine import GameEngine
+from engine.zobrist_hash import ZobristHash
+from gamecard.animal_type import AnimalType
+
+
+class CardBelief:
+    """
+    This class keeps what each player knows about the chit cards.
+    The chit cards never change places, so a chit card flipped by any
+    player is known by the players who saw it, for the rest of the game.
+
+    A chit card identity is its animal and number, and each place (slot)
+    of a chit card keeps a bitmask of the identities it can still be:
+    a single bit once the chit card is seen, otherwise every identity
+    with a copy that has not been seen yet. So the unseen places of a
+    player are alike, and the chance of an identity at any of them is its
+    number of unseen copies over the number of unseen places.
+    """
+    NUM_BITS = 4        # Identity bits of an animal (numbers are 1-3)
+    NO_LIMIT = float("inf")     # Any step is allowed out of a cave
+    # Identities of the dragon pirate and dragon spirit chit cards
+    PENALTY_MASK = ((1 << NUM_BITS) - 1) << \
+        (AnimalType.DRAGON_PIRATE.value * NUM_BITS) | \
+        ((1 << NUM_BITS) - 1) << (AnimalType.DRAGON_SPIRIT.value * NUM_BITS)
+    DECK_COPIES = None  # Copies of each identity in a normal game
+
+    def __init__(self, chit_cards=None, player_num=1):
+        """
+        This method initializes the knowledge of the players, who have not
+        seen any chit card.
+
+        input:
+        - chit_cards: the chit cards of the game (only the identities are
+                      used), None for the chit cards of a normal game
+        - player_num: the number of players
+
+        return: None
+        """
+        if chit_cards is not None:
+            self.copies = CardBelief._count(chit_cards)
+        else:
+            # The chit cards of a normal game are counted once
+            if CardBelief.DECK_COPIES is None:
+                CardBelief.DECK_COPIES = CardBelief._count(
+                    GameEngine.create_deck())
+            self.copies = CardBelief.DECK_COPIES
+        full_mask = 0
+        for identity, copies in enumerate(self.copies):
+            if copies > 0:
+                full_mask |= 1 << identity
+
+        slot_num = sum(self.copies)
+        self.masks = [[full_mask] * slot_num for _ in range(player_num)]
+        self.seen = [[False] * slot_num for _ in range(player_num)]
+        self.seen_copies = [[0] * len(self.copies)
+                            for _ in range(player_num)]
+        self.unseen_num = [slot_num] * player_num
+        self.unseen_mask = [full_mask] * player_num
+        self.hashes = [0] * player_num  # Hash of the chit cards seen
+
+    def get_masks(self, player=0):
+        """
+        The getter method to return the identity bitmask of every place of
+        the player. The list must not be changed.
+
+        input:
+        - player: the player index
+
+        return: list of int
+        """
+        return self.masks[player]
+
+    def get_hash(self, player=0):
+        """
+        The getter method to return the 64-bit hash of the chit cards seen
+        by the player (the places and identities).
+
+        input:
+        - player: the player index
+
+        return: int
+        """
+        return self.hashes[player]
+
+    def is_seen(self, index, player=0):
+        """
+        This method checks if the player has seen the chit card.
+
+        input:
+        - index: the index of the chit card
+        - player: the player index
+
+        return: bool
+        """
+        return self.seen[player][index]
+
+    def is_known(self, index, player=0):
+        """
+        This method checks if the player knows the identity of the chit
+        card, i.e. has seen it or every other identity is used up.
+
+        input:
+        - index: the index of the chit card
+        - player: the player index
+
+        return: bool
+        """
+        mask = self.masks[player][index]
+        return mask & (mask - 1) == 0
+
+    def seen_indexes(self, player=0):
+        """
+        This method returns the indexes of the chit cards seen by the
+        player.
+
+        input:
+        - player: the player index
+
+        return: list of int
+        """
+        seen = self.seen[player]
+        return [i for i in range(len(seen)) if seen[i]]
+
+    def unseen_copies(self, player=0):
+        """
+        This method returns the identities the unseen places of the player
+        can be and their number of copies not seen yet.
+
+        input:
+        - player: the player index
+
+        return: dict (identity -> number of copies)
+        """
+        copies = {}
+        seen_copies = self.seen_copies[player]
+        for identity in range(len(self.copies)):
+            if self.copies[identity] > seen_copies[identity]:
+                copies[identity] = self.copies[identity] - \
+                    seen_copies[identity]
+        return copies
+
+    def observe(self, index, chit_card, player=None):
+        """
+        This method records that the chit card was seen.
+
+        input:
+        - index: the index of the chit card
+        - chit_card: the chit card
+        - player: the player who saw it, None for every player
+
+        return: None
+        """
+        identity = CardBelief.identity(chit_card)
+        if player is not None:
+            self._observe(index, identity, player)
+        else:
+            for player in range(len(self.masks)):
+                self._observe(index, identity, player)
+
+    def forget(self, index, chit_card, player=None):
+        """
+        This method undoes observe, e.g. after a search tried a flip.
+
+        input:
+        - index: the index of the chit card
+        - chit_card: the chit card
+        - player: the player who saw it, None for every player
+
+        return: None
+        """
+        identity = CardBelief.identity(chit_card)
+        if player is not None:
+            self._forget(index, identity, player)
+        else:
+            for player in range(len(self.masks)):
+                self._forget(index, identity, player)
+
+    def advance_probabilities(self, advance_mask, out, player=0):
+        """
+        This method finds the chance that each chit card moves a dragon
+        forward, as known by the player, in one pass over the places.
+
+        input:
+        - advance_mask: the identities that move a dragon forward (from
+                        advance_mask)
+        - out: the list to fill, one chance per chit card
+        - player: the player index
+
+        return: list (out)
+        """
+        # The unseen places are alike, so they have the same chance
+        unseen_chance = 0.0
+        if self.unseen_num[player] > 0:
+            copies = 0
+            good = advance_mask & self.unseen_mask[player]
+            while good:
+                bit = good & -good
+                identity = bit.bit_length() - 1
+                copies += self.copies[identity] - \
+                    self.seen_copies[player][identity]
+                good ^= bit
+            unseen_chance = copies / self.unseen_num[player]
+
+        masks = self.masks[player]
+        seen = self.seen[player]
+        for i in range(len(masks)):
+            if seen[i]:
+                out[i] = 1.0 if masks[i] & advance_mask else 0.0
+            else:
+                out[i] = unseen_chance
+        return out
+
+    def _observe(self, index, identity, player):
+        """
+        This method records that the player saw the identity at the place.
+
+        input:
+        - index: the index of the chit card
+        - identity: the identity of the chit card
+        - player: the player index
+
+        return: None
+        """
+        if self.seen[player][index]:
+            return
+
+        bit = 1 << identity
+        self.seen[player][index] = True
+        self.masks[player][index] = bit
+        self.unseen_num[player] -= 1
+        self.hashes[player] ^= ZobristHash.key(ZobristHash.CARD_KNOWN,
+                                               index, identity)
+        seen_copies = self.seen_copies[player]
+        seen_copies[identity] += 1
+        if seen_copies[identity] == self.copies[identity]:
+            # No copy left for the unseen places
+            self._set_unseen_mask(player, self.unseen_mask[player] & ~bit)
+
+    def _forget(self, index, identity, player):
+        """
+        This method undoes _observe.
+
+        input:
+        - index: the index of the chit card
+        - identity: the identity of the chit card
+        - player: the player index
+
+        return: None
+        """
+        if not self.seen[player][index]:
+            return
+
+        self.seen[player][index] = False
+        self.unseen_num[player] += 1
+        self.hashes[player] ^= ZobristHash.key(ZobristHash.CARD_KNOWN,
+                                               index, identity)
+        seen_copies = self.seen_copies[player]
+        if seen_copies[identity] == self.copies[identity]:
+            self._set_unseen_mask(player,
+                                  self.unseen_mask[player] | 1 << identity)
+        seen_copies[identity] -= 1
+        self.masks[player][index] = self.unseen_mask[player]
+
+    def _set_unseen_mask(self, player, unseen_mask):
+        """
+        This method sets the identities the unseen places of the player can
+        be.
+
+        input:
+        - player: the player index
+        - unseen_mask: the identities of the copies not seen yet
+
+        return: None
+        """
+        self.unseen_mask[player] = unseen_mask
+        masks = self.masks[player]
+        seen = self.seen[player]
+        for i in range(len(masks)):
+            if not seen[i]:
+                masks[i] = unseen_mask
+
+    @staticmethod
+    def _count(chit_cards):
+        """
+        This method counts the copies of each identity.
+
+        input:
+        - chit_cards: the chit cards
+
+        return: list of int
+        """
+        copies = [0] * (len(AnimalType) * CardBelief.NUM_BITS)
+        for chit_card in chit_cards:
+            copies[CardBelief.identity(chit_card)] += 1
+        return copies
+
+    @staticmethod
+    def identity(chit_card):
+        """
+        This method returns the identity of the chit card, i.e. its bit in
+        the bitmasks.
+
+        input:
+        - chit_card: the chit card
+
+        return: int
+        """
+        return chit_card.get_animal().value * CardBelief.NUM_BITS + \
+            chit_card.get_animal_num()
+
+    @staticmethod
+    def advance_mask(engine):
+        """
+        This method returns the identities of the chit cards that move a
+        dragon of the current player forward.
+
+        input:
+        - engine: the game engine
+
+        return: int
+        """
+        gameboard = engine.get_gameboard()
+        mask = 0
+        for dragon in engine.get_current_player().get_dragons():
+            pos = dragon.get_board_pos()
+            step = dragon.get_remaining_steps() if pos >= 0 \
+                else CardBelief.NO_LIMIT
+            # Numbers 1 to the largest step on the dragon's animal
+            num = min(step, CardBelief.NUM_BITS - 1)
+            mask |= ((2 << num) - 2) << \
+                (gameboard.animal_at(pos).value * CardBelief.NUM_BITS)
+        return mask
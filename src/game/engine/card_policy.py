@@ -0,0 +1,73 @@
+from abc import ABC, abstractmethod
+
+
+class CardPolicy(ABC):
+    """
+    Abstract class for a card-pick policy.
+    A card-pick policy decides which chit card a simulated player flips 
+    next. It is told about every flipped chit card, so a policy can 
+    remember the chit cards like a human player does.
+    """
+
+    def __init__(self, rng):
+        """
+        This method initializes the card-pick policy.
+
+        input:
+        - rng: the random.Random instance used by the policy
+
+        return: None
+        """
+        self.rng = rng
+
+    @abstractmethod
+    def choose(self, engine):
+        """
+        This method chooses the chit card to flip for the current player.
+
+        input:
+        - engine: the game engine
+
+        return: int (the index of an unrevealed chit card)
+        """
+        pass
+
+    def observe(self, index, chit_card):
+        """
+        This method is called after a chit card is flipped.
+        By default, the policy does not remember anything.
+
+        input:
+        - index: the index of the flipped chit card
+        - chit_card: the flipped chit card
+
+        return: None
+        """
+        pass
+
+    def choose_move(self, engine, moves):
+        """
+        This method chooses one of the legal outcomes of the flipped chit 
+        card, i.e. which dragon performs the action.
+        By default, the first dragon is chosen like Player.choose_dragon.
+
+        input:
+        - engine: the game engine
+        - moves: the list of MoveRecord from legal_outcomes
+
+        return: MoveRecord
+        """
+        return moves[0]
+
+    @staticmethod
+    def unrevealed(engine):
+        """
+        This method returns the indexes of the unrevealed chit cards.
+
+        input:
+        - engine: the game engine
+
+        return: list of int
+        """
+        return [i for i, chit_card in enumerate(engine.get_chit_cards())
+                if not chit_card.is_revealed()]
@@ -0,0 +1,466 @@
+from player import Player
+from board.gameboard import GameBoard
+from gamecard.cc_bat import BatCC
+from gamecard.cc_babydragon import BabyDragonCC
+from gamecard.cc_salamander import SalamanderCC
+from gamecard.cc_spider import SpiderCC
+from gamecard.cc_dragonpirate import DragonPirateCC
+from gamecard.cc_dragonspirit import DragonSpiritCC
+from engine.game_random import GameRandom
+from engine.move_record import MoveRecord
+from engine.zobrist_hash import ZobristHash
+from memorable import Memorable
+
+
+class GameEngine(Memorable):
+    """
+    This class is the rules of the game without any display.
+    It creates the players, dragons, chit cards and gameboard, and
+    applies the chit card flips chosen by the players.
+    It does not need pygame or a window and does not load any image, so
+    it can be used for simulations. The Game page is the view of the
+    game engine.
+    """
+
+    def __init__(self, seed, player_num, dragon_num=1, size=24,
+                 animal_num=4, cave_pos_ls=None, current_player=0,
+                 card_reveal=0, rng_mode=GameRandom.STREAMS, state=None):
+        """
+        This method initializes the game engine.
+
+        input:
+        - seed: the seed for randomization
+        - player_num: the number of players
+        - dragon_num: the number of dragons each player can possess
+        - size: the number of volcanoes on the gameboard
+        - animal_num: the number of animal types in the game
+        - cave_pos_ls: the list of cave positions (if determine by player)
+        - current_player: the current player index
+        - card_reveal: the number of chit cards revealed
+        - rng_mode: the mode of the random sub-streams (legacy to 
+                    reproduce the games saved without a mode)
+        - state: the saved game state to resume (from save), None for a 
+                 new game. The chit cards are revealed and the dragons are 
+                 placed as saved while the game is created.
+
+        return: None
+        """
+        self.seed = seed  # Seed for randomization
+        self.rng = GameRandom(seed, rng_mode)
+        self.player_num = player_num
+        self.dragon_num = dragon_num
+        self.size = size
+        self.animal_num = animal_num
+        self.players = self._create_players()
+        self.chit_cards = self._create_cc()
+        dragon_states = None
+        if state is not None:
+            for i in range(len(self.chit_cards)):
+                self.chit_cards[i].load(state["chit_cards"][i])
+            dragon_states = [dragon_state
+                             for player_state in state["players"]
+                             for dragon_state in player_state["dragons"]]
+        self.gameboard = self._create_gameboard(cave_pos_ls, dragon_states)
+        self.current_player = current_player    # Track the current player
+        self.card_reveal = card_reveal          # Track the number of chit cards revealed
+        self.winner = None  # The dragon that wins the game
+        self.zobrist = self._create_zobrist()   # Hash of the game state
+
+    def get_players(self):
+        """
+        The getter method to return the players.
+
+        return: list
+        """
+        return self.players
+
+    def get_current_player(self):
+        """
+        The getter method to return the player of the current turn.
+
+        return: Player
+        """
+        return self.players[self.current_player]
+
+    def get_chit_cards(self):
+        """
+        The getter method to return the chit cards.
+
+        return: list
+        """
+        return self.chit_cards
+
+    def get_gameboard(self):
+        """
+        The getter method to return the gameboard.
+
+        return: GameBoard
+        """
+        return self.gameboard
+
+    def get_dragons(self):
+        """
+        The getter method to return the dragons of all the players.
+
+        return: list
+        """
+        dragons = []
+        for player in self.players:
+            dragons.extend(player.get_dragons())
+        return dragons
+
+    def get_rng(self):
+        """
+        The getter method to return the randomness of the game.
+
+        return: GameRandom
+        """
+        return self.rng
+
+    def get_hash(self):
+        """
+        The getter method to return the 64-bit hash of the game state 
+        (the positions and remaining steps of the dragons, the revealed 
+        chit cards, the current player and the number of chit cards 
+        revealed). Equal states have equal hashes.
+
+        return: int
+        """
+        return self.zobrist.get_value()
+
+    def get_winner(self):
+        """
+        The getter method to return the dragon that wins the game.
+
+        return: Dragon or None if the game has not ended
+        """
+        return self.winner
+
+    def flip(self, chit_card, choose_move=None):
+        """
+        This method flips the chit card for the current player and
+        performs its action on one of the player's dragons.
+        The turn ends if no dragon can perform the action, the action
+        ends the turn or all the chit cards are revealed. The caller
+        should then call next_player.
+
+        input:
+        - chit_card: the chit card chosen by the current player (must not
+                     be revealed)
+        - choose_move: the function that chooses one of the legal 
+                       outcomes (e.g. of a bot), None to let the player 
+                       choose the dragon
+
+        return: bool, bool (end turn and end game flag)
+        """
+        move = self.choose_outcome(chit_card, choose_move)
+        self.apply(move)
+        return move.is_end_turn(), move.is_end_game()
+
+    def choose_outcome(self, chit_card, choose_move=None):
+        """
+        This method chooses the outcome of flipping the chit card for the
+        current player, without changing the game. flip applies it.
+
+        input:
+        - chit_card: the chit card chosen by the current player (must not
+                     be revealed)
+        - choose_move: the function that chooses one of the legal 
+                       outcomes, None to let the player choose the dragon
+
+        return: MoveRecord
+        """
+        moves = self.legal_outcomes(chit_card)
+        move = moves[0]
+        if choose_move is not None:
+            move = choose_move(self, moves)
+        elif move.get_dragon() is not None:
+            player = self.players[self.current_player]
+            dragon = player.choose_dragon([move.get_dragon()
+                                           for move in moves])
+            move = next(move for move in moves
+                        if move.get_dragon() is dragon)
+        return move
+
+    def legal_outcomes(self, chit_card):
+        """
+        This method finds the outcomes of flipping the chit card for the 
+        current player, one for each dragon the player can choose, 
+        without changing the game.
+
+        input:
+        - chit_card: the unrevealed chit card
+
+        return: list of MoveRecord (one record without a dragon if no 
+                dragon can perform the action)
+        """
+        card_index = self.chit_cards.index(chit_card)
+        # The last unrevealed chit card ends the turn
+        last_card = self.card_reveal + 1 > len(self.chit_cards) - 1
+        player = self.players[self.current_player]
+        valid_dragons = chit_card.valid_dragon(player.get_dragons(),
+                                               self.gameboard)
+        if len(valid_dragons) < 1:
+            return [MoveRecord(card_index, None, None, None, 0, True, False)]
+
+        moves = []
+        for dragon in valid_dragons:
+            action = chit_card.get_action(dragon, self.gameboard)
+            destination, remaining_steps, end_turn, end_game = \
+                action.outcome()
+            steps_delta = 0
+            if destination is not None:
+                steps_delta = remaining_steps - dragon.get_remaining_steps()
+            moves.append(MoveRecord(card_index, dragon,
+                                    dragon.get_board_pos(), destination,
+                                    steps_delta,
+                                    end_turn or (last_card and not end_game),
+                                    end_game))
+        return moves
+
+    def apply(self, move):
+        """
+        This method plays the flip of the move record: the chit card is 
+        revealed and the dragon moves.
+
+        input:
+        - move: the move record from legal_outcomes
+
+        return: None
+        """
+        self.chit_cards[move.get_card_index()].set_reveal_true()
+        self._set_turn(self.current_player, self.card_reveal + 1)
+        dragon = move.get_dragon()
+        if move.get_to_pos() is not None:
+            dragon.move(move.get_to_pos(), self.gameboard)
+            dragon.set_remaining_steps(dragon.get_remaining_steps()
+                                       + move.get_steps_delta())
+        if move.is_end_game():
+            self.winner = dragon
+
+    def undo(self, move):
+        """
+        This method undoes the move record applied last: the dragon moves 
+        back and the chit card is hidden again.
+
+        input:
+        - move: the move record applied last
+
+        return: None
+        """
+        dragon = move.get_dragon()
+        if move.get_to_pos() is not None:
+            dragon.move(move.get_from_pos(), self.gameboard)
+            dragon.set_remaining_steps(dragon.get_remaining_steps()
+                                       - move.get_steps_delta())
+        if move.is_end_game():
+            self.winner = None
+        self._set_turn(self.current_player, self.card_reveal - 1)
+        self.chit_cards[move.get_card_index()].reset()
+
+    def next_player(self):
+        """
+        This method is used to change the turn to the next player.
+        The current player index will be increment by 1.
+        All the chit cards will be reset.
+
+        return: list of int (the indexes of the chit cards that were 
+                revealed, to undo the turn change)
+        """
+        revealed = [i for i, chit_card in enumerate(self.chit_cards)
+                    if chit_card.is_revealed()]
+        self._set_turn((self.current_player + 1) % self.player_num, 0)
+        for chit_card in self.chit_cards:
+            chit_card.reset()
+        return revealed
+
+    def undo_next_player(self, revealed):
+        """
+        This method undoes next_player: the turn goes back to the 
+        previous player and the chit cards revealed in that turn are 
+        revealed again.
+
+        input:
+        - revealed: the indexes returned by next_player
+
+        return: None
+        """
+        for i in revealed:
+            self.chit_cards[i].set_reveal_true()
+        self._set_turn((self.current_player - 1) % self.player_num,
+                       len(revealed))
+
+    def swap_chit_cards(self, i, j):
+        """
+        This method swaps the places of two unrevealed chit cards, e.g. 
+        to try another arrangement of the cards a player has not seen.
+
+        input:
+        - i: the index of a chit card
+        - j: the index of the other chit card
+
+        return: None
+        """
+        chit_cards = self.chit_cards
+        chit_cards[i], chit_cards[j] = chit_cards[j], chit_cards[i]
+        chit_cards[i].set_zobrist(self.zobrist, i)
+        chit_cards[j].set_zobrist(self.zobrist, j)
+
+    def save(self):
+        """
+        This method is used to save the game state.
+
+        return: dict
+        """
+        return {
+            "seed": self.seed,
+            "rng_mode": self.rng.get_mode(),
+            "player_num": self.player_num,
+            "dragon_num": self.dragon_num,
+            "size": self.size,
+            "animal_num": self.animal_num,
+            "current_player": self.current_player,
+            "card_reveal": self.card_reveal,
+            "players": [player.save() for player in self.players],
+            "chit_cards": [chit_card.save() for chit_card in self.chit_cards],
+            "gameboard": self.gameboard.save()
+        }
+
+    @staticmethod
+    def from_state(state):
+        """
+        This method creates a game engine from a saved game state, in one 
+        pass: the dragons are placed at their saved positions when the 
+        gameboard is created.
+
+        input:
+        - state: the game state (from save)
+
+        return: GameEngine
+        """
+        engine = GameEngine(state["seed"], state["player_num"],
+                            state["dragon_num"], state["size"],
+                            state["animal_num"], state["gameboard"]["caves"],
+                            state["current_player"], state["card_reveal"],
+                            state.get("rng_mode", GameRandom.LEGACY), state)
+        return engine
+
+    def load(self, state):
+        """
+        This method is used to load the game state.
+
+        input:
+        - state: the game state to load
+
+        return: None
+        """
+        for i in range(len(self.chit_cards)):
+            self.chit_cards[i].load(state["chit_cards"][i])
+
+        self.gameboard.load(state["gameboard"])
+
+        for i in range(self.player_num):
+            self.players[i].load(state["players"][i])
+
+        # Move dragon to the correct position
+        for i in range(self.player_num):
+            for j in range(self.dragon_num):
+                self.players[i].get_dragons()[j].move(state["players"][i]["dragons"][j]["board_pos"],
+                                                      self.gameboard)
+
+    def _set_turn(self, current_player, card_reveal):
+        """
+        This method sets the current player and the number of chit cards 
+        revealed, and updates the hash of the game state.
+
+        input:
+        - current_player: the current player index
+        - card_reveal: the number of chit cards revealed
+
+        return: None
+        """
+        self.zobrist.change(ZobristHash.CURRENT_PLAYER, 0,
+                            self.current_player, current_player)
+        self.zobrist.change(ZobristHash.CARD_REVEAL_NUM, 0,
+                            self.card_reveal, card_reveal)
+        self.current_player = current_player
+        self.card_reveal = card_reveal
+
+    def _create_zobrist(self):
+        """
+        This method creates the hash of the game state and attaches it to 
+        the dragons and chit cards, which update it when they change.
+
+        return: ZobristHash
+        """
+        zobrist = ZobristHash()
+        zobrist.toggle(ZobristHash.CURRENT_PLAYER, 0, self.current_player)
+        zobrist.toggle(ZobristHash.CARD_REVEAL_NUM, 0, self.card_reveal)
+        for i, dragon in enumerate(self.get_dragons()):
+            dragon.set_zobrist(zobrist, i)
+        for i, chit_card in enumerate(self.chit_cards):
+            chit_card.set_zobrist(zobrist, i)
+        return zobrist
+
+    def _create_players(self):
+        """
+        This method creates the players.
+
+        return: list
+        """
+        players = []
+        for i in range(self.player_num):
+            players.append(Player(i, self.dragon_num))
+
+        return players
+
+    @staticmethod
+    def create_deck():
+        """
+        This method creates the chit cards of a game, not shuffled.
+
+        return: list
+        """
+        # Create chit cards
+        chit_cards = []
+        for i in range(1, 4):
+            chit_cards.append(BatCC(i))
+            chit_cards.append(BabyDragonCC(i))
+            chit_cards.append(SalamanderCC(i))
+            chit_cards.append(SpiderCC(i))
+
+            # For penalty card
+            if i < 3:
+                chit_cards.append(DragonPirateCC(i))
+
+        # Create the dragon spirit chit card
+        for _ in range(2):
+            chit_cards.append(DragonSpiritCC())
+        return chit_cards
+
+    def _create_cc(self):
+        """
+        This method creates the chit cards list
+
+        return: list
+        """
+        chit_cards = GameEngine.create_deck()
+
+        # Randomize the chit cards
+        self.rng.stream(GameRandom.DECK).shuffle(chit_cards)
+        return chit_cards
+
+    def _create_gameboard(self, cave_pos_ls, dragon_states=None):
+        """
+        This method creates the gameboard.
+
+        input:
+        - cave_pos_ls: the list of cave positions (if determine by player)
+        - dragon_states: the saved state of each dragon, None to start the 
+                         dragons at their caves
+
+        return: GameBoard
+        """
+        return GameBoard(self.seed, self.get_dragons(),
+                         self.size, self.animal_num, cave_pos_ls,
+                         self.rng.stream(GameRandom.BOARD), dragon_states)
@@ -0,0 +1,72 @@
+import hashlib
+import random
+
+
+class GameRandom:
+    """
+    This class is the source of randomness of one game.
+    Every random part of the game (e.g. the board layout and the chit 
+    card deck) takes its own named sub-stream, a random.Random derived 
+    from the seed of the game and the name of the sub-stream. The games 
+    never use the global random module, so many games can run in one 
+    process (or in threads) without changing each other's randomness.
+
+    There are two modes:
+    - streams: each sub-stream is seeded from a hash of the game seed 
+      and its name, so the sub-streams are independent of each other
+    - legacy: each sub-stream is random.Random(seed), which gives the 
+      same shuffles as the old random.seed(seed) and random.shuffle, 
+      so the layouts of the games saved before the sub-streams are 
+      reproduced exactly
+    """
+    STREAMS = "streams"
+    LEGACY = "legacy"
+    MODES = (STREAMS, LEGACY)
+    BOARD = "board"     # Sub-stream of the board layout
+    DECK = "deck"       # Sub-stream of the chit card deck
+
+    def __init__(self, seed, mode=STREAMS):
+        """
+        This method initializes the randomness of a game.
+
+        input:
+        - seed: the seed of the game
+        - mode: the mode of the sub-streams (streams or legacy)
+
+        return: None
+        """
+        if mode not in GameRandom.MODES:
+            raise ValueError(f"Unknown random mode: {mode}")
+        self.seed = seed
+        self.mode = mode
+
+    def get_seed(self):
+        """
+        The getter method to return the seed of the game.
+
+        return: int
+        """
+        return self.seed
+
+    def get_mode(self):
+        """
+        The getter method to return the mode of the sub-streams.
+
+        return: str
+        """
+        return self.mode
+
+    def stream(self, name):
+        """
+        This method returns a new random.Random for the named sub-stream.
+        The same name always gives the same sequence.
+
+        input:
+        - name: the name of the sub-stream
+
+        return: random.Random
+        """
+        if self.mode == GameRandom.LEGACY:
+            return random.Random(self.seed)
+        digest = hashlib.sha256(f"{self.seed}/{name}".encode()).digest()
+        return random.Random(int.from_bytes(digest[:8], "big"))
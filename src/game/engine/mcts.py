@@ -0,0 +1,271 @@
+from engine.card_belief import CardBelief
+from engine.memory_policy import MemoryPolicy
+from engine.mcts_node import MctsNode
+
+import math
+import time
+
+
+class Mcts:
+    """
+    This class is a Monte Carlo tree search over the game engine.
+    The players do not know the chit cards they have not seen, so every
+    playout first shuffles the unseen chit cards among their places
+    (a determinization), then walks down the tree, choosing the actions
+    of the player to move with UCB1, and finishes with a short rollout
+    of the memory policy. A rollout that does not end the game is scored
+    by the remaining steps of the dragons. Only the chit cards of the
+    best memory policy rank are searched (e.g. the known chit cards that
+    move the dragon, in which order to flip them), as the other chit
+    cards change the chance to win too little for a few thousand
+    playouts to tell them apart, and turns of such noisy choices lose.
+
+    The game engine is changed with apply/undo during a playout and is
+    restored after it, so no state is copied. The nodes are kept in a
+    table keyed by the Zobrist hash of the state and the chit cards seen,
+    so the statistics are shared between transpositions and reused by
+    the next searches (e.g. in the next turns).
+    """
+    EXPLORATION = 0.25      # UCB1 exploration constant
+    ROLLOUT_DEPTH = 4       # Number of flips of a rollout
+    STEPS_SCALE = 2.0       # Remaining steps for a 1/e lower score
+    MAX_NODES = 200000      # The table is cleared above this size
+
+    def __init__(self, rng, exploration=EXPLORATION,
+                 rollout_depth=ROLLOUT_DEPTH):
+        """
+        This method initializes the search.
+
+        input:
+        - rng: the random.Random instance used by the search
+        - exploration: the UCB1 exploration constant
+        - rollout_depth: the number of flips of a rollout
+
+        return: None
+        """
+        self.rng = rng
+        self.exploration = exploration
+        self.rollout_depth = rollout_depth
+        self.table = {}     # State key -> MctsNode
+        self.rollout_policy = MemoryPolicy(rng)
+        self.playouts = 0   # Number of playouts of the last search
+
+    def get_playouts(self):
+        """
+        The getter method to return the number of playouts of the last
+        search.
+
+        return: int
+        """
+        return self.playouts
+
+    def search(self, engine, known, budget_ms):
+        """
+        This method runs playouts from the state of the game engine until
+        the time budget is used, and returns the statistics of the
+        actions of the player to move.
+
+        input:
+        - engine: the game engine to search (e.g. a copy of the game), it
+                  is restored after the search apart from the places of
+                  the unseen chit cards
+        - known: the indexes of the chit cards seen by the players
+        - budget_ms: the time budget in milliseconds
+
+        return: dict (action -> [visits, list of reward sums]), an action
+                is a chit card index or a (chit card index, dragon index)
+        """
+        if len(self.table) > Mcts.MAX_NODES:
+            self.table.clear()
+        chit_cards = engine.get_chit_cards()
+        belief = CardBelief(chit_cards)
+        for i in range(len(chit_cards)):
+            if i in known or chit_cards[i].is_revealed():
+                belief.observe(i, chit_cards[i])
+        unseen = [i for i in range(len(chit_cards))
+                  if not belief.is_seen(i)]
+        self.rollout_policy.set_belief(belief)
+
+        root_key = engine.get_hash() ^ belief.get_hash()
+        deadline = time.perf_counter() + budget_ms / 1000
+        self.playouts = 0
+        while True:
+            self._determinize(engine, unseen)
+            self._playout(engine, belief)
+            self.playouts += 1
+            if time.perf_counter() >= deadline:
+                break
+        return self.table[root_key].get_edges()
+
+    def _determinize(self, engine, unseen):
+        """
+        This method shuffles the unseen chit cards among their places.
+
+        input:
+        - engine: the game engine
+        - unseen: the indexes of the unseen chit cards
+
+        return: None
+        """
+        for k in range(len(unseen) - 1, 0, -1):
+            j = self.rng.randrange(k + 1)
+            if j != k:
+                engine.swap_chit_cards(unseen[k], unseen[j])
+
+    def _playout(self, engine, belief):
+        """
+        This method runs one playout from the state of the game engine
+        and adds its rewards to the nodes it went through.
+
+        input:
+        - engine: the game engine
+        - belief: the chit cards seen by the players
+
+        return: None
+        """
+        chit_cards = engine.get_chit_cards()
+        path = []       # (node, actions) of the playout
+        history = []    # Move records and turn changes, to undo
+        seen = []       # Chit cards first seen in the playout
+        visited = set()  # Keys of the playout, a state can come back
+        rewards = None
+        key = engine.get_hash() ^ belief.get_hash()
+        while rewards is None:
+            node = self.table.get(key)
+            if node is None or key in visited:
+                # Expand the tree with the new state and roll out from it
+                if node is None:
+                    node = MctsNode()
+                    self.table[key] = node
+                path.append((node, ()))
+                rewards = self._rollout(engine, belief, history, seen)
+                break
+            visited.add(key)
+
+            mover = engine.get_current_player().get_id()
+            ranks = self.rollout_policy.ranks(engine)
+            best_rank = min(ranks.values())
+            index = self._select(node, [i for i, rank in ranks.items()
+                                        if rank == best_rank], mover)
+            actions = [index]
+            moves = engine.legal_outcomes(chit_cards[index])
+            move = moves[0]
+            if len(moves) > 1:
+                dragons = engine.get_dragons()
+                options = [(index, dragons.index(move.get_dragon()))
+                           for move in moves]
+                option = self._select(node, options, mover)
+                move = moves[options.index(option)]
+                actions.append(option)
+            path.append((node, actions))
+
+            rewards = self._play(engine, move, belief, history, seen)
+            key = engine.get_hash() ^ belief.get_hash()
+
+        for node, actions in path:
+            node.update(actions, rewards)
+
+        # Restore the game engine and the chit cards seen
+        for entry in reversed(history):
+            if isinstance(entry, list):
+                engine.undo_next_player(entry)
+            else:
+                engine.undo(entry)
+        for index in seen:
+            belief.forget(index, chit_cards[index])
+
+    def _play(self, engine, move, belief, history, seen):
+        """
+        This method applies the move record, ends the turn if needed and
+        remembers the flipped chit card.
+
+        input:
+        - engine: the game engine
+        - move: the move record to apply
+        - belief: the chit cards seen by the players
+        - history: the list of changes to undo
+        - seen: the list of chit cards first seen in the playout
+
+        return: list of rewards if the game ends, otherwise None
+        """
+        engine.apply(move)
+        history.append(move)
+        index = move.get_card_index()
+        if not belief.is_seen(index):
+            belief.observe(index, engine.get_chit_cards()[index])
+            seen.append(index)
+        if move.is_end_game():
+            rewards = [0.0] * len(engine.get_players())
+            rewards[engine.get_current_player().get_id()] = 1.0
+            return rewards
+        if move.is_end_turn():
+            history.append(engine.next_player())
+        return None
+
+    def _select(self, node, actions, mover):
+        """
+        This method chooses an action of the player to move with UCB1.
+        The actions not tried yet are chosen first.
+
+        input:
+        - node: the node of the state
+        - actions: the possible actions
+        - mover: the index of the player to move
+
+        return: the chosen action
+        """
+        edges = node.get_edges()
+        untried = [action for action in actions if action not in edges]
+        if untried:
+            return self.rng.choice(untried)
+
+        log_visits = math.log(max(node.get_visits(), 1))
+        best = None
+        best_score = None
+        for action in actions:
+            visits, sums = edges[action]
+            score = sums[mover] / visits + \
+                self.exploration * math.sqrt(log_visits / visits)
+            if best_score is None or score > best_score:
+                best = action
+                best_score = score
+        return best
+
+    def _rollout(self, engine, belief, history, seen):
+        """
+        This method plays the memory policy for a number of flips.
+
+        input:
+        - engine: the game engine
+        - belief: the chit cards seen by the players
+        - history: the list of changes to undo
+        - seen: the list of chit cards first seen in the playout
+
+        return: list of rewards of every seat
+        """
+        chit_cards = engine.get_chit_cards()
+        for _ in range(self.rollout_depth):
+            index = self.rollout_policy.choose(engine)
+            move = engine.legal_outcomes(chit_cards[index])[0]
+            rewards = self._play(engine, move, belief, history, seen)
+            if rewards is not None:
+                return rewards
+        return self._evaluate(engine)
+
+    def _evaluate(self, engine):
+        """
+        This method scores a state that is not the end of the game by the
+        remaining steps of the dragons. The scores add up to 1.
+
+        input:
+        - engine: the game engine
+
+        return: list of rewards of every seat
+        """
+        scores = []
+        for player in engine.get_players():
+            steps = min(dragon.get_remaining_steps()
+                        for dragon in player.get_dragons())
+            scores.append(math.exp(-steps / Mcts.STEPS_SCALE))
+        total = sum(scores)
+        return [score / total for score in scores]
@@ -0,0 +1,56 @@
+class MctsNode:
+    """
+    This class is a node of the Monte Carlo tree search, i.e. the 
+    statistics of one game state (as seen by the players).
+    The edges are the actions of the player to move in the state: the 
+    chit card to flip, and after the chit card is revealed, the dragon 
+    that performs its action. Each edge keeps the number of playouts 
+    through it and the sum of the rewards of every seat.
+    """
+
+    def __init__(self):
+        """
+        This method initializes the node with no playouts.
+
+        return: None
+        """
+        self.visits = 0
+        self.edges = {}     # Action -> [visits, list of reward sums]
+
+    def get_visits(self):
+        """
+        The getter method to return the number of playouts through the 
+        node.
+
+        return: int
+        """
+        return self.visits
+
+    def get_edges(self):
+        """
+        The getter method to return the edges of the node.
+
+        return: dict
+        """
+        return self.edges
+
+    def update(self, actions, rewards):
+        """
+        This method adds the rewards of a playout through the node.
+
+        input:
+        - actions: the actions taken from the node in the playout
+        - rewards: the reward of every seat
+
+        return: None
+        """
+        self.visits += 1
+        for action in actions:
+            edge = self.edges.get(action)
+            if edge is None:
+                edge = [0, [0.0] * len(rewards)]
+                self.edges[action] = edge
+            edge[0] += 1
+            sums = edge[1]
+            for seat in range(len(rewards)):
+                sums[seat] += rewards[seat]
@@ -0,0 +1,210 @@
+from engine.card_policy import CardPolicy
+from engine.card_belief import CardBelief
+from engine.game_engine import GameEngine
+from engine.mcts import Mcts
+from engine.tablebase import Tablebase
+
+import multiprocessing
+import random
+
+
+class MctsPolicy(CardPolicy):
+    """
+    This class is a card-pick policy of a computer player that searches
+    the game with Monte Carlo tree search.
+    It remembers every chit card flipped (by any player), like the
+    players can, but does not look at the chit cards it has not seen.
+    Each decision searches a copy of the game for a time budget. The
+    search tree is kept between the decisions.
+
+    The search can also run on a process pool: every worker searches its
+    own copy of the game (and keeps its own tree) for the same time
+    budget, and the statistics of the workers are added up.
+    A state solved in the tablebase, if any, is not searched: its best 
+    chit card is flipped at once.
+    """
+    BUDGET_MS = 200     # Time budget of a decision in milliseconds
+    SEARCHES = {}       # Search of each pool worker, kept between tasks
+
+    def __init__(self, rng, budget_ms=BUDGET_MS, worker_num=1,
+                 exploration=Mcts.EXPLORATION,
+                 rollout_depth=Mcts.ROLLOUT_DEPTH, tablebase=None):
+        """
+        This method initializes the policy.
+
+        input:
+        - rng: the random.Random instance used by the policy
+        - budget_ms: the time budget of a decision in milliseconds
+        - worker_num: the number of processes searching, 1 to search in
+                      this process
+        - exploration: the UCB1 exploration constant
+        - rollout_depth: the number of flips of a rollout
+        - tablebase: the opened Tablebase of the solved states, None to 
+                     search every state
+
+        return: None
+        """
+        super().__init__(rng)
+        self.budget_ms = budget_ms
+        self.worker_num = worker_num
+        self.exploration = exploration
+        self.rollout_depth = rollout_depth
+        self.tablebase = tablebase
+        self.belief = CardBelief()  # Chit cards seen
+        self.mcts = Mcts(rng, exploration, rollout_depth)
+        self.pool = None
+        self.stats = {}     # Statistics of the actions of the last search
+        self.playouts = 0   # Number of playouts of the last search
+
+    def get_playouts(self):
+        """
+        The getter method to return the number of playouts of the last
+        decision.
+
+        return: int
+        """
+        return self.playouts
+
+    def get_belief(self):
+        """
+        The getter method to return the chit cards seen by the policy.
+
+        return: CardBelief
+        """
+        return self.belief
+
+    def choose(self, engine):
+        """
+        This method searches the game and chooses the chit card with the
+        most playouts.
+
+        input:
+        - engine: the game engine
+
+        return: int
+        """
+        return self.choose_from_state(engine.save())
+
+    def choose_from_state(self, state):
+        """
+        This method searches the saved game state and chooses the chit
+        card with the most playouts. It does not use the game engine, so
+        it can run in another thread while the game is shown.
+
+        input:
+        - state: the game state (from GameEngine.save)
+
+        return: int
+        """
+        search_engine = GameEngine.from_state(state)
+        if self.tablebase is not None:
+            record = self.tablebase.lookup(
+                Tablebase.state_key(search_engine, self.belief))
+            if record is not None and \
+                    not state["chit_cards"][record[0]]["reveal"]:
+                # The first dragon is chosen, like in the solved states
+                self.stats = {}
+                self.playouts = 0
+                return record[0]
+
+        if self.worker_num > 1:
+            self.stats = self._search_pool(state)
+        else:
+            self.stats = self.mcts.search(search_engine,
+                                          set(self.belief.seen_indexes()),
+                                          self.budget_ms)
+            self.playouts = self.mcts.get_playouts()
+
+        unrevealed = [i for i, chit_card in enumerate(state["chit_cards"])
+                      if not chit_card["reveal"]]
+        return max(unrevealed, key=lambda i: self.stats.get(i, [0])[0])
+
+    def choose_move(self, engine, moves):
+        """
+        This method chooses the dragon with the most playouts in the last
+        search.
+
+        input:
+        - engine: the game engine
+        - moves: the list of MoveRecord from legal_outcomes
+
+        return: MoveRecord
+        """
+        if moves[0].get_dragon() is None:
+            return moves[0]
+        dragons = engine.get_dragons()
+        return max(moves, key=lambda move: self.stats.get(
+            (move.get_card_index(), dragons.index(move.get_dragon())),
+            [0])[0])
+
+    def observe(self, index, chit_card):
+        """
+        This method remembers that the chit card was seen.
+
+        input:
+        - index: the index of the flipped chit card
+        - chit_card: the flipped chit card
+
+        return: None
+        """
+        self.belief.observe(index, chit_card)
+
+    def close(self):
+        """
+        This method stops the process pool, if any.
+
+        return: None
+        """
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool = None
+
+    def _search_pool(self, state):
+        """
+        This method searches the game state on every worker of the pool
+        and adds up the statistics.
+
+        input:
+        - state: the game state
+
+        return: dict (action -> [visits, list of reward sums])
+        """
+        if self.pool is None:
+            self.pool = multiprocessing.Pool(self.worker_num)
+        tasks = [(state, self.belief.seen_indexes(), self.budget_ms,
+                  self.exploration, self.rollout_depth,
+                  self.rng.getrandbits(64))
+                 for _ in range(self.worker_num)]
+        stats = {}
+        self.playouts = 0
+        for worker_stats, playouts in self.pool.imap_unordered(
+                MctsPolicy._search_task, tasks):
+            self.playouts += playouts
+            for action, (visits, sums) in worker_stats.items():
+                edge = stats.setdefault(action, [0, [0.0] * len(sums)])
+                edge[0] += visits
+                for seat in range(len(sums)):
+                    edge[1][seat] += sums[seat]
+        return stats
+
+    @staticmethod
+    def _search_task(task):
+        """
+        This method searches the game state in a pool worker. The search
+        of the worker is kept for its next tasks, so its tree is reused.
+
+        input:
+        - task: the game state, the indexes of the chit cards seen, the
+                time budget, the exploration constant, the rollout depth
+                and a seed for the worker's random numbers
+
+        return: dict, int (the statistics and the number of playouts)
+        """
+        state, known, budget_ms, exploration, rollout_depth, seed = task
+        mcts = MctsPolicy.SEARCHES.get((exploration, rollout_depth))
+        if mcts is None:
+            mcts = Mcts(random.Random(seed), exploration, rollout_depth)
+            MctsPolicy.SEARCHES[(exploration, rollout_depth)] = mcts
+        stats = mcts.search(GameEngine.from_state(state), set(known),
+                            budget_ms)
+        return stats, mcts.get_playouts()
@@ -0,0 +1,111 @@
+from engine.card_policy import CardPolicy
+from engine.card_belief import CardBelief
+
+
+class MemoryPolicy(CardPolicy):
+    """
+    This class is a card-pick policy with perfect memory.
+    The chit cards never change places, so once a chit card is flipped 
+    (by any player) the policy knows it. It flips, in order of 
+    preference:
+    - a known chit card that moves the player's dragon forward
+    - an unknown chit card
+    - a known chit card that ends the turn without moving
+    - a known dragon pirate or dragon spirit chit card
+    A chit card is also known when every other identity is used up.
+    """
+
+    def __init__(self, rng):
+        """
+        This method initializes the memory policy.
+
+        input:
+        - rng: the random.Random instance used by the policy
+
+        return: None
+        """
+        super().__init__(rng)
+        self.belief = CardBelief()  # Chit cards seen
+
+    def choose(self, engine):
+        """
+        This method chooses the most preferred unrevealed chit card.
+        Ties are broken randomly.
+
+        input:
+        - engine: the game engine
+
+        return: int
+        """
+        advance_mask = CardBelief.advance_mask(engine)
+        masks = self.belief.get_masks()
+        best = []
+        best_rank = None
+        for index in CardPolicy.unrevealed(engine):
+            rank = MemoryPolicy._rank(masks[index], advance_mask)
+            if best_rank is None or rank < best_rank:
+                best = [index]
+                best_rank = rank
+            elif rank == best_rank:
+                best.append(index)
+        return self.rng.choice(best)
+
+    def ranks(self, engine):
+        """
+        This method ranks the unrevealed chit cards for the current 
+        player, 0 is the most preferred and 3 the least.
+
+        input:
+        - engine: the game engine
+
+        return: dict (chit card index -> rank)
+        """
+        advance_mask = CardBelief.advance_mask(engine)
+        masks = self.belief.get_masks()
+        return {index: MemoryPolicy._rank(masks[index], advance_mask)
+                for index in CardPolicy.unrevealed(engine)}
+
+    def observe(self, index, chit_card):
+        """
+        This method remembers the flipped chit card.
+
+        input:
+        - index: the index of the flipped chit card
+        - chit_card: the flipped chit card
+
+        return: None
+        """
+        self.belief.observe(index, chit_card)
+
+    def set_belief(self, belief):
+        """
+        The setter method to set the chit cards known by the policy, e.g. 
+        to share the memory with a search.
+
+        input:
+        - belief: the CardBelief of the policy (its first player)
+
+        return: None
+        """
+        self.belief = belief
+
+    @staticmethod
+    def _rank(mask, advance_mask):
+        """
+        This method ranks a chit card for the current player, 0 is the 
+        most preferred.
+
+        input:
+        - mask: the identities the chit card can be
+        - advance_mask: the identities that move a dragon of the player 
+                        forward
+
+        return: int
+        """
+        if mask & (mask - 1):
+            return 1
+        if mask & CardBelief.PENALTY_MASK:
+            return 3
+        if mask & advance_mask:
+            return 0
+        return 2
@@ -0,0 +1,102 @@
+class MoveRecord:
+    """
+    This class records one outcome of flipping a chit card: the chit card, 
+    the dragon that moves (if any), where it moves from and to, the change 
+    of its remaining steps and whether the flip ends the turn or the game.
+    The game engine applies a move record to play the flip, and undoes it 
+    to restore the game to the state before the flip.
+    """
+
+    def __init__(self, card_index, dragon, from_pos, to_pos, steps_delta,
+                 end_turn, end_game):
+        """
+        This method initializes the move record.
+
+        input:
+        - card_index: the index of the flipped chit card
+        - dragon: the dragon that performs the action, None if no dragon 
+                  can perform it
+        - from_pos: the board position of the dragon before the move
+        - to_pos: the board position of the dragon after the move, None 
+                  if the dragon does not move
+        - steps_delta: the change of the remaining steps of the dragon
+        - end_turn: whether the flip ends the turn
+        - end_game: whether the flip ends the game
+
+        return: None
+        """
+        self.card_index = card_index
+        self.dragon = dragon
+        self.from_pos = from_pos
+        self.to_pos = to_pos
+        self.steps_delta = steps_delta
+        self.end_turn = end_turn
+        self.end_game = end_game
+
+    def get_card_index(self):
+        """
+        The getter method to return the index of the flipped chit card.
+
+        return: int
+        """
+        return self.card_index
+
+    def get_dragon(self):
+        """
+        The getter method to return the dragon that performs the action.
+
+        return: Dragon or None
+        """
+        return self.dragon
+
+    def get_from_pos(self):
+        """
+        The getter method to return the board position before the move.
+
+        return: int or None
+        """
+        return self.from_pos
+
+    def get_to_pos(self):
+        """
+        The getter method to return the board position after the move.
+
+        return: int or None if the dragon does not move
+        """
+        return self.to_pos
+
+    def get_steps_delta(self):
+        """
+        The getter method to return the change of the remaining steps.
+
+        return: int
+        """
+        return self.steps_delta
+
+    def is_end_turn(self):
+        """
+        This method checks if the flip ends the turn.
+
+        return: bool
+        """
+        return self.end_turn
+
+    def is_end_game(self):
+        """
+        This method checks if the flip ends the game.
+
+        return: bool
+        """
+        return self.end_game
+
+    def __repr__(self):
+        """
+        This method returns the text of the move record for debugging.
+
+        return: str
+        """
+        dragon_id = None if self.dragon is None else self.dragon.get_id()
+        return (f"MoveRecord(card={self.card_index}, dragon={dragon_id}, "
+                f"{self.from_pos}->{self.to_pos}, "
+                f"steps{self.steps_delta:+d}, end_turn={self.end_turn}, "
+                f"end_game={self.end_game})")
@@ -0,0 +1,19 @@
+from engine.card_policy import CardPolicy
+
+
+class RandomPolicy(CardPolicy):
+    """
+    This class is a card-pick policy that flips a random unrevealed chit 
+    card. It does not remember the flipped chit cards.
+    """
+
+    def choose(self, engine):
+        """
+        This method chooses a random unrevealed chit card.
+
+        input:
+        - engine: the game engine
+
+        return: int
+        """
+        return self.rng.choice(CardPolicy.unrevealed(engine))
@@ -0,0 +1,32 @@
+from engine.card_policy import CardPolicy
+
+
+class ReplayPolicy(CardPolicy):
+    """
+    This class is a card-pick policy that flips the chit cards of a 
+    recorded list of picks, e.g. the picks of a game played by the batch 
+    simulator, so the game can be replayed on the game engine.
+    """
+
+    def __init__(self, picks):
+        """
+        This method initializes the replay policy.
+
+        input:
+        - picks: the list of chit card indexes in the order flipped
+
+        return: None
+        """
+        super().__init__(None)
+        self.picks = iter(picks)
+
+    def choose(self, engine):
+        """
+        This method returns the next recorded chit card.
+
+        input:
+        - engine: the game engine
+
+        return: int
+        """
+        return next(self.picks)
@@ -0,0 +1,113 @@
+import math
+
+
+class SimulationStats:
+    """
+    This class aggregates the game results of the simulator into win 
+    rates per seat (player index), with Wilson score confidence 
+    intervals, and averages per game.
+    A fair game gives every seat a win rate of 1 / number of players.
+    """
+    Z = 1.96    # 95% confidence
+
+    def __init__(self, player_num):
+        """
+        This method initializes the statistics.
+
+        input:
+        - player_num: the number of players
+
+        return: None
+        """
+        self.player_num = player_num
+        self.wins = [0] * player_num
+        self.game_num = 0
+        self.unfinished = 0     # Games stopped without a winner
+        self.turns = 0
+        self.flips = 0
+        self.pirate_hits = 0
+        self.spirit_hits = 0
+
+    def add(self, result):
+        """
+        This method adds a game result.
+
+        input:
+        - result: the game result from the simulator
+
+        return: None
+        """
+        _, winner, turns, flips, pirate_hits, spirit_hits = result
+        self.game_num += 1
+        if winner is None:
+            self.unfinished += 1
+        else:
+            self.wins[winner] += 1
+        self.turns += turns
+        self.flips += flips
+        self.pirate_hits += pirate_hits
+        self.spirit_hits += spirit_hits
+
+    def get_game_num(self):
+        """
+        The getter method to return the number of games added.
+
+        return: int
+        """
+        return self.game_num
+
+    def win_rates(self):
+        """
+        This method returns the win rate of each seat among the finished 
+        games, with its confidence interval.
+
+        return: list of tuples (wins, rate, lower bound, upper bound)
+        """
+        finished = self.game_num - self.unfinished
+        rates = []
+        for wins in self.wins:
+            lower, upper = SimulationStats.wilson(wins, finished)
+            rate = wins / finished if finished else 0.0
+            rates.append((wins, rate, lower, upper))
+        return rates
+
+    def table(self):
+        """
+        This method formats the win rates and averages as a text table.
+
+        return: str
+        """
+        lines = [f"{'seat':>4} {'wins':>10} {'rate':>8} {'95% CI':>19}"]
+        for seat, (wins, rate, lower, upper) in enumerate(self.win_rates()):
+            lines.append(f"{seat:>4} {wins:>10} {rate:>8.4f} "
+                         f"[{lower:.4f}, {upper:.4f}]")
+        games = max(self.game_num, 1)
+        lines.append(f"games: {self.game_num}, "
+                     f"unfinished: {self.unfinished}, "
+                     f"expected rate: {1 / self.player_num:.4f}")
+        lines.append(f"per game: {self.turns / games:.2f} turns, "
+                     f"{self.flips / games:.2f} flips, "
+                     f"{self.pirate_hits / games:.2f} pirate hits, "
+                     f"{self.spirit_hits / games:.2f} spirit hits")
+        return "\n".join(lines)
+
+    @staticmethod
+    def wilson(successes, trials, z=Z):
+        """
+        This method computes the Wilson score interval of a proportion.
+
+        input:
+        - successes: the number of successes
+        - trials: the number of trials
+        - z: the z score of the confidence level
+
+        return: float, float (lower and upper bound)
+        """
+        if trials == 0:
+            return 0.0, 1.0
+        p = successes / trials
+        denominator = 1 + z * z / trials
+        center = (p + z * z / (2 * trials)) / denominator
+        margin = z * math.sqrt(p * (1 - p) / trials
+                               + z * z / (4 * trials * trials)) / denominator
+        return center - margin, center + margin
@@ -0,0 +1,157 @@
+from engine.game_engine import GameEngine
+from engine.random_policy import RandomPolicy
+from engine.memory_policy import MemoryPolicy
+from engine.game_random import GameRandom
+from gamecard.animal_type import AnimalType
+
+import multiprocessing
+
+
+class Simulator:
+    """
+    This class plays complete games headless with the game engine.
+    Every game is identified by its seed, which sets the gameboard, the 
+    chit cards and the card-pick policy (through the sub-streams of the 
+    game), so any game can be replayed.
+    The games can be spread over a process pool. Each task of the pool 
+    plays a range of seeds and sends its game results back as soon as 
+    the range is done.
+
+    The result of a game is a tuple of:
+    (seed, winner seat or None, turns, chit cards flipped, dragon pirate 
+    hits, dragon spirit hits)
+    A game without a winner after the maximum number of turns is stopped.
+    """
+    POLICIES = {
+        "random": RandomPolicy,
+        "memory": MemoryPolicy
+    }
+    MAX_TURNS = 1000    # Max number of turns before a game is stopped
+    CHUNK_SIZE = 256    # Max number of games of a pool task
+    POLICY = "policy"   # Random sub-stream of the card-pick policy
+
+    def __init__(self, player_num, dragon_num=1, size=24, animal_num=4,
+                 policy="memory", max_turns=MAX_TURNS,
+                 rng_mode=GameRandom.STREAMS):
+        """
+        This method initializes the simulator.
+
+        input:
+        - player_num: the number of players
+        - dragon_num: the number of dragons each player possesses
+        - size: the number of volcanoes on the gameboard
+        - animal_num: the number of animal types on the gameboard
+        - policy: the name of the card-pick policy of all the players
+        - max_turns: the max number of turns before a game is stopped
+        - rng_mode: the mode of the random sub-streams of the games
+
+        return: None
+        """
+        if policy not in Simulator.POLICIES:
+            raise ValueError(f"Unknown policy: {policy}")
+        self.player_num = player_num
+        self.dragon_num = dragon_num
+        self.size = size
+        self.animal_num = animal_num
+        self.policy = policy
+        self.max_turns = max_turns
+        self.rng_mode = rng_mode
+
+    def play_game(self, seed, policy=None):
+        """
+        This method plays one complete game.
+
+        input:
+        - seed: the seed of the game
+        - policy: the card-pick policy, None for the simulator's policy
+
+        return: tuple (the game result)
+        """
+        engine = GameEngine(seed, self.player_num, self.dragon_num,
+                            self.size, self.animal_num,
+                            rng_mode=self.rng_mode)
+        if policy is None:
+            policy = Simulator.POLICIES[self.policy](
+                engine.get_rng().stream(Simulator.POLICY))
+        chit_cards = engine.get_chit_cards()
+        turns = 1
+        flips = 0
+        pirate_hits = 0
+        spirit_hits = 0
+        while True:
+            index = policy.choose(engine)
+            chit_card = chit_cards[index]
+            end_turn, end_game = engine.flip(chit_card, policy.choose_move)
+            policy.observe(index, chit_card)
+            flips += 1
+            if chit_card.get_animal() == AnimalType.DRAGON_PIRATE:
+                pirate_hits += 1
+            elif chit_card.get_animal() == AnimalType.DRAGON_SPIRIT:
+                spirit_hits += 1
+
+            if end_game:
+                winner = engine.get_current_player().get_id()
+                break
+            if end_turn:
+                if turns >= self.max_turns:
+                    winner = None
+                    break
+                engine.next_player()
+                turns += 1
+        return seed, winner, turns, flips, pirate_hits, spirit_hits
+
+    def play_range(self, seed_range):
+        """
+        This method plays the games of a range of seeds.
+
+        input:
+        - seed_range: the first seed and the seed after the last (in tuple)
+
+        return: list of tuples (the game results)
+        """
+        return [self.play_game(seed) for seed in range(*seed_range)]
+
+    def run(self, game_num, first_seed=0, worker_num=None):
+        """
+        This method plays the games of the seeds from the first seed, and 
+        yields the game results as they are done. The results come in 
+        the order the games finish, not in the order of the seeds.
+
+        input:
+        - game_num: the number of games
+        - first_seed: the seed of the first game
+        - worker_num: the number of processes, None for one per CPU, 
+                      1 to play in this process
+
+        return: generator of tuples (the game results)
+        """
+        if worker_num is None:
+            worker_num = multiprocessing.cpu_count()
+        seed_ranges = self._split(game_num, first_seed, worker_num)
+        if worker_num <= 1:
+            for seed_range in seed_ranges:
+                yield from self.play_range(seed_range)
+            return
+
+        with multiprocessing.Pool(worker_num) as pool:
+            for results in pool.imap_unordered(self.play_range, seed_ranges):
+                yield from results
+
+    def _split(self, game_num, first_seed, worker_num):
+        """
+        This method splits the seeds into ranges for the pool tasks.
+        There are several ranges per worker, so a worker that finishes 
+        early takes more work.
+
+        input:
+        - game_num: the number of games
+        - first_seed: the seed of the first game
+        - worker_num: the number of processes
+
+        return: list of tuples (the seed ranges)
+        """
+        chunk = max(1, min(Simulator.CHUNK_SIZE,
+                           game_num // (worker_num * 4)))
+        last_seed = first_seed + game_num
+        return [(seed, min(seed + chunk, last_seed))
+                for seed in range(first_seed, last_seed, chunk)]
@@ -0,0 +1,198 @@
+from engine.zobrist_hash import ZobristHash
+
+import mmap
+import os
+import struct
+
+
+class Tablebase:
+    """
+    This class is a file of the best flips of solved game states, read
+    with mmap.
+    The file is a header and a table of fixed-width records (the key of
+    the state, the chance to win and the chit card index) with open
+    addressing: a record is at the slot of its key, or after it if the
+    slot is taken (linear probing), and an empty slot has the key 0. The
+    table is at most half full, so a lookup nearly always reads one page.
+    The file is only read, so the processes that open it share its pages
+    through the page cache and nothing is copied.
+
+    The key of a state is the Zobrist hash of the game state, the chit
+    cards seen and the gameboard layout (see state_key).
+    The table is followed by the list of the games it was built from, so
+    a new game against the bots can be one of them (see get_seeds).
+    """
+    MAGIC = b"FDTB"
+    VERSION = 2
+    # Magic, version, number of slots, number of games
+    HEADER = struct.Struct("<4sIQI")
+    RECORD = struct.Struct("<QfB3x")    # Key, chance to win, chit card index
+    GAME = struct.Struct("<BI")     # Number of players, seed
+    MIN_SLOTS = 16      # Slots of the smallest table
+    DEFAULT_PATH = "src/tablebase.bin"  # File opened by the game's bots
+
+    def __init__(self, file_path):
+        """
+        This method opens the tablebase file. A file that is not a whole
+        tablebase raises a ValueError.
+
+        input:
+        - file_path: the path of the tablebase file
+
+        return: None
+        """
+        with open(file_path, "rb") as file:
+            # An empty file cannot be mapped (ValueError)
+            self.data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(self.data) < Tablebase.HEADER.size:
+            self.data.close()
+            raise ValueError(f"Not a tablebase file: {file_path}")
+        magic, version, slot_num, game_num = Tablebase.HEADER.unpack_from(
+            self.data, 0)
+        # The table must be whole, so a lookup never reads past its end
+        games_offset = Tablebase.HEADER.size \
+            + slot_num * Tablebase.RECORD.size
+        if magic != Tablebase.MAGIC or version != Tablebase.VERSION or \
+                slot_num < 1 or slot_num & (slot_num - 1) or \
+                len(self.data) != games_offset \
+                + game_num * Tablebase.GAME.size:
+            self.data.close()
+            raise ValueError(f"Not a tablebase file: {file_path}")
+        self.mask = slot_num - 1
+        self.games_offset = games_offset
+        self.game_num = game_num
+
+    def get_seeds(self, player_num):
+        """
+        The getter method to return the seeds of the games the tablebase
+        was built from.
+
+        input:
+        - player_num: the number of players of the games
+
+        return: list of int
+        """
+        seeds = []
+        for game_id in range(self.game_num):
+            game_player_num, seed = Tablebase.GAME.unpack_from(
+                self.data, self.games_offset + game_id * Tablebase.GAME.size)
+            if game_player_num == player_num:
+                seeds.append(seed)
+        return seeds
+
+    def lookup(self, key):
+        """
+        This method finds the best flip of a state.
+
+        input:
+        - key: the key of the state (from state_key)
+
+        return: (chit card index, chance to win), or None if the state is
+                not in the table
+        """
+        slot = key & self.mask
+        while True:
+            record_key, chance, index = Tablebase.RECORD.unpack_from(
+                self.data, Tablebase.HEADER.size
+                + slot * Tablebase.RECORD.size)
+            if record_key == key:
+                return index, chance
+            if record_key == 0:
+                return None
+            slot = (slot + 1) & self.mask
+
+    def close(self):
+        """
+        This method closes the tablebase file.
+
+        return: None
+        """
+        self.data.close()
+
+    @staticmethod
+    def write(file_path, records, games=()):
+        """
+        This method writes a tablebase file. The file is replaced at once,
+        so the bots never open a file half written.
+
+        input:
+        - file_path: the path of the tablebase file
+        - records: the list of (key, chit card index, chance to win), a
+                   record with the key 0 is left out
+        - games: the list of (number of players, seed) of the games the
+                 records were solved from
+
+        return: int (the number of records written)
+        """
+        slot_num = Tablebase.MIN_SLOTS
+        while slot_num < 2 * len(records):
+            slot_num *= 2
+        mask = slot_num - 1
+        games_offset = Tablebase.HEADER.size \
+            + slot_num * Tablebase.RECORD.size
+        table = bytearray(games_offset + len(games) * Tablebase.GAME.size)
+        Tablebase.HEADER.pack_into(table, 0, Tablebase.MAGIC,
+                                   Tablebase.VERSION, slot_num, len(games))
+        for game_id, (player_num, seed) in enumerate(games):
+            Tablebase.GAME.pack_into(
+                table, games_offset + game_id * Tablebase.GAME.size,
+                player_num, seed)
+        record_num = 0
+        for key, index, chance in records:
+            if key == 0:
+                continue
+            slot = key & mask
+            while True:
+                offset = Tablebase.HEADER.size + slot * Tablebase.RECORD.size
+                record_key = Tablebase.RECORD.unpack_from(table, offset)[0]
+                if record_key == 0 or record_key == key:
+                    break
+                slot = (slot + 1) & mask
+            if record_key == 0:
+                record_num += 1
+            Tablebase.RECORD.pack_into(table, offset, key, chance, index)
+
+        temp_path = file_path + ".tmp"
+        with open(temp_path, "wb") as file:
+            file.write(table)
+        os.replace(temp_path, file_path)
+        return record_num
+
+    @staticmethod
+    def board_key(engine):
+        """
+        This method returns the key of the gameboard layout and the number
+        of players, as the tables of different games share a file.
+
+        input:
+        - engine: the game engine
+
+        return: int
+        """
+        gameboard = engine.get_gameboard()
+        size = gameboard.get_size()
+        key = ZobristHash.key(ZobristHash.BOARD, 0, len(engine.get_players()))
+        for pos in range(size):
+            key ^= ZobristHash.key(ZobristHash.BOARD, pos + 1,
+                                   gameboard.animal_at(pos).value)
+        for cave_id in range(len(gameboard.get_caves())):
+            key ^= ZobristHash.key(ZobristHash.BOARD, size + cave_id + 1,
+                                   gameboard.get_cave_tile(cave_id))
+        return key
+
+    @staticmethod
+    def state_key(engine, belief, board_key=None):
+        """
+        This method returns the key of a state in the tablebase.
+
+        input:
+        - engine: the game engine
+        - belief: the chit cards seen by the players (CardBelief)
+        - board_key: the key of the gameboard (from board_key), None to 
+                     compute it
+
+        return: int
+        """
+        if board_key is None:
+            board_key = Tablebase.board_key(engine)
+        return engine.get_hash() ^ belief.get_hash() ^ board_key
@@ -0,0 +1,106 @@
+from engine.card_policy import CardPolicy
+from engine.card_belief import CardBelief
+from engine.memory_policy import MemoryPolicy
+from engine.tablebase import Tablebase
+
+
+class TablebasePolicy(CardPolicy):
+    """
+    This class is a card-pick policy that flips the best chit card of
+    the solved states in a tablebase, and flips like another policy (the
+    memory policy by default) in the states that are not in it.
+    A lookup reads one record of the file, so a flip takes microseconds.
+    """
+
+    def __init__(self, rng, tablebase, fallback=None):
+        """
+        This method initializes the tablebase policy.
+
+        input:
+        - rng: the random.Random instance used by the policy
+        - tablebase: the opened Tablebase
+        - fallback: the policy of the states not in the tablebase, None
+                    for the memory policy
+
+        return: None
+        """
+        super().__init__(rng)
+        self.tablebase = tablebase
+        self.belief = CardBelief()  # Chit cards seen
+        if fallback is None:
+            fallback = MemoryPolicy(rng)
+            fallback.set_belief(self.belief)
+        self.fallback = fallback
+        self.gameboard = None   # Gameboard of the board key
+        self.board_key = 0
+        self.hits = 0   # Number of flips found in the tablebase
+        self.misses = 0     # Number of flips of the fallback policy
+
+    def get_hits(self):
+        """
+        The getter method to return the number of flips found in the
+        tablebase.
+
+        return: int
+        """
+        return self.hits
+
+    def get_misses(self):
+        """
+        The getter method to return the number of flips chosen by the
+        fallback policy.
+
+        return: int
+        """
+        return self.misses
+
+    def choose(self, engine):
+        """
+        This method chooses the best chit card of the state in the
+        tablebase, or the chit card of the fallback policy.
+
+        input:
+        - engine: the game engine
+
+        return: int
+        """
+        index = self.lookup(engine)
+        if index is not None:
+            return index
+        return self.fallback.choose(engine)
+
+    def lookup(self, engine):
+        """
+        This method looks the state up in the tablebase.
+
+        input:
+        - engine: the game engine
+
+        return: int (the index of the best chit card), or None if the
+                state is not in the tablebase
+        """
+        if engine.get_gameboard() is not self.gameboard:
+            self.gameboard = engine.get_gameboard()
+            self.board_key = Tablebase.board_key(engine)
+        record = self.tablebase.lookup(
+            Tablebase.state_key(engine, self.belief, self.board_key))
+        if record is None or \
+                engine.get_chit_cards()[record[0]].is_revealed():
+            self.misses += 1
+            return None
+        self.hits += 1
+        return record[0]
+
+    def observe(self, index, chit_card):
+        """
+        This method remembers the flipped chit card.
+
+        input:
+        - index: the index of the flipped chit card
+        - chit_card: the flipped chit card
+
+        return: None
+        """
+        self.belief.observe(index, chit_card)
+        # A fallback sharing the memory sees the chit card once
+        self.fallback.observe(index, chit_card)
@@ -0,0 +1,409 @@
+from engine.card_belief import CardBelief
+from engine.memory_policy import MemoryPolicy
+
+import random
+import time
+
+
+class WinSolver:
+    """
+    This class computes the exact chance of each seat to win from a game
+    state, when every player flips with the memory policy.
+    The solver knows what the players know: a chit card seen keeps its
+    identity, and flipping an unseen chit card is a chance over the
+    identities not seen yet (the unseen places are alike, so one of them
+    stands for all). The moves come from the game engine (legal_outcomes,
+    apply, undo and next_player), so an exact landing, a blocked
+    destination or the last chit card ends the turn as in a game.
+
+    The states reachable from the game state are found once, depth first,
+    and kept in a table keyed by the Zobrist hash of the state (the
+    places and remaining steps of the dragons, the chit cards revealed and
+    the current player) and the chit cards seen. A state can come back
+    (e.g. a dragon pirate moves a dragon back), so the chances are then
+    found by value iteration, children before parents, until they change
+    by less than the tolerance. The chances only grow during the
+    iteration, and a state with a dragon too far from its cave is not
+    solved, so the chance of each seat is never too high, and the chance
+    left over is reported as undecided.
+    The chances of the states also give the best flip of each state for
+    the player to move, if the other flips are the memory policy's (see
+    best_actions).
+
+    Early in a game nearly every chit card is unseen and the states are
+    too many to solve (over 200000 from the first turn of two players),
+    so the search gives up at a number of states, or when its time
+    budget is spent (e.g. in a game, where the window must not wait for
+    long). Once most chit cards are seen a game is solved in a few
+    seconds.
+    """
+    MAX_STATES = 200000     # States searched before the solver gives up
+    STEPS_CAP = 50          # A state with more remaining steps is not solved
+    TOLERANCE = 1e-9        # Largest change of a sweep at convergence
+    MAX_SWEEPS = 10000      # Sweeps of the value iteration before it stops
+    UNSOLVED = -1000        # Target of a flip to a state not solved
+    EXACT_UNDECIDED = 1e-6  # Largest undecided chance of exact chances
+    CLOCK_STATES = 256      # States searched between checks of the time
+
+    def __init__(self, max_states=MAX_STATES, steps_cap=STEPS_CAP,
+                 tolerance=TOLERANCE, every_unseen=False, budget_ms=None):
+        """
+        This method initializes the solver.
+
+        input:
+        - max_states: the number of states searched before giving up
+        - steps_cap: the remaining steps above which a state is not solved
+        - tolerance: the largest change of a sweep at convergence
+        - every_unseen: True to search the flip of every unseen chit card
+                        instead of one standing for all, e.g. for the best 
+                        flips of the states a game can reach (the chances 
+                        are the same, with more states)
+        - budget_ms: the time budget of a solve in milliseconds, None for
+                     no budget. A solve over the budget gives up like one
+                     with too many states.
+
+        return: None
+        """
+        self.max_states = max_states
+        self.steps_cap = steps_cap
+        self.tolerance = tolerance
+        self.every_unseen = every_unseen
+        self.budget_ms = budget_ms
+        self.deadline = None    # Time the last solve gives up, None if never
+        # Only ranks the chit cards, so its random numbers are not used
+        self.policy = MemoryPolicy(random.Random(0))
+        self.state_num = 0      # Number of states of the last solve
+        self.sweeps = 0         # Sweeps of the value iteration of the last solve
+        self.undecided = 0.0    # Chance not given to any seat by the last solve
+        self.keys = []          # Key of each state of the last solve
+        self.movers = []        # Player to move in each state
+        self.edges = []         # Flips of each state
+        self.values = []        # Chances of each state
+
+    def get_state_num(self):
+        """
+        The getter method to return the number of states of the last solve.
+
+        return: int
+        """
+        return self.state_num
+
+    def get_sweeps(self):
+        """
+        The getter method to return the number of sweeps of the value
+        iteration of the last solve.
+
+        return: int
+        """
+        return self.sweeps
+
+    def get_undecided(self):
+        """
+        The getter method to return the chance of the last solve that is
+        not given to any seat (states not solved and the tolerance).
+
+        return: float
+        """
+        return self.undecided
+
+    def is_exact(self):
+        """
+        This method checks if the last solve gave the exact chances: the
+        states were not too many and nearly no chance is undecided. If
+        not, the solver gave up and the chances are only lower bounds.
+
+        return: bool
+        """
+        return len(self.values) > 0 and \
+            self.undecided <= WinSolver.EXACT_UNDECIDED
+
+    def solve(self, engine, known):
+        """
+        This method computes the chance of each seat to win from the state
+        of the game engine.
+
+        input:
+        - engine: the game engine (e.g. a copy of the game), it is restored
+                  after the solve
+        - known: the indexes of the chit cards seen by the players
+
+        return: list of float (one chance per seat, lower bounds if not
+                is_exact), or None if the states are too many
+        """
+        self.deadline = None
+        if self.budget_ms is not None:
+            self.deadline = time.perf_counter() + self.budget_ms / 1000
+        chit_cards = engine.get_chit_cards()
+        belief = CardBelief(chit_cards)
+        for i in range(len(chit_cards)):
+            if i in known or chit_cards[i].is_revealed():
+                belief.observe(i, chit_cards[i])
+        self.policy.set_belief(belief)
+
+        self.keys = []
+        self.movers = []
+        self.edges, order = self._search(engine, belief)
+        if self.edges is None:
+            self.edges = []
+            self.values = []
+            self.state_num = len(self.keys)
+            self.undecided = 1.0
+            return None
+        self.state_num = len(self.edges)
+        self.values = self._iterate(self.edges, order,
+                                    len(engine.get_players()))
+        self.undecided = max(0.0, 1.0 - sum(self.values[0]))
+        return self.values[0]
+
+    def best_actions(self):
+        """
+        This method finds the best flip of each state of the last solve for 
+        the player to move: the chit card of the best memory policy rank 
+        with the highest chance to win. Any unseen chit card is as good as 
+        the one given.
+
+        return: list of (key, chit card index, chance to win), the key is 
+                the Zobrist hash of the state and the chit cards seen
+        """
+        actions = []
+        for state in range(len(self.edges)):
+            mover = self.movers[state]
+            # Chit card index -> [chance of the flip, chance to win]
+            flips = {}
+            for chance, target, index in self.edges[state]:
+                flip = flips.setdefault(index, [0.0, 0.0])
+                flip[0] += chance
+                if target >= 0:
+                    flip[1] += chance * self.values[target][mover]
+                elif -1 - target == mover:
+                    flip[1] += chance
+            best = None
+            best_chance = -1.0
+            for index, (chance, win) in flips.items():
+                win /= chance
+                if win > best_chance:
+                    best = index
+                    best_chance = win
+            if best is not None:
+                actions.append((self.keys[state], best, best_chance))
+        return actions
+
+    def _search(self, engine, belief):
+        """
+        This method finds the states reachable from the state of the game
+        engine, depth first, with the chance of each flip.
+
+        input:
+        - engine: the game engine
+        - belief: the chit cards seen by the players
+
+        return: list of list of (chance, target, chit card index) for each
+                state, the first being the state of the game engine, and 
+                the states in the order their children are done, or None, 
+                None if the states are too many. A target is a state, 
+                -1 - seat if the seat wins, or UNSOLVED.
+        """
+        key = engine.get_hash() ^ belief.get_hash()
+        table = {key: 0}
+        self.keys.append(key)
+        self.movers.append(engine.get_current_player().get_id())
+        edges = [[]]
+        order = []
+        # (state, flips left to try, change to undo when it is done)
+        stack = [(0, self._branches(engine, belief), None)]
+        while stack:
+            state, branches, entry = stack[-1]
+            if not branches:
+                stack.pop()
+                order.append(state)
+                if entry is not None:
+                    self._undo(engine, belief, entry)
+                continue
+
+            chance, index, other = branches.pop()
+            child_entry = self._play(engine, belief, index, other)
+            move = child_entry[0]
+            if move.is_end_game():
+                winner = engine.get_current_player().get_id()
+                edges[state].append((chance, -1 - winner, index))
+            elif not self._is_capped(engine):
+                key = engine.get_hash() ^ belief.get_hash()
+                target = table.get(key)
+                if target is None:
+                    if len(edges) >= self.max_states or \
+                            (len(edges) % WinSolver.CLOCK_STATES == 0
+                             and self._is_late()):
+                        # Give up and restore the game engine
+                        self._undo(engine, belief, child_entry)
+                        for _, _, entry in reversed(stack):
+                            if entry is not None:
+                                self._undo(engine, belief, entry)
+                        return None, None
+                    target = len(edges)
+                    table[key] = target
+                    self.keys.append(key)
+                    self.movers.append(engine.get_current_player().get_id())
+                    edges.append([])
+                    edges[state].append((chance, target, index))
+                    stack.append((target, self._branches(engine, belief),
+                                  child_entry))
+                    continue
+                edges[state].append((chance, target, index))
+            else:
+                # Not solved, its chance stays undecided
+                edges[state].append((chance, WinSolver.UNSOLVED, index))
+            self._undo(engine, belief, child_entry)
+        return edges, order
+
+    def _branches(self, engine, belief):
+        """
+        This method finds the flips of the memory policy and their chance:
+        the chit cards of the best rank are equally likely, and an unseen
+        chit card can be any identity not seen yet.
+
+        input:
+        - engine: the game engine
+        - belief: the chit cards seen by the players
+
+        return: list of (chance, chit card index, index of the unseen chit
+                card to swap with it, or None)
+        """
+        ranks = self.policy.ranks(engine)
+        best_rank = min(ranks.values())
+        picks = [i for i, rank in ranks.items() if rank == best_rank]
+        chance = 1 / len(picks)
+        branches = []
+        unseen = []
+        for i in picks:
+            if belief.is_seen(i):
+                branches.append((chance, i, None))
+            else:
+                unseen.append(i)
+        if not unseen:
+            return branches
+
+        # The unseen chit cards are alike, so the first one stands for all,
+        # and an unseen chit card of each identity is swapped to its place
+        chit_cards = engine.get_chit_cards()
+        indexes = unseen if self.every_unseen else unseen[:1]
+        chance *= len(unseen) / len(indexes)
+        copies = belief.unseen_copies()
+        unseen_num = sum(copies.values())
+        for index in indexes:
+            for identity, num in copies.items():
+                other = next(i for i in unseen if CardBelief.identity(
+                    chit_cards[i]) == identity)
+                branches.append((chance * num / unseen_num, index,
+                                 None if other == index else other))
+        return branches
+
+    def _play(self, engine, belief, index, other):
+        """
+        This method flips the chit card, ends the turn if needed and
+        remembers the chit card.
+
+        input:
+        - engine: the game engine
+        - belief: the chit cards seen by the players
+        - index: the index of the chit card to flip
+        - other: the index of the unseen chit card to swap to its place
+                 first, or None
+
+        return: tuple (the change to undo)
+        """
+        chit_cards = engine.get_chit_cards()
+        if other is not None:
+            engine.swap_chit_cards(index, other)
+        move = engine.legal_outcomes(chit_cards[index])[0]
+        engine.apply(move)
+        seen = not belief.is_seen(index)
+        if seen:
+            belief.observe(index, chit_cards[index])
+        revealed = None
+        if move.is_end_turn() and not move.is_end_game():
+            revealed = engine.next_player()
+        return move, revealed, seen, other
+
+    def _undo(self, engine, belief, entry):
+        """
+        This method undoes _play.
+
+        input:
+        - engine: the game engine
+        - belief: the chit cards seen by the players
+        - entry: the change returned by _play
+
+        return: None
+        """
+        move, revealed, seen, other = entry
+        index = move.get_card_index()
+        if revealed is not None:
+            engine.undo_next_player(revealed)
+        if seen:
+            belief.forget(index, engine.get_chit_cards()[index])
+        engine.undo(move)
+        if other is not None:
+            engine.swap_chit_cards(index, other)
+
+    def _is_capped(self, engine):
+        """
+        This method checks if a dragon has more remaining steps than the
+        solver solves.
+
+        input:
+        - engine: the game engine
+
+        return: bool
+        """
+        return any(dragon.get_remaining_steps() > self.steps_cap
+                   for dragon in engine.get_dragons())
+
+    def _iterate(self, edges, order, player_num):
+        """
+        This method finds the chance of each seat to win from every state
+        by value iteration. The states are swept children first, so a
+        state that cannot come back is done in the first sweep. The
+        iteration stops early if the time budget is spent.
+
+        input:
+        - edges: the flips of each state (from _search)
+        - order: the states in the order their children are done
+        - player_num: the number of seats
+
+        return: list of list of float (the chances of each state)
+        """
+        values = [[0.0] * player_num for _ in edges]
+        totals = [0.0] * len(edges)
+        self.sweeps = 0
+        while self.sweeps < WinSolver.MAX_SWEEPS:
+            self.sweeps += 1
+            change = 0.0
+            for state in order:
+                value = [0.0] * player_num
+                for chance, target, _ in edges[state]:
+                    if target == WinSolver.UNSOLVED:
+                        continue
+                    if target < 0:
+                        value[-1 - target] += chance
+                    else:
+                        child = values[target]
+                        for seat in range(player_num):
+                            value[seat] += chance * child[seat]
+                values[state] = value
+                # The chances only grow, so their sum bounds each change
+                total = sum(value)
+                change = max(change, total - totals[state])
+                totals[state] = total
+            # Out of time, the chances left over stay undecided
+            if change < self.tolerance or self._is_late():
+                break
+        return values
+
+    def _is_late(self):
+        """
+        This method checks if the time budget of the solve is spent.
+
+        return: bool
+        """
+        return self.deadline is not None and \
+            time.perf_counter() > self.deadline
@@ -0,0 +1,111 @@
+class ZobristHash:
+    """
+    This class is an incrementally updated 64-bit hash of a game state.
+    Each part of the state (the board position and the remaining steps 
+    of each dragon, the reveal flag of each chit card, the current player 
+    and the number of chit cards revealed) has a 64-bit key, and the hash 
+    is the XOR of the keys of the current values. When a value changes, 
+    the key of the old value and the key of the new value are XORed into 
+    the hash, so the hash is kept up to date in constant time.
+
+    The keys are not drawn from a random table, because the remaining 
+    steps have no upper bound. Instead, each key is a splitmix64 hash of 
+    its part and value, so the same state always has the same hash (in 
+    every process and every run). The keys are cached once computed.
+    """
+    MASK = (1 << 64) - 1
+    # The parts of the state
+    DRAGON_POS = 1
+    DRAGON_STEPS = 2
+    CARD_REVEAL = 3
+    CURRENT_PLAYER = 4
+    CARD_REVEAL_NUM = 5
+    CARD_KNOWN = 6      # Chit card seen by the players (used by the bots)
+    BOARD = 7           # Layout of the gameboard (used by the tablebase)
+    KEYS = {}   # (part, index, value) -> key, shared by all the hashes
+
+    def __init__(self):
+        """
+        This method initializes the hash of an empty state.
+
+        return: None
+        """
+        self.value = 0
+
+    def get_value(self):
+        """
+        The getter method to return the hash of the state.
+
+        return: int
+        """
+        return self.value
+
+    def toggle(self, part, index, value):
+        """
+        This method adds (or removes, as XOR is its own inverse) the value 
+        of a part of the state to the hash.
+
+        input:
+        - part: the part of the state, e.g. ZobristHash.DRAGON_POS
+        - index: the index of the dragon or chit card (0 if none)
+        - value: the value of the part
+
+        return: None
+        """
+        self.value ^= ZobristHash.key(part, index, value)
+
+    def change(self, part, index, old_value, new_value):
+        """
+        This method updates the hash when a part of the state changes.
+        A None value is not part of the hash.
+
+        input:
+        - part: the part of the state
+        - index: the index of the dragon or chit card (0 if none)
+        - old_value: the value before the change
+        - new_value: the value after the change
+
+        return: None
+        """
+        if old_value == new_value:
+            return
+        if old_value is not None:
+            self.toggle(part, index, old_value)
+        if new_value is not None:
+            self.toggle(part, index, new_value)
+
+    @staticmethod
+    def key(part, index, value):
+        """
+        This method returns the key of the value of a part of the state.
+
+        input:
+        - part: the part of the state
+        - index: the index of the dragon or chit card
+        - value: the value of the part
+
+        return: int
+        """
+        entry = (part, index, value)
+        key = ZobristHash.KEYS.get(entry)
+        if key is None:
+            key = ZobristHash.splitmix64(part)
+            key = ZobristHash.splitmix64(key ^ (index & ZobristHash.MASK))
+            key = ZobristHash.splitmix64(key ^ (value & ZobristHash.MASK))
+            ZobristHash.KEYS[entry] = key
+        return key
+
+    @staticmethod
+    def splitmix64(x):
+        """
+        This method mixes a 64-bit integer with the splitmix64 finalizer.
+
+        input:
+        - x: the integer
+
+        return: int (64-bit)
+        """
+        x = (x + 0x9E3779B97F4A7C15) & ZobristHash.MASK
+        x = ((x ^ (x >> 30)) * 0xBF58476D1CE4E5B9) & ZobristHash.MASK
+        x = ((x ^ (x >> 27)) * 0x94D049BB133111EB) & ZobristHash.MASK
+        return x ^ (x >> 31)
@@ -0,0 +1,61 @@
+import pygame
+
+
+class FontRegistry:
+    """
+    This class is used to keep the font objects of the game.
+    Resolving a system font scans the fonts installed on the system,
+    so each (family, size) font is only built once and reused.
+    """
+
+    def __init__(self):
+        """
+        This method initializes the font registry.
+
+        return: None
+        """
+        self.fonts = {}     # (family, size) -> pygame font
+        self.hits = 0
+        self.misses = 0
+
+    def get_font(self, family, size):
+        """
+        This method returns the font of the family and size.
+        The font is created on the first request.
+
+        input:
+        - family: the font family
+        - size: the font size
+
+        return: pygame.font.Font
+        """
+        key = (family, size)
+        font = self.fonts.get(key)
+        if font is None:
+            self.misses += 1
+            font = pygame.font.SysFont(family, size)
+            self.fonts[key] = font
+        else:
+            self.hits += 1
+        return font
+
+    def clear(self):
+        """
+        This method removes all the fonts from the registry.
+        Should be called if pygame.font is re-initialised.
+
+        return: None
+        """
+        self.fonts.clear()
+
+    def stats(self):
+        """
+        This method returns the statistics of the registry.
+
+        return: dict
+        """
+        return {
+            "fonts": len(self.fonts),
+            "hits": self.hits,
+            "misses": self.misses
+        }
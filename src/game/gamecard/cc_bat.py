@@ -22,17 +22,15 @@ class BatCC(ChitCard):
         super().__init__(BatCC.ANIMAL_TYPE, animal_num,
                          f"images/chit cards/bat {animal_num}.png")
 
-    def get_action(self, dragon, volcanoe_zones, caves):
+    def get_action(self, dragon, gameboard):
         """
         This method is used to get the action of the chit card.
         The action is to move the dragon forward.
 
         input:
         - dragon: the dragon object
-        - volcanoe_zones: the list of volcanoes
-        - caves: the list of caves
+        - gameboard: the gameboard
 
         return: ForwardAction
         """
-        return ForwardAction(dragon, self.get_animal_num(), 
-                             volcanoe_zones, caves)
\ No newline at end of file
+        return ForwardAction(dragon, self.get_animal_num(), gameboard)
\ No newline at end of file
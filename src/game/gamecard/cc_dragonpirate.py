@@ -24,21 +24,20 @@ class DragonPirateCC(ChitCard):
         super().__init__(DragonPirateCC.ANIMAL_TYPE, animal_num,
                          f"images/chit cards/dragon pirate {animal_num}.png")
 
-    def valid_dragon(self, dragons, volcanoe_zones, caves):
+    def valid_dragon(self, dragons, gameboard):
         """
         This method is used to get the valid dragons that can be moved.
         For this chit card action, all the dragons are valid.
 
         input:
         - dragons: the list of dragons
-        - volcanoe_zones: the list of volcanoes
-        - caves: the list of caves
+        - gameboard: the gameboard
 
         return: list of dragons
         """
         return dragons
 
-    def get_action(self, dragon, volcanoe_zones, caves):
+    def get_action(self, dragon, gameboard):
         """
         This method is used to get the action of the chit card.
         The action is to move the dragon backward.
@@ -46,10 +45,9 @@ class DragonPirateCC(ChitCard):
 
         input:
         - dragon: the dragon object
-        - volcanoe_zones: the list of volcanoes
-        - caves: the list of caves
+        - gameboard: the gameboard
 
         return: BackwardAction
         """
         return SpecialBackwardAction(dragon, self.get_animal_num(), 
-                                     volcanoe_zones, caves)
\ No newline at end of file
+                                     gameboard)
\ No newline at end of file
@@ -20,25 +20,24 @@ class DragonSpiritCC(ChitCard):
         super().__init__(DragonSpiritCC.ANIMAL_TYPE, 1,
                          f"images/chit cards/dragon spirit.png")
 
-    def valid_dragon(self, dragons, volcanoe_zones, caves):
+    def valid_dragon(self, dragons, gameboard):
         """
         This method is used to get the valid dragons that can be moved.
         For this chit card action, all the dragons are valid.
 
         input:
         - dragons: the list of dragons
-        - volcanoe_zones: the list of volcanoes
-        - caves: the list of caves
+        - gameboard: the gameboard
 
         return: list of dragons
         """
         return dragons
 
-    def get_action(self, dragon, volcanoe_zones, caves):
+    def get_action(self, dragon, gameboard):
         """
         This method is used to get the action of the chit card.
         The action is to teleport the dragon to a nearest unoccupied cave
         which is located at the backwards.
         """
         return TeleportCaveAction(dragon, self.get_animal_num(), 
-                                  volcanoe_zones, caves)
\ No newline at end of file
+                                  gameboard)
\ No newline at end of file
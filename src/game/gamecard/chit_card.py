@@ -1,11 +1,10 @@
 from button import Button
 from gamecard.card import Card
-from display import Display
 from memorable import Memorable
+from engine.zobrist_hash import ZobristHash
 
 
 from abc import abstractmethod
-import pygame
 
 
 class ChitCard(Button, Card, Memorable):
@@ -36,30 +35,9 @@ class ChitCard(Button, Card, Memorable):
         Card.__init__(self, animal)
         self.animal_num = animal_num
         self.reveal = False  # To detect whether the card is flipped
-        self.front_image = Display.load_img(front_image_path, ChitCard.SCALE)
-        self.back_image = Display.load_img(
-            ChitCard.BACK_IMG_PATH, ChitCard.SCALE)
-
-    def is_clicked(self):
-        """
-        This method checks if the chit card is clicked.
-        If the chit card is clicked, the method returns True and the front 
-        image of the chit card is shown.
-        It cannot be clicked anymore until the next player's turn.
-
-        return: bool
-        """
-        rect = self.image.get_rect()
-        rect.center = (self.x, self.y)
-
-        pos = pygame.mouse.get_pos()
-        if rect.collidepoint(pos):
-            if pygame.mouse.get_pressed()[0] and not self.clicked and not self.reveal:
-                self.clicked = True
-                self.set_reveal_true()
-                return True
-        if not pygame.mouse.get_pressed()[0]:
-            self.clicked = False
+        self.front_image_path = front_image_path
+        self.zobrist = None     # Hash of the game state, if any
+        self.index = None       # Index of the chit card in the game
 
     def get_animal_num(self):
         """
@@ -70,6 +48,14 @@ class ChitCard(Button, Card, Memorable):
         """
         return self.animal_num
 
+    def is_revealed(self):
+        """
+        This method checks if the chit card is flipped.
+
+        return: bool
+        """
+        return self.reveal
+
     def set_reveal_true(self):
         """
         This method sets the reveal attribute to True
@@ -77,8 +63,27 @@ class ChitCard(Button, Card, Memorable):
 
         return: None
         """
+        if self.zobrist is not None and not self.reveal:
+            self.zobrist.toggle(ZobristHash.CARD_REVEAL, self.index, 1)
         self.reveal = True
-        self.image = self.front_image
+        self.set_image_path(self.front_image_path)
+
+    def set_zobrist(self, zobrist, index):
+        """
+        The setter method to set the hash of the game state that the 
+        chit card updates when it is flipped. The reveal flag of the chit 
+        card is added to the hash.
+
+        input:
+        - zobrist: the ZobristHash of the game state
+        - index: the index of the chit card in the game
+
+        return: None
+        """
+        self.zobrist = zobrist
+        self.index = index
+        if self.reveal:
+            zobrist.toggle(ZobristHash.CARD_REVEAL, index, 1)
 
     def save(self):
         """
@@ -109,45 +114,31 @@ class ChitCard(Button, Card, Memorable):
 
         return: None
         """
+        if self.zobrist is not None and self.reveal:
+            self.zobrist.toggle(ZobristHash.CARD_REVEAL, self.index, 1)
         self.reveal = False
-        self.image = self.back_image
+        self.set_image_path(ChitCard.BACK_IMG_PATH)
 
-    def valid_dragon(self, dragons, volcanoe_zones, caves):
+    def valid_dragon(self, dragons, gameboard):
         """
         This method checks if any dragon is valid to move 
         based on the animal on the chit card.
 
         input:
         - dragons: the list of dragons
-        - volcanoe_zones: the list of volcanoes
-        - caves: the list of caves
+        - gameboard: the gameboard
 
         return: list of dragons
         """
         valid_dragons = []
         for dragon in dragons:
-            pos = dragon.get_board_pos()
-            # Get the volcano the dragon is currently on
-            vzone_index = pos // 3
-            v_index = pos % 3
-            volcano = volcanoe_zones[vzone_index].get_volcanoes()[v_index]
-            if pos >= 0:
-                vzone_index = pos // 3
-                v_index = pos % 3
-                land = volcanoe_zones[vzone_index].get_volcanoes()[v_index]
-            # Get the cave the dragon is currently on
-            else:
-                vol_pos = abs(pos) - 1
-                vzone_index = vol_pos // 3
-                v_index = vol_pos % 3
-                volcano = volcanoe_zones[vzone_index].get_volcanoes()[v_index]
-                land = caves[volcano.get_cave_id()]
-            if land.get_animal() == self.get_animal():
+            # Get the animal of the land the dragon is currently on
+            if gameboard.animal_at(dragon.get_board_pos()) == self.get_animal():
                 valid_dragons.append(dragon)
         return valid_dragons
 
     @abstractmethod
-    def get_action(self, dragon, volcanoe_zones, caves):
+    def get_action(self, dragon, gameboard):
         """
         This method is an abstract method that is used to define the 
         action of the chit card. The specific action should be 
@@ -155,8 +146,7 @@ class ChitCard(Button, Card, Memorable):
 
         input:
         - dragon: the dragon object
-        - volcanoe_zones: the list of volcanoes
-        - caves: the list of caves
+        - gameboard: the gameboard
 
         return: MoveAction
         """
@@ -37,6 +37,8 @@ class End(Page):
         return: None
         """
         end_bg = Display.load_bg(self.window, 'images/backgrounds/ending.png')
+        # Load player image (token)
+        winner_img = Display.load_img(self.winner_img_path, 1)
 
         run = True
         while run:
@@ -48,15 +50,13 @@ class End(Page):
                               self.window.get_width()//2,
                               self.window.get_height()*2.9//3, False)
 
-            # Load player image (token)
-            winner_img = Display.load_img(self.winner_img_path, 1)
             # Draw player image (token)
             Display.draw_img(self.window, winner_img, self.window.get_width()//2,
                              self.window.get_height()//2)
 
             pygame.display.update()
 
-            for event in pygame.event.get():
+            for event in self.next_events():
                 if event.type == pygame.QUIT:
                     Display.quit()
                 elif event.type == pygame.KEYDOWN:
@@ -0,0 +1,136 @@
+import pygame
+import time
+from collections import deque
+
+
+class FrameLoop:
+    """
+    This class is the shared loop driver of the pages.
+    Each iteration of a page loop asks the frame loop for the events of
+    the next frame. The frame loop caps the frame rate, and when nothing
+    is animating it blocks until an event arrives instead of spinning.
+    It also records how long each frame took to process.
+    """
+    FPS = 60                # Default frame rate cap
+    IDLE_TIMEOUT = 250      # Max time (ms) to block while idle
+    SAMPLE_NUM = 600        # Number of frame times kept for statistics
+    HISTOGRAM_BOUNDS = (1, 2, 4, 8, 16, 33, 66)   # Bucket bounds (ms)
+
+    def __init__(self, fps=FPS, idle=True):
+        """
+        This method initializes the frame loop.
+
+        input:
+        - fps: the frame rate cap (0 for uncapped)
+        - idle: whether to block on events when nothing is animating
+
+        return: None
+        """
+        self.fps = fps
+        self.idle = idle
+        self.clock = pygame.time.Clock()
+        self.frame_times = deque(maxlen=FrameLoop.SAMPLE_NUM)
+        self.frame_start = None     # Start time of the current frame
+        self.frame_num = 0
+
+    def next_frame(self, animating=False):
+        """
+        This method ends the current frame and waits for the next one.
+        The frame rate is capped to the fps. If idle mode is on and
+        nothing is animating, it blocks until an event arrives (or until
+        the idle timeout, so timed elements are still updated).
+
+        input:
+        - animating: whether something on the page is animating
+
+        return: list of events of the next frame
+        """
+        if self.frame_start is not None:
+            self.frame_times.append(
+                (time.perf_counter() - self.frame_start) * 1000)
+
+        self.clock.tick(self.fps)
+        if self.idle and not animating:
+            events = FrameLoop._wait_events()
+        else:
+            events = pygame.event.get()
+
+        self.frame_start = time.perf_counter()
+        self.frame_num += 1
+        return events
+
+    def stats(self):
+        """
+        This method returns the statistics of the recent frame times in
+        milliseconds. The frame time does not include the time spent
+        waiting for the next frame.
+
+        return: dict
+        """
+        times = sorted(self.frame_times)
+        if not times:
+            return {"frames": self.frame_num, "samples": 0}
+        return {
+            "frames": self.frame_num,
+            "samples": len(times),
+            "mean_ms": sum(times) / len(times),
+            "p50_ms": times[len(times) // 2],
+            "p95_ms": times[min(len(times) - 1, int(len(times) * 0.95))],
+            "max_ms": times[-1],
+            "fps": self.clock.get_fps()
+        }
+
+    def report(self):
+        """
+        This method returns the statistics and the histogram of the
+        recent frame times as text, e.g. to print them when the game
+        exits, so the slow frames can be seen.
+
+        return: str
+        """
+        stats = self.stats()
+        if stats["samples"] == 0:
+            return f"frames: {stats['frames']}, no frame times"
+        lines = [f"frames: {stats['frames']}, last {stats['samples']}: "
+                 f"mean {stats['mean_ms']:.1f} ms, p50 "
+                 f"{stats['p50_ms']:.1f} ms, p95 {stats['p95_ms']:.1f} ms, "
+                 f"max {stats['max_ms']:.1f} ms, {stats['fps']:.0f} fps"]
+        lower = 0
+        for bound, count in self.histogram():
+            if bound is None:
+                lines.append(f"  >= {lower} ms: {count}")
+            else:
+                lines.append(f"  {lower}-{bound} ms: {count}")
+                lower = bound
+        return "\n".join(lines)
+
+    def histogram(self, bounds=HISTOGRAM_BOUNDS):
+        """
+        This method counts the recent frame times in buckets, e.g. to see 
+        the frames that were much slower than the others.
+
+        input:
+        - bounds: the upper bounds of the buckets in milliseconds, sorted
+
+        return: list of (upper bound or None for the last bucket, count)
+        """
+        counts = [0] * (len(bounds) + 1)
+        for frame_time in self.frame_times:
+            bucket = 0
+            while bucket < len(bounds) and frame_time >= bounds[bucket]:
+                bucket += 1
+            counts[bucket] += 1
+        return list(zip(list(bounds) + [None], counts))
+
+    @staticmethod
+    def _wait_events():
+        """
+        This method blocks until an event arrives or the idle timeout
+        passes, then returns all the pending events.
+
+        return: list of events
+        """
+        event = pygame.event.wait(FrameLoop.IDLE_TIMEOUT)
+        if event.type == pygame.NOEVENT:
+            return []
+        return [event] + pygame.event.get()
@@ -1,33 +1,52 @@
 from gamepage.page import Page
 from gamepage.end import End
 from display import Display
-from player import Player
-from board.gameboard import GameBoard
-from gamecard.cc_bat import BatCC
-from gamecard.cc_babydragon import BabyDragonCC
-from gamecard.cc_salamander import SalamanderCC
-from gamecard.cc_spider import SpiderCC
-from gamecard.cc_dragonpirate import DragonPirateCC
-from gamecard.cc_dragonspirit import DragonSpiritCC
+from engine.game_engine import GameEngine
+from engine.game_random import GameRandom
+from engine.mcts_policy import MctsPolicy
+from engine.memory_policy import MemoryPolicy
+from engine.win_solver import WinSolver
+from engine.tablebase import Tablebase
+from board.gameboard_view import GameBoardView
 from save_manager import SaveManager
+from save_journal import SaveJournal
+from save_worker import SaveWorker
+from dirty_renderer import DirtyRenderer
+from hit_grid import HitGrid
+from gamepage.overlay_scheduler import OverlayScheduler
 
 import pygame
+import os
 import random
+import threading
 import time
-import json
 
 
 class Game(Page):
     """
     This class is used to create a game object.
-    The game object is the main object that controls the game.
-    It is responsible for creating the gameboard, dragons and chit cards.
-    It controls the overall game logic.
+    The game object is the page that lets the players play the game.
+    The game rules are handled by the game engine, and the game page
+    displays the game engine and passes the chit cards chosen by the
+    players to it.
+    The last seats can be computer players, which search their flips in 
+    a background thread so the window keeps responding.
+    Pressing O shows the chance of each seat to win, solved in a 
+    background thread too.
+    The game is autosaved after every flip to the journal of its save 
+    file (a new game takes an empty save slot, if there is one). The 
+    saves are written by a background thread too.
     """
+    DIRTY_RENDERING = True  # Set to False to always redraw the whole window
+    MESSAGE_TIME = 1        # Number of seconds a message is shown
+    BOT_DELAY = 0.6         # Minimum number of seconds of a computer flip
+    ODDS_TIME = 4           # Number of seconds the odds are shown
+    ODDS_BUDGET_MS = 2000   # Time budget of the solve of the odds
 
     def __init__(self, page_controller, window, seed, player_num, 
                  dragon_num=1, size=24, animal_num=4, cave_pos_ls=None, 
-                 current_player=0, card_reveal=0):
+                 current_player=0, card_reveal=0, 
+                 rng_mode=GameRandom.STREAMS, bot_num=0, state=None):
         """
         This method initializes the game object.
 
@@ -42,249 +61,475 @@ class Game(Page):
         - cave_pos_ls: the list of cave positions (if determine by player)
         - current_player: the current player index
         - card_reveal: the number of chit cards revealed
+        - rng_mode: the mode of the random sub-streams of the game
+        - bot_num: the number of computer players (the last seats)
+        - state: the saved game state to resume, None for a new game
 
         return: None
         """
         super().__init__(page_controller, window)
-        self.seed = seed  # Seed for randomization
-        self.player_num = player_num
-        self.dragon_num = dragon_num
-        self.size = size
-        self.animal_num = animal_num
-        self.players = self._create_players()
-        self.chit_cards = self._create_cc()
+        self.engine = GameEngine(seed, player_num, dragon_num, size, 
+                                 animal_num, cave_pos_ls, current_player, 
+                                 card_reveal, rng_mode, state)
+        self.chit_cards = self.engine.get_chit_cards()
         self._set_cc_pos()
-        self.gameboard = self._create_gameboard(cave_pos_ls)
-        self.current_player = current_player    # Track the current player
-        self.card_reveal = card_reveal          # Track the number of chit cards revealed
+        self.gameboard_view = GameBoardView(window, self.engine.get_gameboard())
         # If not none, this game is loaded from a file, and if this game ends successfully, the file will be cleared
         self.load_file_path = None
+        self.overlays = OverlayScheduler(window)
+        self.renderer = self._create_renderer()
+        self.hit_grid = self._create_hit_grid()
+        self.bot_num = bot_num
+        self.tablebase = None   # Tablebase of the computer players, if any
+        self.bots = self._create_bots(seed)    # Seat -> MctsPolicy
+        self.bot_thread = None  # Search of the computer player to move
+        self.bot_choice = None  # Chit card index chosen by the search
+        self.bot_start = 0      # Time the search started
+        self.seen_cards = set()     # Indexes of the chit cards flipped
+        self.odds_thread = None     # Solve of the chance to win
+        self.odds = None        # Chance of each seat, None if not solved
+        self.odds_exact = False     # The odds are exact, not lower bounds
+        self.journal = None     # Autosave of the save file, None if none
+        self.saver = SaveWorker()   # Writes the journal in the background
 
     def run(self):
         """ 
         The game engine.
         Handle the game logic.
-        If the game ends, the game will change to the end page.
+        If the game ends, the game will change to the end page, right 
+        away for a saved game already won (e.g. by the flips of its 
+        journal).
 
         return: None
         """
-        end = False
+        end = self.engine.get_winner() is not None
+        self._start_autosave()
         self.update_gameboard()
         while not end:
-            for event in pygame.event.get():
+            # Remove the expired messages
+            if self.overlays.update():
+                self.update_gameboard()
+            self._odds_step()
+            self._save_step()
+
+            clicked_cards = []  # Chit cards clicked in this frame, in order
+            bot = self.bots.get(self.engine.get_current_player().get_id())
+            if bot is not None:
+                chit_card = self._bot_step(bot)
+                if chit_card is not None:
+                    clicked_cards.append(chit_card)
+
+            for event in self.next_events(self.overlays.is_active()
+                                          or bot is not None
+                                          or self.odds_thread is not None):
                 if event.type == pygame.QUIT:
-                    Display.quit()
+                    self._quit()
                 elif event.type == pygame.KEYDOWN:
                     if event.key == pygame.K_s and pygame.key.get_mods() & pygame.KMOD_CTRL:
                         # If the game is loaded from a file, save the game to the same file
                         if self.load_file_path is None:
-                            file_path = SaveManager.get_save_file_path()
-                        else:
-                            file_path = self.load_file_path
-                        self.save(file_path)
-                        Display.draw_text(self.window, "Game saved", 25, (0, 0, 0), 
-                                          self.window.get_width()//2, self.window.get_height()//2)
-                        time.sleep(1)
-                        self.update_gameboard()
-
-            end_turn = False
-
-            # Check if all chit cards are revealed
-            if self.card_reveal > len(self.chit_cards) - 1:
-                self._next_player()
-
-            cc = None   # Store the chosen chit card
-            for chit_card in self.chit_cards:
-                # If a chit card is clicked
-                if chit_card.is_clicked():
-                    self.update_gameboard()
-                    cc = chit_card
-                    self.card_reveal += 1
+                            self.load_file_path = \
+                                SaveManager.get_save_file_path()
+                        self.save(self.load_file_path, "save")
+                    elif event.key == pygame.K_o:
+                        self._start_odds()
+                elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1 \
+                        and bot is None:
+                    chit_card = self.hit_grid.hit(event.pos)
+                    if chit_card is not None:
+                        clicked_cards.append(chit_card)
+
+            for cc in clicked_cards:
+                # A revealed chit card cannot be clicked until the next 
+                # player's turn
+                if cc.is_revealed():
+                    continue
+
+                # Stop showing the chit cards of the previous turn
+                self.overlays.clear("previous turn")
+                choose_move = None
+                if bot is not None:
+                    choose_move = bot.choose_move
+                move = self.engine.choose_outcome(cc, choose_move)
+                self.engine.apply(move)
+                end_turn, end = move.is_end_turn(), move.is_end_game()
+                if self.journal is not None:
+                    self.journal.append_flip(self.engine, move)
+                self._observe(self.chit_cards.index(cc))
+                self.update_gameboard()
+
+                if end:
                     break
+                # if the player's turn ends, change to the next player and 
+                # reset the chit cards
+                if end_turn:
+                    self._next_player()
+                    # The clicks left are not for a computer player
+                    if self.engine.get_current_player().get_id() in self.bots:
+                        break
+
+        # Show the game over message before changing to the end page
+        self._show_message("GAME OVER", 70, "game over")
+        while self.overlays.is_active():
+            for event in self.next_events(True):
+                if event.type == pygame.QUIT:
+                    self._quit()
+            self.overlays.update()
+            self.update_gameboard()
 
-            player = self.players[self.current_player]
-
-            if cc is None:
-                continue
-
-            else:
-                dragons = player.get_dragons()
-                valid_dragons = cc.valid_dragon(
-                    dragons, self.gameboard.get_volcanoe_zones(), self.gameboard.get_caves())
-                if len(valid_dragons) < 1:
-                    end_turn = True
-                else:
-                    dragon = player.choose_dragon(valid_dragons)
-                    action = cc.get_action(
-                        dragon, self.gameboard.get_volcanoe_zones(), self.gameboard.get_caves())
-                    end_turn, end = action.execute()
-                    self.update_gameboard()
-
-            # if the player's turn ends, change to the next player and reset
-            # the chit cards
-            if end_turn:
-                self._next_player()
+        for policy in self.bots.values():
+            policy.close()
+        if self.tablebase is not None:
+            self.tablebase.close()
+        # The saves left are written before the save file is cleared
+        self.saver.close()
 
         # Change to end page to show the winner
-        Display.draw_text(self.window, "GAME OVER", 70, (0, 0, 0),
-                          self.window.get_width()//2,
-                          self.window.get_height()//2)
-        time.sleep(1)
         # Clear memory if the loaded game ends successfully
         if self.load_file_path is not None:
-            with open(self.load_file_path, "w") as file:
-                file.truncate()
+            SaveManager.clear(self.load_file_path)
+        if self.journal is not None:
+            self.journal.delete()
+        winner = self.engine.get_winner()
         self.change_page(
-            End(self.page_controller, self.window, player.get_id(), dragon.get_img_path()))
+            End(self.page_controller, self.window, 
+                self.engine.get_current_player().get_id(), winner.get_img_path()))
+
+    def _bot_step(self, bot):
+        """
+        This method runs the turn of a computer player without blocking 
+        the window: the search of a flip is started in a background thread 
+        on a copy of the game state, and its chit card is returned once 
+        the search is done and the flip has been shown for a moment.
+
+        input:
+        - bot: the policy of the computer player to move
+
+        return: ChitCard to flip, or None if the computer is still thinking
+        """
+        if self.bot_thread is None:
+            self.bot_choice = None
+            self.bot_start = time.perf_counter()
+            self.bot_thread = threading.Thread(
+                target=self._bot_search, args=(bot, self.engine.save()), 
+                daemon=True)
+            self.bot_thread.start()
+            return None
+        if self.bot_thread.is_alive() or \
+                time.perf_counter() - self.bot_start < Game.BOT_DELAY:
+            return None
+        self.bot_thread = None
+        return self.chit_cards[self.bot_choice]
+
+    def _bot_search(self, bot, state):
+        """
+        This method searches the flip of a computer player. It runs in the 
+        background thread. If the search fails (e.g. a broken tablebase 
+        file or process pool), the flip of the memory policy is chosen 
+        instead, so the game goes on.
+
+        input:
+        - bot: the policy of the computer player
+        - state: the game state to search
+
+        return: None
+        """
+        try:
+            self.bot_choice = bot.choose_from_state(state)
+        except Exception:
+            policy = MemoryPolicy(random.Random())
+            policy.set_belief(bot.get_belief())
+            self.bot_choice = policy.choose(GameEngine.from_state(state))
+
+    def _observe(self, index):
+        """
+        This method remembers that a chit card was flipped, for the odds 
+        and the computer players.
+
+        input:
+        - index: the index of the flipped chit card
+
+        return: None
+        """
+        self.seen_cards.add(index)
+        for policy in self.bots.values():
+            policy.observe(index, self.chit_cards[index])
+
+    def _start_odds(self):
+        """
+        This method starts solving the chance of each seat to win in a 
+        background thread, on a copy of the game state. The odds are 
+        shown once solved.
+
+        return: None
+        """
+        if self.odds_thread is not None:
+            return
+        self.odds = None
+        self.odds_thread = threading.Thread(
+            target=self._solve_odds, 
+            args=(self.engine.save(), set(self.seen_cards)), daemon=True)
+        self.odds_thread.start()
+        self._show_message("Computing the odds...", 25, "odds")
+
+    def _solve_odds(self, state, known):
+        """
+        This method solves the chance of each seat to win. It runs in the 
+        background thread, within the time budget of the odds, as the 
+        solve holds the interpreter lock and slows the window down.
+
+        input:
+        - state: the game state to solve
+        - known: the indexes of the chit cards flipped in the game
+
+        return: None
+        """
+        solver = WinSolver(budget_ms=Game.ODDS_BUDGET_MS)
+        odds = solver.solve(GameEngine.from_state(state), known)
+        self.odds_exact = solver.is_exact()
+        self.odds = odds
+
+    def _odds_step(self):
+        """
+        This method shows the odds once the background thread has solved 
+        them.
+
+        return: None
+        """
+        if self.odds_thread is None or self.odds_thread.is_alive():
+            return
+        self.odds_thread = None
+        if self.odds is None:
+            text = "The solver gave up, flip more chit cards for the odds"
+        else:
+            bound = "" if self.odds_exact else "at least "
+            text = "   ".join(f"Player {seat + 1}: {bound}{chance:.0%}" 
+                              for seat, chance in enumerate(self.odds))
+        self._show_message(text, 25, "odds", Game.ODDS_TIME)
 
     def _next_player(self):
         """
         This method is used to change the turn to the next player.
         The current player index will be increment by 1.
         All the chit cards will be reset.
+        The revealed chit cards are still shown for a moment together with 
+        the next player's turn message, without blocking the game.
 
         return: None
         """
-        self.current_player = (self.current_player + 1) % self.player_num
-        self.card_reveal = 0
         for chit_card in self.chit_cards:
-            chit_card.reset()
-
-        time.sleep(1)
+            if chit_card.is_revealed():
+                self.overlays.show_image(chit_card.image, chit_card.get_pos(),
+                                         Game.MESSAGE_TIME, "previous turn")
+        self.engine.next_player()
+        # The flip ending the turn is replayed with the turn change
+        if self.journal is not None and self.journal.needs_checkpoint():
+            self.journal.checkpoint(self._game_state())
+
+        player_id = self.engine.get_current_player().get_id()
+        self._show_message(f"Player {player_id + 1}'s turn", 25, "turn")
         self.update_gameboard()
 
-        Display.draw_text(self.window, f"Player {self.current_player + 1}'s turn",
-                          25, (0, 0, 0), self.window.get_width()//2,
-                          self.window.get_height()//2)
-        time.sleep(1)
-        self.update_gameboard()
-
-    def update_gameboard(self):
+    def _quit(self):
         """
-        This method updates the display of the game if there is any player 
-        movement or flipping of chit cards, etc.
+        This method quits the game once the saves left are written, as 
+        the save worker is stopped with the game.
 
         return: None
         """
-        self.gameboard.draw()
-        self._draw_game_element()
-        pygame.display.update()
+        self.saver.close()
+        if self.journal is not None:
+            self.journal.close()
+        Display.quit()
 
-    def save(self, file_path):
+    def _show_message(self, text, size, tag, duration=MESSAGE_TIME):
         """
-        This method is used to save the game state.
-        The game state is saved in a json file.
+        This method shows a message in the middle of the window for a 
+        moment. A previous message with the same tag is replaced.
+
+        input:
+        - text: the message to show
+        - size: the size of the text
+        - tag: the tag of the message
+        - duration: the number of seconds the message is shown
 
         return: None
         """
-        game_state = {
-            "seed": self.seed,
-            "player_num": self.player_num,
-            "dragon_num": self.dragon_num,
-            "size": self.size,
-            "animal_num": self.animal_num,
-            "current_player": self.current_player,
-            "card_reveal": self.card_reveal,
-            "players": [player.save() for player in self.players],
-            "chit_cards": [chit_card.save() for chit_card in self.chit_cards],
-            "gameboard": self.gameboard.save()
-        }
-        with open(file_path, "w") as file:
-            json.dump(game_state, file)
+        self.overlays.clear(tag)
+        self.overlays.show_text(text, size, (0, 0, 0), 
+                                (self.window.get_width()//2, 
+                                 self.window.get_height()//2),
+                                duration, tag)
 
-    def load(self, file_path):
+    def update_gameboard(self, full=False):
         """
-        This method is used to load the game state from a json file.
-        
+        This method updates the display of the game if there is any player 
+        movement or flipping of chit cards, etc.
+        Only the changed elements are redrawn unless a full redraw is 
+        requested (e.g. to clear a text message drawn on the board).
+
         input:
-        - file_path: the file path of the json file to load
-        
+        - full: True to redraw the whole window
+
         return: None
         """
-        self.load_file_path = file_path
-        with open(file_path, "r") as file:
-            game_state = json.load(file)
-
-        for i in range(len(self.chit_cards)):
-            self.chit_cards[i].load(game_state["chit_cards"][i])
+        self.renderer.render(full)
 
-        self.gameboard.load(game_state["gameboard"])
-
-        for i in range(self.player_num):
-            self.players[i].load(game_state["players"][i])
+    def save(self, file_path, tag=None):
+        """
+        This method is used to save the game state.
+        The game state is saved in the compact save format, and the game 
+        is autosaved to the same file from then on. The save is written 
+        in the background, and its completion event has the tag.
 
-        # Move dragon to the correct position
-        for i in range(self.player_num):
-            for j in range(self.dragon_num):
-                self.players[i].get_dragons()[j].move(game_state["players"][i]["dragons"][j]["board_pos"], 
-                                                      self.gameboard.get_volcanoe_zones(), 
-                                                      self.gameboard.get_caves())
+        input:
+        - file_path: the path of the save file
+        - tag: the tag of the completion event, None for no event
 
-    def _draw_game_element(self):
+        return: None
         """
-        This method draws the chit card and dragons on the window.
+        if self.journal is None or self.journal.get_file_path() != file_path:
+            if self.journal is not None:
+                self.saver.wait()
+                self.journal.close()
+            self.journal = SaveJournal(file_path, worker=self.saver)
+        self.journal.checkpoint(self._game_state(), tag)
+
+    def _save_step(self):
+        """
+        This method shows the saves written by the save worker.
 
         return: None
         """
-        self._draw_chit_cards()
-        self._draw_dragons()
+        for tag, _, error in self.saver.poll():
+            if error is not None:
+                self._show_message("Save failed", 25, "save")
+            elif tag == "save":
+                self._show_message("Game saved", 25, "save")
 
-    def _draw_dragons(self):
+    def _game_state(self):
         """
-        This method draws the dragons on the window.
+        This method returns the game state to save.
 
-        return: None
+        return: dict
         """
-        for player in self.players:
-            player.draw(self.window)
+        game_state = self.engine.save()
+        game_state["bot_num"] = self.bot_num
+        return game_state
 
-    def _draw_chit_cards(self):
+    def _start_autosave(self):
         """
-        This method draws the chit cards on the window.
+        This method starts autosaving the game: a loaded game to its save 
+        file, and a new game to an empty save slot. A new game is not 
+        autosaved if every slot has a save, until it is saved.
 
         return: None
         """
-        for chit_card in self.chit_cards:
-            chit_card.draw(self.window)
-
-    def _create_players(self):
+        if self.journal is not None:
+            return
+        if self.load_file_path is None:
+            self.load_file_path = SaveManager.get_empty_save_file_path()
+            if self.load_file_path is None:
+                return
+        self.save(self.load_file_path)
+
+    @staticmethod
+    def from_state(page_controller, window, state, file_path=None):
         """
-        This method creates the dragons.
+        This method creates the game page of a saved game state, e.g. one 
+        parsed from a save file. The game is created once with the 
+        chit cards and dragons as saved, instead of creating a new game 
+        and loading the save file into it.
 
-        return: list
+        input:
+        - page_controller: the page controller object
+        - window: the window object
+        - state: the game state (a dict, from save)
+        - file_path: the save file of the game state, which is saved to 
+                     and cleared when the game ends, or None. The flips 
+                     in its journal are played again and seen by the 
+                     players, and the game ends when it runs if they won 
+                     it.
+
+        return: Game
         """
-        players = []
-        for i in range(self.player_num):
-            players.append(Player(i, self.dragon_num))
+        # Games saved without a random mode use the legacy layouts
+        game = Game(page_controller, window, state["seed"], 
+                    state["player_num"], state["dragon_num"], state["size"], 
+                    state["animal_num"], state["gameboard"]["caves"], 
+                    state["current_player"], state["card_reveal"], 
+                    state.get("rng_mode", GameRandom.LEGACY), 
+                    state.get("bot_num", 0), state)
+        game.load_file_path = file_path
+        # The chit cards revealed in the save were seen by the players
+        for i in range(len(game.chit_cards)):
+            if game.chit_cards[i].is_revealed():
+                game._observe(i)
+        if file_path is not None:
+            # Play the flips autosaved after the save, and remember them 
+            # as if they were flipped in this game
+            game.journal = SaveJournal(file_path, worker=game.saver)
+            for i in game.journal.replay(game.engine):
+                game._observe(i)
+        return game
 
-        return players
+    def load(self, file_path):
+        """
+        This method is used to load the game state from a save file.
+        
+        input:
+        - file_path: the file path of the save file to load
+        
+        return: None
+        """
+        self.load_file_path = file_path
+        self.engine.load(SaveManager.load(file_path))
 
-    def _create_cc(self):
+    def _create_bots(self, seed):
         """
-        This method creates the chit cards list
+        This method creates the policies of the computer players, which 
+        take the last seats. They share the tablebase file, if it exists 
+        and can be read, which is closed when the game ends.
+
+        input:
+        - seed: the seed of the game
 
-        return: list
+        return: dict
         """
-        # Create chit cards
-        chit_cards = []
-        for i in range(1, 4):
-            chit_cards.append(BatCC(i))
-            chit_cards.append(BabyDragonCC(i))
-            chit_cards.append(SalamanderCC(i))
-            chit_cards.append(SpiderCC(i))
+        player_num = len(self.engine.get_players())
+        if self.bot_num > 0 and os.path.exists(Tablebase.DEFAULT_PATH):
+            try:
+                self.tablebase = Tablebase(Tablebase.DEFAULT_PATH)
+            except (OSError, ValueError):
+                self.tablebase = None   # The bots search every state
+        bots = {}
+        for seat in range(player_num - self.bot_num, player_num):
+            bots[seat] = MctsPolicy(random.Random(seed * player_num + seat),
+                                    tablebase=self.tablebase)
+        return bots
+
+    def _create_renderer(self):
+        """
+        This method creates the renderer of the game elements.
+        The chit cards and dragons are drawn on top of the gameboard.
 
-            # For penalty card
-            if i < 3:
-                chit_cards.append(DragonPirateCC(i))
+        return: DirtyRenderer
+        """
+        drawables = list(self.chit_cards)
+        drawables.extend(self.engine.get_dragons())
+        return DirtyRenderer(self.window, self.gameboard_view, drawables,
+                             self.overlays, Game.DIRTY_RENDERING)
 
-        # Create the dragon spirit chit card
-        for _ in range(2):
-            chit_cards.append(DragonSpiritCC())
+    def _create_hit_grid(self):
+        """
+        This method indexes the chit cards for routing the clicks.
 
-        # Randomize the chit cards
-        random.seed(self.seed)
-        random.shuffle(chit_cards)
-        return chit_cards
+        return: HitGrid
+        """
+        hit_grid = HitGrid()
+        for chit_card in self.chit_cards:
+            hit_grid.add(chit_card)
+        return hit_grid
 
     def _set_cc_pos(self):
         """
@@ -306,19 +551,4 @@ class Game(Page):
         pos_tuple = [(x, y) for x in x_pos for y in y_pos]
 
         for i in range(len(self.chit_cards)):
-            self.chit_cards[i].set_pos(pos_tuple[i][0], pos_tuple[i][1])
-
-    def _create_gameboard(self, cave_pos_ls):
-        """
-        This method creates the gameboard.
-
-        input:
-        - cave_pos_ls: the list of cave positions (if determine by player)
-
-        return: GameBoard
-        """
-        dragons = []
-        for player in self.players:
-            dragons.extend(player.get_dragons())
-        return GameBoard(self.window, self.seed, dragons, 
-                         self.size, self.animal_num, cave_pos_ls)
\ No newline at end of file
+            self.chit_cards[i].set_pos(pos_tuple[i][0], pos_tuple[i][1])
\ No newline at end of file
@@ -1,5 +1,6 @@
 from gamepage.page import Page
 from button import Button
+from hit_grid import HitGrid
 from gamepage.setup import Setup
 from display import Display
 from save_manager import SaveManager
@@ -61,30 +62,42 @@ class Home(Page):
         quit_button.set_pos(self.window.get_width()//2,
                             self.window.get_height()*2.55//3)
 
+        # Index the buttons for routing the clicks
+        hit_grid = HitGrid()
+        for button in (start_button, resume_button, quit_button):
+            hit_grid.add(button)
+
+        # The save files do not change while the home page is shown, so 
+        # they are checked once
+        SaveManager.refresh()
+        has_save_file = SaveManager.has_save_file()
+
         page = None
         run = True
         while run:
             self.window.blit(home_bg, (0, 0))
             start_button.draw(self.window)
-            if SaveManager.has_save_file():
+            if has_save_file:
                 resume_button.draw(self.window)
             quit_button.draw(self.window)
 
-            if start_button.is_clicked():
-                run = False
-                page = Setup(self.page_controller, self.window, False)
-
-            if resume_button.is_clicked():
-                run = False
-                page = Setup(self.page_controller, self.window, True)
-
-            if quit_button.is_clicked():
-                Display.quit()
+            pygame.display.update()
 
-            for event in pygame.event.get():
+            for event in self.next_events():
                 if event.type == pygame.QUIT:
                     Display.quit()
-
-            pygame.display.update()
+                elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+                    button = hit_grid.hit(event.pos)
+                    if button is start_button:
+                        run = False
+                        page = Setup(self.page_controller, self.window, False)
+                    # The resume button is only shown if there is a save file
+                    elif button is resume_button and has_save_file:
+                        run = False
+                        page = Setup(self.page_controller, self.window, True)
+                    elif button is quit_button:
+                        Display.quit()
+                if not run:
+                    break
 
         self.change_page(page)
\ No newline at end of file
@@ -0,0 +1,131 @@
+from display import Display
+
+import time
+
+
+class OverlayScheduler:
+    """
+    This class is used to show timed overlays on top of a page, such as
+    "Player 2's turn" or "Game saved".
+    Instead of blocking the page loop while a message is shown, each
+    overlay has an expiry timestamp. The page loop keeps running, draws
+    the active overlays every frame and removes them once they expire.
+    """
+
+    def __init__(self, window):
+        """
+        This method initializes the overlay scheduler.
+
+        input:
+        - window: the window to draw the overlays on
+
+        return: None
+        """
+        self.window = window
+        self.overlays = []      # List of [image, rect, expire time, tag]
+        self.dirty_rects = []   # Areas changed since the last render
+
+    def show_text(self, text, size, color, pos, duration, tag=None):
+        """
+        This method shows a text overlay for the duration.
+
+        input:
+        - text: the text to show
+        - size: the size of the text
+        - color: the color of the text
+        - pos: the center display coordinate of the text (in tuple)
+        - duration: the number of seconds to show the text
+        - tag: the tag used to clear the overlay before it expires
+
+        return: None
+        """
+        image = Display.render_text(text, size, color)
+        self.show_image(image, pos, duration, tag)
+
+    def show_image(self, image, pos, duration, tag=None):
+        """
+        This method shows an image overlay for the duration.
+
+        input:
+        - image: the image to show
+        - pos: the center display coordinate of the image (in tuple)
+        - duration: the number of seconds to show the image
+        - tag: the tag used to clear the overlay before it expires
+
+        return: None
+        """
+        rect = image.get_rect()
+        rect.center = pos
+        self.overlays.append([image, rect, time.monotonic() + duration, tag])
+        self.dirty_rects.append(rect)
+
+    def clear(self, tag=None):
+        """
+        This method removes the overlays with the tag before they expire.
+
+        input:
+        - tag: the tag of the overlays to remove, None to remove all
+
+        return: None
+        """
+        self._remove(lambda overlay: tag is None or overlay[3] == tag)
+
+    def update(self):
+        """
+        This method removes the expired overlays.
+
+        return: bool (True if any overlay was removed)
+        """
+        now = time.monotonic()
+        return self._remove(lambda overlay: overlay[2] <= now)
+
+    def is_active(self):
+        """
+        This method checks if any overlay is shown.
+
+        return: bool
+        """
+        return len(self.overlays) > 0
+
+    def draw(self, rect=None):
+        """
+        This method draws the active overlays on the window.
+
+        input:
+        - rect: the area of the window to draw, None for the whole window
+
+        return: None
+        """
+        for image, overlay_rect, _, _ in self.overlays:
+            if rect is None or rect.colliderect(overlay_rect):
+                self.window.blit(image, overlay_rect)
+
+    def get_dirty_rects(self):
+        """
+        This method returns the areas of the overlays shown or removed
+        since the last call.
+
+        return: list of pygame.Rect
+        """
+        rects = self.dirty_rects
+        self.dirty_rects = []
+        return rects
+
+    def _remove(self, condition):
+        """
+        This method removes the overlays that satisfy the condition.
+
+        input:
+        - condition: the function that returns True for overlays to remove
+
+        return: bool (True if any overlay was removed)
+        """
+        kept = []
+        for overlay in self.overlays:
+            if condition(overlay):
+                self.dirty_rects.append(overlay[1])
+            else:
+                kept.append(overlay)
+        removed = len(kept) != len(self.overlays)
+        self.overlays = kept
+        return removed
@@ -32,6 +32,18 @@ class Page(ABC):
         """
         self.page_controller.change_page(page)
 
+    def next_events(self, animating=False):
+        """
+        End the current frame of the page loop and return the events of 
+        the next frame. The frame rate is paced by the shared frame loop.
+
+        input:
+        - animating: whether something on the page is animating
+
+        return: list of events
+        """
+        return self.page_controller.get_frame_loop().next_frame(animating)
+
     @abstractmethod
     def run(self):
         """ 
@@ -4,16 +4,26 @@ class PageController:
     It is used to change the state in the main class.
     """
 
-    def __init__(self, main):
+    def __init__(self, main, frame_loop):
         """
         This method initializes the page controller.
 
         input:
         - main: the main class of the game
+        - frame_loop: the frame loop shared by the pages
 
         return: None
         """
         self.main = main
+        self.frame_loop = frame_loop
+
+    def get_frame_loop(self):
+        """
+        The getter method to return the frame loop shared by the pages.
+
+        return: FrameLoop
+        """
+        return self.frame_loop
 
     def change_page(self, page):
         """
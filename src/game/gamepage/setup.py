@@ -2,11 +2,12 @@ from gamepage.page import Page
 from display import Display
 from gamepage.game import Game
 from save_manager import SaveManager
+from gamepage.overlay_scheduler import OverlayScheduler
+from engine.tablebase import Tablebase
 
+import os
 import pygame
-import time
 import random
-import json
 
 
 class Setup(Page):
@@ -16,6 +17,8 @@ class Setup(Page):
     or prompt the user to choose the previous game
     saved.
     """
+    MESSAGE_TIME = 1    # Number of seconds a message is shown
+    MAX_SEED = 1000     # Largest seed of a new game
 
     def __init__(self, page_controller, window, resume=False):
         """
@@ -30,6 +33,7 @@ class Setup(Page):
         """
         super().__init__(page_controller, window)
         self.resume = resume
+        self.overlays = OverlayScheduler(window)
 
     def run(self):
         """
@@ -41,9 +45,10 @@ class Setup(Page):
         # For new game (prompt the user to input the number of players)
         if not self.resume:
             player_num = self._get_player_num()
-            seed = random.randint(0, 1000)  # Seed for randomization
+            bot_num = self._get_bot_num(player_num)
+            seed = self._get_seed(player_num, bot_num)
             page = Game(self.page_controller, self.window, seed,
-                        player_num)
+                        player_num, bot_num=bot_num)
         # For resuming game (prompt the user to choose the previous game saved)
         else:
             files = SaveManager.show_save_files()
@@ -51,15 +56,35 @@ class Setup(Page):
             file_path = files[file_num-1][0]
 
             # file_path = "src/memory/testsave.json"
-            with open(file_path, "r") as file:
-                game_state = json.load(file)
-
-            game = Game(self.page_controller, self.window, game_state["seed"], game_state["player_num"], game_state[
-                        "dragon_num"], game_state["size"], game_state["animal_num"], game_state["gameboard"]["caves"], game_state["current_player"], game_state["card_reveal"])
-            game.load(file_path)
-            page = game
+            game_state = SaveManager.load(file_path)
+            page = Game.from_state(self.page_controller, self.window,
+                                   game_state, file_path)
         self.change_page(page)
 
+    def _get_seed(self, player_num, bot_num):
+        """
+        Get the seed of a new game. A game with computer players is one
+        of the games of the tablebase, as the table only has the states
+        of these gameboards.
+
+        input:
+        - player_num: the number of players
+        - bot_num: the number of computer players
+
+        return: int
+        """
+        seeds = []
+        if bot_num > 0 and os.path.exists(Tablebase.DEFAULT_PATH):
+            try:
+                tablebase = Tablebase(Tablebase.DEFAULT_PATH)
+                seeds = tablebase.get_seeds(player_num)
+                tablebase.close()
+            except (OSError, ValueError):
+                seeds = []  # Any gameboard
+        if seeds:
+            return random.choice(seeds)
+        return random.randint(0, Setup.MAX_SEED)
+
     def _get_file_num(self, files):
         """
         Get the saved file index from the user.
@@ -92,9 +117,13 @@ class Setup(Page):
 
             Display.draw_text(self.window, input, 32, (255, 255, 255),
                               self.window.get_width()//2,
-                              self.window.get_height()*1.5//3, True)
+                              self.window.get_height()*1.5//3, False)
+
+            self.overlays.update()
+            self.overlays.draw()
+            pygame.display.update()
 
-            for event in pygame.event.get():
+            for event in self.next_events(self.overlays.is_active()):
                 if event.type == pygame.QUIT:
                     Display.quit()
                 elif event.type == pygame.KEYDOWN:
@@ -109,12 +138,7 @@ class Setup(Page):
                         # prompt user to input again
                         else:
                             input = ""
-                            self.window.blit(setup_bg, (0, 0))
-                            Display.draw_text(self.window, "Invalid input!",
-                                              50, (255, 255, 255),
-                                              self.window.get_width()//2,
-                                              self.window.get_height()*1.6//4)
-                            time.sleep(1)
+                            self._show_invalid_input()
                     # Check if the user pressed backspace
                     elif event.key == pygame.K_BACKSPACE:
                         input = input[:-1]
@@ -127,6 +151,37 @@ class Setup(Page):
         If the input is invalid, display an error message and ask for 
         input again.
 
+        return: int
+        """
+        return self._get_num("Enter the number of players. (2-4)", 
+                             ['2', '3', '4'])
+
+    def _get_bot_num(self, player_num):
+        """
+        Get the number of computer players from the user. At least one 
+        player is not a computer player.
+        If the input is invalid, display an error message and ask for 
+        input again.
+
+        input:
+        - player_num: the number of players
+
+        return: int
+        """
+        return self._get_num(
+            f"Enter the number of computer players. (0-{player_num - 1})",
+            [str(i) for i in range(player_num)])
+
+    def _get_num(self, text, valid):
+        """
+        Get a number from the user.
+        If the input is invalid, display an error message and ask for 
+        input again.
+
+        input:
+        - text: the prompt to show
+        - valid: the list of valid inputs
+
         return: int
         """
         # Load image
@@ -138,15 +193,19 @@ class Setup(Page):
         while run:
             self.window.blit(setup_bg, (0, 0))
             Display.draw_text(self.window,
-                              "Enter the number of players. (2-4)", 24,
+                              text, 24,
                               (255, 255, 255), self.window.get_width()//2,
                               self.window.get_height()//3, False)
 
             Display.draw_text(self.window, input, 32, (255, 255, 255),
                               self.window.get_width()//2,
-                              self.window.get_height()*1.5//3, True)
+                              self.window.get_height()*1.5//3, False)
+
+            self.overlays.update()
+            self.overlays.draw()
+            pygame.display.update()
 
-            for event in pygame.event.get():
+            for event in self.next_events(self.overlays.is_active()):
                 if event.type == pygame.QUIT:
                     Display.quit()
                 elif event.type == pygame.KEYDOWN:
@@ -154,21 +213,28 @@ class Setup(Page):
                     # has finished the input)
                     if event.key == pygame.K_RETURN:
                         # Check valid input
-                        valid = ['2', '3', '4']
                         if input in valid:
                             return int(input)
                         # If input is invalid, display error message and
                         # prompt user to input again
                         else:
                             input = ""
-                            self.window.blit(setup_bg, (0, 0))
-                            Display.draw_text(self.window, "Invalid input!",
-                                              50, (255, 255, 255),
-                                              self.window.get_width()//2,
-                                              self.window.get_height()*1.6//4)
-                            time.sleep(1)
+                            self._show_invalid_input()
                     # Check if the user pressed backspace
                     elif event.key == pygame.K_BACKSPACE:
                         input = input[:-1]
                     else:
-                        input += event.unicode
\ No newline at end of file
+                        input += event.unicode
+
+    def _show_invalid_input(self):
+        """
+        Show the invalid input message for a moment.
+        The user can keep typing while the message is shown.
+
+        return: None
+        """
+        self.overlays.clear()
+        self.overlays.show_text("Invalid input!", 50, (255, 255, 255),
+                                (self.window.get_width()//2,
+                                 self.window.get_height()*1.6//4),
+                                Setup.MESSAGE_TIME)
@@ -0,0 +1,89 @@
+class HitGrid:
+    """
+    This class is a spatial index of the clickable objects (buttons and
+    chit cards) of a page.
+    The window is divided into a uniform grid of cells, and each cell
+    keeps the objects whose hit area overlaps it. A click is tested only
+    against the few objects of the cell under the mouse, so finding the
+    clicked object does not depend on the number of objects.
+    """
+    CELL_SIZE = 64  # Width and height of a cell in pixels
+
+    def __init__(self, cell_size=CELL_SIZE):
+        """
+        This method initializes the hit grid.
+
+        input:
+        - cell_size: the width and height of a cell in pixels
+
+        return: None
+        """
+        self.cell_size = cell_size
+        self.cells = {}     # (column, row) -> list of objects
+        self.cell_keys = {}  # object -> list of (column, row) it is in
+
+    def add(self, widget):
+        """
+        This method adds the clickable object to the grid.
+        Objects added later are on top of the objects added earlier.
+        The object must be positioned before it is added, and updated
+        if it is moved afterwards.
+
+        input:
+        - widget: the object with a get_hit_rect method
+
+        return: None
+        """
+        rect = widget.get_hit_rect()
+        keys = []
+        for column in range(rect.left // self.cell_size,
+                            (rect.right - 1) // self.cell_size + 1):
+            for row in range(rect.top // self.cell_size,
+                             (rect.bottom - 1) // self.cell_size + 1):
+                self.cells.setdefault((column, row), []).append(widget)
+                keys.append((column, row))
+        self.cell_keys[widget] = keys
+
+    def remove(self, widget):
+        """
+        This method removes the clickable object from the grid.
+
+        input:
+        - widget: the object to remove
+
+        return: None
+        """
+        for key in self.cell_keys.pop(widget, []):
+            self.cells[key].remove(widget)
+            if not self.cells[key]:
+                del self.cells[key]
+
+    def update(self, widget):
+        """
+        This method updates the grid after the object is moved.
+
+        input:
+        - widget: the object that is moved
+
+        return: None
+        """
+        self.remove(widget)
+        self.add(widget)
+
+    def hit(self, pos):
+        """
+        This method returns the topmost object under the position.
+
+        input:
+        - pos: the display coordinate (in tuple), e.g. a mouse position
+
+        return: the object under the position, or None
+        """
+        cell = self.cells.get((pos[0] // self.cell_size,
+                               pos[1] // self.cell_size))
+        if cell is None:
+            return None
+        for widget in reversed(cell):
+            if widget.get_hit_rect().collidepoint(pos):
+                return widget
+        return None
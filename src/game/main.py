@@ -1,31 +1,49 @@
 from gamepage.page_controller import PageController
+from gamepage.frame_loop import FrameLoop
 from gamepage.home import Home
 
+import argparse
+import atexit
 import pygame
 
 
 class Main:
     """
     This class is the main class of the game.
-    The game can be started by running this class.
+    The game can be started by running this class, with --stats to print
+    the statistics and histogram of the frame times when the game exits.
     """
 
     # Display window
     WINDOW_WIDTH = 800
     WINDOW_HEIGHT = 600
     WINDOW_TITLE = "Fiery Dragons"
+    FPS = 60    # Frame rate cap of the pages
 
-    def __init__(self):
+    def __init__(self, args=None):
         """
-        This method initializes the main class.
+        This method initializes the main class from the command line
+        arguments.
+
+        input:
+        - args: the list of arguments, None for the command line
 
         return: None
         """
+        parser = argparse.ArgumentParser(description="Play Fiery Dragons.")
+        parser.add_argument("--stats", action="store_true",
+                            help="print the statistics and histogram of "
+                                 "the frame times when the game exits")
+        self.args = parser.parse_args(args)
         pygame.init()
         self.window = pygame.display.set_mode(
             (self.WINDOW_WIDTH, self.WINDOW_HEIGHT))
         pygame.display.set_caption(self.WINDOW_TITLE)
-        self.page_controller = PageController(self)
+        frame_loop = FrameLoop(self.FPS)
+        if self.args.stats:
+            # The pages exit the game from their loops (see Display.quit)
+            atexit.register(lambda: print(frame_loop.report()))
+        self.page_controller = PageController(self, frame_loop)
         self.state = Home(self.page_controller, self.window)
 
     def set_state(self, state):
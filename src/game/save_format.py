@@ -0,0 +1,237 @@
+from board.gameboard import GameBoard
+from engine.game_engine import GameEngine
+from engine.game_random import GameRandom
+from gamecard.animal_type import AnimalType
+
+import json
+import struct
+
+
+class SaveFormat:
+    """
+    This class is the compact binary format of the save files.
+    The gameboard layout and the chit card order are made again from the
+    seed, so a save only keeps what the seed cannot give: the settings of
+    the game, the caves, the position and remaining steps of each dragon
+    and the reveal flag of each chit card (one bit each). A save of four
+    players is 57 bytes, instead of about 1.3 KB of JSON.
+
+    The file starts with a magic and a version, so a newer layout can be
+    added as another version and the older ones still read. The JSON
+    save files of earlier versions of the game are converted with
+    migrate.
+    A save that is cut, too long or whose counts do not match the game
+    raises a ValueError when read, so a broken save file is never
+    loaded into a game (see check).
+    """
+    MAGIC = b"FDSV"
+    VERSION = 1
+    MODES = (GameRandom.LEGACY, GameRandom.STREAMS)    # Index -> rng mode
+    # Magic, version, seed, rng mode, number of players, dragons of each
+    # player, size, number of animals, current player, chit cards revealed,
+    # number of computer players, number of caves, number of chit cards
+    HEADER = struct.Struct("<4sHqBBBHBBBBBB")
+    REVEAL = struct.Struct("<Q")    # Reveal flags of the chit cards
+
+    @staticmethod
+    def encode(state):
+        """
+        This method packs a game state into a save.
+
+        input:
+        - state: the game state (from GameEngine.save, with bot_num)
+
+        return: bytes
+        """
+        caves = state["gameboard"]["caves"]
+        chit_cards = state["chit_cards"]
+        data = bytearray(SaveFormat.HEADER.pack(
+            SaveFormat.MAGIC, SaveFormat.VERSION, state["seed"],
+            SaveFormat.MODES.index(state.get("rng_mode", GameRandom.LEGACY)),
+            state["player_num"], state["dragon_num"], state["size"],
+            state["animal_num"], state["current_player"],
+            state["card_reveal"], state.get("bot_num", 0), len(caves),
+            len(chit_cards)))
+        data += struct.pack(f"<{len(caves)}h", *caves)
+        for player in state["players"]:
+            for dragon in player["dragons"]:
+                data += struct.pack("<hh", dragon["board_pos"],
+                                    dragon["remaining_steps"])
+        reveal = 0
+        for i in range(len(chit_cards)):
+            if chit_cards[i]["reveal"]:
+                reveal |= 1 << i
+        data += SaveFormat.REVEAL.pack(reveal)
+        return bytes(data)
+
+    @staticmethod
+    def decode(data):
+        """
+        This method unpacks a save into a game state, in the form of
+        GameEngine.save. The volcano zones are not in the state, as the
+        gameboard is made again from the seed.
+
+        input:
+        - data: the bytes of the save
+
+        return: dict
+        """
+        if not SaveFormat.is_compact(data):
+            raise ValueError("Not a save of the compact format")
+        if len(data) < SaveFormat.HEADER.size:
+            raise ValueError("The save is cut")
+        (_, version, seed, mode, player_num, dragon_num, size, animal_num,
+         current_player, card_reveal, bot_num, cave_num,
+         card_num) = SaveFormat.HEADER.unpack_from(data, 0)
+        if version != SaveFormat.VERSION:
+            raise ValueError(f"Unknown save version: {version}")
+        if mode >= len(SaveFormat.MODES):
+            raise ValueError(f"Unknown rng mode of the save: {mode}")
+        if card_num > 8 * SaveFormat.REVEAL.size:
+            raise ValueError(f"Too many chit cards in the save: {card_num}")
+        length = SaveFormat.HEADER.size + 2 * cave_num + \
+            4 * player_num * dragon_num + SaveFormat.REVEAL.size
+        if len(data) != length:
+            raise ValueError(f"The save is {len(data)} bytes instead of "
+                             f"{length}")
+
+        offset = SaveFormat.HEADER.size
+        caves = list(struct.unpack_from(f"<{cave_num}h", data, offset))
+        offset += 2 * cave_num
+        steps = struct.unpack_from(f"<{2 * player_num * dragon_num}h",
+                                   data, offset)
+        offset += 4 * player_num * dragon_num
+        reveal = SaveFormat.REVEAL.unpack_from(data, offset)[0]
+        if reveal >> card_num:
+            raise ValueError("The save reveals chit cards it does not have")
+
+        players = []
+        for i in range(player_num):
+            dragons = []
+            for j in range(dragon_num):
+                k = 2 * (i * dragon_num + j)
+                dragons.append({"board_pos": steps[k],
+                                "remaining_steps": steps[k + 1]})
+            players.append({"dragons": dragons})
+        state = {
+            "seed": seed,
+            "rng_mode": SaveFormat.MODES[mode],
+            "player_num": player_num,
+            "dragon_num": dragon_num,
+            "size": size,
+            "animal_num": animal_num,
+            "current_player": current_player,
+            "card_reveal": card_reveal,
+            "players": players,
+            "chit_cards": [{"reveal": bool(reveal >> i & 1)}
+                           for i in range(card_num)],
+            "gameboard": {"caves": caves},
+            "bot_num": bot_num
+        }
+        SaveFormat.check(state)
+        return state
+
+    @staticmethod
+    def is_compact(data):
+        """
+        This method checks if a save is of the compact format, rather than
+        a JSON save of an earlier version of the game.
+
+        input:
+        - data: the bytes of the save
+
+        return: bool
+        """
+        return data[:len(SaveFormat.MAGIC)] == SaveFormat.MAGIC
+
+    @staticmethod
+    def read(data):
+        """
+        This method reads a save of any format.
+
+        input:
+        - data: the bytes of the save
+
+        return: dict (the game state)
+        """
+        if SaveFormat.is_compact(data):
+            return SaveFormat.decode(data)
+        state = json.loads(data)
+        SaveFormat.check(state)
+        return state
+
+    @staticmethod
+    def check(state):
+        """
+        This method checks that the counts and places of a game state
+        match its game: the players and their dragons, the animals and
+        caves of the gameboard, the chit cards and the player to move.
+
+        input:
+        - state: the game state (a dict)
+
+        return: None, a ValueError is raised if the state is broken
+        """
+        try:
+            player_num = state["player_num"]
+            dragon_num = state["dragon_num"]
+            size = state["size"]
+            chit_cards = state["chit_cards"]
+            caves = state["gameboard"]["caves"]
+            animal_num = state["animal_num"]
+            if player_num < 1 or dragon_num < 1 or size < 1:
+                raise ValueError("The save has no player, dragon or volcano")
+            if not 1 <= animal_num <= AnimalType.DRAGON_PIRATE.value or \
+                    size % animal_num != 0:
+                raise ValueError("The animals of the save do not match its "
+                                 "gameboard")
+            if len(chit_cards) != len(GameEngine.create_deck()):
+                raise ValueError("The chit cards of the save do not match "
+                                 "the game")
+            if not 0 <= state["current_player"] < player_num:
+                raise ValueError("The player to move is not in the save")
+            if not 0 <= state["card_reveal"] <= len(chit_cards):
+                raise ValueError("The save reveals more chit cards than it "
+                                 "has")
+            if not 0 <= state.get("bot_num", 0) <= player_num:
+                raise ValueError("The save has more computer players than "
+                                 "players")
+            if len(caves) != max(GameBoard.MIN_CAVE,
+                                 player_num * dragon_num) or \
+                    len(set(caves)) != len(caves) or \
+                    any(not -size <= cave < 0 for cave in caves):
+                raise ValueError("The caves of the save do not match its "
+                                 "players")
+            players = state["players"]
+            if len(players) != player_num or \
+                    any(len(player["dragons"]) != dragon_num
+                        for player in players):
+                raise ValueError("The dragons of the save do not match its "
+                                 "players")
+            places = [dragon["board_pos"] for player in players
+                      for dragon in player["dragons"]]
+            if len(set(places)) != len(places) or \
+                    any(not 0 <= place < size and place not in caves
+                        for place in places) or \
+                    any(dragon["remaining_steps"] < 0 for player in players
+                        for dragon in player["dragons"]):
+                raise ValueError("The dragons of the save are not on free "
+                                 "lands of the gameboard")
+        except (KeyError, TypeError) as exception:
+            raise ValueError(f"The save is broken: {exception!r}") \
+                from exception
+
+    @staticmethod
+    def migrate(data):
+        """
+        This method converts a JSON save of an earlier version of the game
+        into the compact format. A compact save is returned as it is.
+
+        input:
+        - data: the bytes of the save
+
+        return: bytes
+        """
+        if SaveFormat.is_compact(data):
+            return data
+        return SaveFormat.encode(json.loads(data))
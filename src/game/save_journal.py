@@ -0,0 +1,298 @@
+from save_format import SaveFormat
+from save_manager import SaveManager
+
+import os
+import struct
+import zlib
+
+
+class SaveJournal:
+    """
+    This class is the append-only journal of a game's save file, so a
+    game is autosaved after every flip without writing the whole save.
+    The journal is next to the save file (the checkpoint) and keeps the
+    flips played since the checkpoint, 3 bytes each. A flip that ends
+    the turn also changes the turn when it is replayed, so the flip and
+    its turn change are written at once.
+    After a number of records, the game state is written as a new
+    checkpoint and the journal starts again empty (see checkpoint).
+
+    The journal starts with the checksum of its checkpoint, so a journal
+    left from an older checkpoint (e.g. a crash between writing the
+    checkpoint and starting the new journal) is not replayed. A record
+    cut by a crash is left out, and the replay stops at the first record
+    that is not legal in the game.
+
+    The records are flushed to the file as they are appended, and synced
+    to the disk by the fsync policy: after every record, after the flip
+    ending each turn, or never (left to the system).
+    With a save worker, the records and checkpoints are written by its 
+    background thread (write_records and write_checkpoint), and the game 
+    only packs them.
+    """
+    MAGIC = b"FDJL"
+    VERSION = 2         # 1 had separate records of the turn changes
+    HEADER = struct.Struct("<4sHI")     # Magic, version, checkpoint checksum
+    RECORD = struct.Struct("<BBB")      # Kind, chit card index, dragon index
+    FLIP = 0            # Record of a flip
+    NO_DRAGON = 255     # Dragon index of a flip that moves no dragon
+    FSYNC_ALWAYS = "always"
+    FSYNC_TURN = "turn"
+    FSYNC_NEVER = "never"
+    CHECKPOINT_RECORDS = 256    # Records before a new checkpoint
+
+    def __init__(self, file_path, fsync=FSYNC_TURN,
+                 checkpoint_records=CHECKPOINT_RECORDS, worker=None):
+        """
+        This method initializes the journal of a save file. The journal
+        is opened by checkpoint or replay.
+
+        input:
+        - file_path: the path of the save file
+        - fsync: the fsync policy (FSYNC_ALWAYS, FSYNC_TURN or FSYNC_NEVER)
+        - checkpoint_records: the number of records before a new checkpoint
+        - worker: the SaveWorker writing the journal, None to write it 
+                  right away
+
+        return: None
+        """
+        self.file_path = file_path
+        self.journal_path = file_path + ".journal"
+        self.fsync = fsync
+        self.checkpoint_records = checkpoint_records
+        self.worker = worker
+        self.file = None        # Journal opened for appending
+        self.record_num = 0     # Records since the checkpoint
+
+    def get_file_path(self):
+        """
+        The getter method to return the path of the save file.
+
+        return: str
+        """
+        return self.file_path
+
+    def get_record_num(self):
+        """
+        The getter method to return the number of records since the
+        checkpoint.
+
+        return: int
+        """
+        return self.record_num
+
+    def needs_checkpoint(self):
+        """
+        This method checks if the journal has enough records for a new
+        checkpoint.
+
+        return: bool
+        """
+        return self.record_num >= self.checkpoint_records
+
+    def append_flip(self, engine, move):
+        """
+        This method appends a flip to the journal, which is synced by the
+        fsync policy if the flip ends the turn.
+
+        input:
+        - engine: the game engine
+        - move: the move record of the flip
+
+        return: None
+        """
+        dragon_index = SaveJournal.NO_DRAGON
+        if move.get_dragon() is not None:
+            dragon_index = engine.get_dragons().index(move.get_dragon())
+        sync = self.fsync == SaveJournal.FSYNC_ALWAYS or \
+            (self.fsync == SaveJournal.FSYNC_TURN and move.is_end_turn())
+        self._append(SaveJournal.FLIP, move.get_card_index(), dragon_index,
+                     sync)
+
+    def checkpoint(self, game_state, tag=None):
+        """
+        This method writes the game state to the save file and starts the
+        journal again empty. Both files are replaced at once.
+
+        input:
+        - game_state: the game state (a dict), packed right away so it can 
+                      change while it is written
+        - tag: the tag of the completion event of the save worker, None 
+               for no event
+
+        return: None
+        """
+        save = SaveFormat.encode(game_state)
+        self.record_num = 0
+        if self.worker is None:
+            self.write_checkpoint(save)
+        else:
+            self.worker.checkpoint(self, save, tag)
+
+    def write_checkpoint(self, save):
+        """
+        This method writes a checkpoint: the save file and the journal
+        started again empty.
+
+        input:
+        - save: the bytes of the save (from SaveFormat.encode)
+
+        return: None
+        """
+        self.close()
+        SaveManager.write(self.file_path, save)
+        self._start(save)
+
+    def write_records(self, records, sync):
+        """
+        This method appends records to the journal file.
+
+        input:
+        - records: the bytes of the records
+        - sync: True to sync the journal to the disk
+
+        return: None
+        """
+        if self.file is None:
+            raise ValueError(f"The journal is not open: {self.journal_path}")
+        self.file.write(records)
+        self.file.flush()
+        if sync:
+            os.fsync(self.file.fileno())
+
+    def replay(self, engine):
+        """
+        This method plays the records of the journal on the game engine
+        of the save file, and opens the journal to append the next
+        records. A journal that is not of the save file is started again
+        empty.
+
+        input:
+        - engine: the game engine created from the save file
+
+        return: list of int (the indexes of the chit cards flipped by the
+                records played, in order)
+        """
+        self.close()
+        with open(self.file_path, "rb") as file:
+            save = file.read()
+        try:
+            with open(self.journal_path, "rb") as file:
+                data = file.read()
+        except OSError:
+            data = b""
+        self.record_num = 0
+        if len(data) < SaveJournal.HEADER.size or \
+                SaveJournal.HEADER.unpack_from(data, 0) != \
+                (SaveJournal.MAGIC, SaveJournal.VERSION, zlib.crc32(save)):
+            self._start(save)
+            return []
+
+        offset = SaveJournal.HEADER.size
+        flipped = []
+        while offset + SaveJournal.RECORD.size <= len(data):
+            record = SaveJournal.RECORD.unpack_from(data, offset)
+            if not self._play(engine, *record):
+                break
+            flipped.append(record[1])
+            offset += SaveJournal.RECORD.size
+            self.record_num += 1
+
+        # The records after the last one played are cut
+        self.file = open(self.journal_path, "r+b")
+        self.file.truncate(offset)
+        self.file.seek(offset)
+        return flipped
+
+    def close(self):
+        """
+        This method closes the journal file.
+
+        return: None
+        """
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def delete(self):
+        """
+        This method closes and removes the journal, e.g. when its game
+        ends.
+
+        return: None
+        """
+        self.close()
+        try:
+            os.remove(self.journal_path)
+        except OSError:
+            pass
+
+    def _start(self, save):
+        """
+        This method starts the journal of a checkpoint, empty, and opens
+        it to append the records. The number of records is not changed,
+        as it is counted by the game (see checkpoint), not by the save
+        worker.
+
+        input:
+        - save: the bytes of the save file
+
+        return: None
+        """
+        with open(self.journal_path + ".tmp", "wb") as file:
+            file.write(SaveJournal.HEADER.pack(
+                SaveJournal.MAGIC, SaveJournal.VERSION, zlib.crc32(save)))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(self.journal_path + ".tmp", self.journal_path)
+        self.file = open(self.journal_path, "ab")
+
+    def _append(self, kind, card_index, dragon_index, sync):
+        """
+        This method appends a record to the journal.
+
+        input:
+        - kind: the kind of the record (FLIP)
+        - card_index: the index of the chit card flipped
+        - dragon_index: the index of the dragon moved
+        - sync: True to sync the journal to the disk
+
+        return: None
+        """
+        record = SaveJournal.RECORD.pack(kind, card_index, dragon_index)
+        self.record_num += 1
+        if self.worker is None:
+            self.write_records(record, sync)
+        else:
+            self.worker.append(self, record, sync)
+
+    def _play(self, engine, kind, card_index, dragon_index):
+        """
+        This method plays a record on the game engine, and changes the
+        turn if the flip ends it.
+
+        input:
+        - engine: the game engine
+        - kind: the kind of the record
+        - card_index: the index of the chit card flipped
+        - dragon_index: the index of the dragon moved
+
+        return: bool (False if the record is not legal in the game)
+        """
+        if engine.get_winner() is not None:
+            return False
+        chit_cards = engine.get_chit_cards()
+        if kind != SaveJournal.FLIP or card_index >= len(chit_cards) or \
+                chit_cards[card_index].is_revealed():
+            return False
+        dragons = engine.get_dragons()
+        for move in engine.legal_outcomes(chit_cards[card_index]):
+            dragon = move.get_dragon()
+            if (dragon is None and dragon_index == SaveJournal.NO_DRAGON) \
+                    or (dragon is not None and dragon_index < len(dragons)
+                        and dragons[dragon_index] is dragon):
+                engine.apply(move)
+                if move.is_end_turn() and not move.is_end_game():
+                    engine.next_player()
+                return True
+        return False
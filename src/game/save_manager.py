@@ -1,12 +1,36 @@
+from save_format import SaveFormat
+
+import json
 import os
+import struct
+import threading
 import time
 
 
 class SaveManager:
     """
     Save manager class to manage the save files.
+    The save slots are indexed in memory (the size, last modified time,
+    number of players and player to move of each slot), so the pages can
+    show them without touching the files. The index is kept in a small
+    manifest file next to the save files, and is only refreshed when a
+    game is saved or cleared through the save manager, or when the
+    modified time of the save directory has changed (a file was added,
+    removed or replaced). A missing save file is an empty slot, and so
+    is a save file that cannot be read, so it is not offered to resume
+    and the next save replaces it.
+    The index is locked while it is read or changed, as the save worker
+    updates it from its thread when it writes a save file.
+    The games are saved in the compact format of SaveFormat. The JSON
+    save file of a slot from an earlier version of the game is converted
+    when the slots are indexed.
     """
     MEMORY_FILE_NUM = 3  # Set to 3 max save files
+    MEMORY_DIR = "src/memory"   # Directory of the save files
+    MANIFEST_FILE = "manifest.json"     # Index of the save slots
+    SLOTS = None        # Metadata of each slot (None if empty), once indexed
+    DIR_MTIME = None    # Modified time of the directory when indexed
+    LOCK = threading.RLock()    # Lock of the index and the manifest
 
     @staticmethod
     def get_save_file_path():
@@ -19,18 +43,30 @@ class SaveManager:
 
         return: the save file path
         """
-        earliest_created_filepath = None
-        earliest_date = float("inf")
-        for i in range(0, SaveManager.MEMORY_FILE_NUM):
-            file_path = f"src/memory/memo_{i}.json"
-            if os.path.getsize(file_path) == 0:
-                return file_path
-            date = os.path.getmtime(file_path)
-            if date < earliest_date:
-                earliest_date = date
-                earliest_created_filepath = file_path
+        slots = SaveManager.get_slots()
+        earliest = None
+        for i in range(SaveManager.MEMORY_FILE_NUM):
+            if slots[i] is None:
+                return SaveManager.slot_path(i)
+            if earliest is None or \
+                    slots[i]["mtime_ns"] < slots[earliest]["mtime_ns"]:
+                earliest = i
 
-        return earliest_created_filepath
+        return SaveManager.slot_path(earliest)
+
+    @staticmethod
+    def get_empty_save_file_path():
+        """
+        This method returns the path of an empty save slot, e.g. to 
+        autosave a new game without replacing a saved one.
+
+        return: the save file path, or None if every slot has a save
+        """
+        slots = SaveManager.get_slots()
+        for i in range(SaveManager.MEMORY_FILE_NUM):
+            if slots[i] is None:
+                return SaveManager.slot_path(i)
+        return None
 
     @staticmethod
     def show_save_files():
@@ -42,15 +78,14 @@ class SaveManager:
         return: list
         """
         file = []
-        for i in range(0, SaveManager.MEMORY_FILE_NUM):
-            file_path = f"src/memory/memo_{i}.json"
-            if os.path.getsize(file_path) != 0:
-                # Obtain the last modified timestamp of the file
-                m_timestamp = os.path.getmtime(file_path)
-                # Convert the timestamp to a readable date format
-                date = time.strftime('%Y-%m-%d %H:%M:%S',
-                                     time.localtime(m_timestamp))
-                file.append((file_path, date))
+        slots = SaveManager.get_slots()
+        for i in range(SaveManager.MEMORY_FILE_NUM):
+            if slots[i] is not None:
+                # Convert the last modified timestamp to a readable date
+                date = time.strftime(
+                    '%Y-%m-%d %H:%M:%S',
+                    time.localtime(slots[i]["mtime_ns"] / 1e9))
+                file.append((SaveManager.slot_path(i), date))
         return file
 
     @staticmethod
@@ -60,8 +95,300 @@ class SaveManager:
 
         return: bool
         """
-        for i in range(0, SaveManager.MEMORY_FILE_NUM):
-            file_path = f"src/memory/memo_{i}.json"
-            if os.path.getsize(file_path) != 0:
-                return True
-        return False
\ No newline at end of file
+        return any(slot is not None for slot in SaveManager.get_slots())
+
+    @staticmethod
+    def get_slots():
+        """
+        The getter method to return a copy of the metadata of the save 
+        slots: a dict of the size, the last modified time (in 
+        nanoseconds), the number of players and the player to move, or 
+        None for an empty slot. The dicts must not be changed.
+
+        return: list
+        """
+        with SaveManager.LOCK:
+            return list(SaveManager._get_slots())
+
+    @staticmethod
+    def slot_path(slot):
+        """
+        This method returns the file path of a save slot.
+
+        input:
+        - slot: the slot index
+
+        return: str
+        """
+        return f"{SaveManager.MEMORY_DIR}/memo_{slot}.sav"
+
+    @staticmethod
+    def save(file_path, game_state):
+        """
+        This method writes the game state to the save file and updates
+        the index of its slot.
+
+        input:
+        - file_path: the path of the save file
+        - game_state: the game state (a dict)
+
+        return: None
+        """
+        SaveManager.write(file_path, SaveFormat.encode(game_state))
+
+    @staticmethod
+    def write(file_path, data):
+        """
+        This method writes a save (from SaveFormat.encode) to the save 
+        file and updates the index of its slot. The save is written to a 
+        temporary file and replaces the save file at once, so a crash 
+        while saving keeps the previous save.
+
+        input:
+        - file_path: the path of the save file
+        - data: the bytes of the save
+
+        return: None
+        """
+        SaveManager._replace(file_path, data)
+        SaveManager._update_slot(file_path, SaveFormat.decode(data))
+
+    @staticmethod
+    def load(file_path):
+        """
+        This method reads the game state of a save file.
+
+        input:
+        - file_path: the path of the save file
+
+        return: dict (the game state)
+        """
+        with open(file_path, "rb") as file:
+            return SaveFormat.read(file.read())
+
+    @staticmethod
+    def clear(file_path):
+        """
+        This method empties the save file (e.g. when its game ends) and
+        updates the index of its slot.
+
+        input:
+        - file_path: the path of the save file
+
+        return: None
+        """
+        with open(file_path, "w") as file:
+            file.truncate()
+        SaveManager._update_slot(file_path, None)
+
+    @staticmethod
+    def refresh():
+        """
+        This method refreshes the index of the save slots if the save
+        directory has changed since it was indexed, e.g. when a page
+        showing the save slots is opened. Each slot in the manifest is
+        checked with the size and modified time of its file, and only the
+        changed files are read again.
+
+        return: None
+        """
+        with SaveManager.LOCK:
+            dir_mtime = SaveManager._dir_mtime()
+            if SaveManager.SLOTS is not None and \
+                    dir_mtime == SaveManager.DIR_MTIME:
+                return
+
+            for i in range(SaveManager.MEMORY_FILE_NUM):
+                SaveManager._migrate_slot(i)
+            manifest = SaveManager._read_manifest()
+            slots = [SaveManager._index_slot(i, manifest[i])
+                     for i in range(SaveManager.MEMORY_FILE_NUM)]
+            SaveManager.SLOTS = slots
+            if slots != manifest:
+                SaveManager._write_manifest()
+            else:
+                SaveManager.DIR_MTIME = dir_mtime
+
+    @staticmethod
+    def _get_slots():
+        """
+        This method returns the index of the save slots, indexing the save
+        files the first time. The lock must be held.
+
+        return: list
+        """
+        if SaveManager.SLOTS is None:
+            SaveManager.refresh()
+        return SaveManager.SLOTS
+
+    @staticmethod
+    def _update_slot(file_path, game_state):
+        """
+        This method updates the index after a save file was written, 
+        e.g. by the thread of the save worker.
+
+        input:
+        - file_path: the path of the save file
+        - game_state: the game state written, None if the file was emptied
+
+        return: None
+        """
+        with SaveManager.LOCK:
+            slots = SaveManager._get_slots()
+            for i in range(SaveManager.MEMORY_FILE_NUM):
+                if os.path.normpath(file_path) == \
+                        os.path.normpath(SaveManager.slot_path(i)):
+                    slots[i] = None
+                    if game_state is not None:
+                        slots[i] = SaveManager._slot_entry(
+                            os.stat(file_path), game_state)
+                    SaveManager._write_manifest()
+
+    @staticmethod
+    def _index_slot(slot, entry):
+        """
+        This method finds the metadata of a save slot. The entry of the
+        manifest is kept if the file has not changed, otherwise the file
+        is read. A file that cannot be read is an empty slot.
+
+        input:
+        - slot: the slot index
+        - entry: the entry of the slot in the manifest, or None
+
+        return: dict, or None if the slot is empty
+        """
+        file_path = SaveManager.slot_path(slot)
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return None     # A missing file is an empty slot
+        if stat.st_size == 0:
+            return None
+        if isinstance(entry, dict) and entry.get("size") == stat.st_size \
+                and entry.get("mtime_ns") == stat.st_mtime_ns \
+                and entry.get("player_num") is not None:
+            return entry
+
+        try:
+            game_state = SaveManager.load(file_path)
+        except (OSError, ValueError):
+            return None
+        return SaveManager._slot_entry(stat, game_state)
+
+    @staticmethod
+    def _migrate_slot(slot):
+        """
+        This method converts the JSON save file of a slot from an earlier
+        version of the game, and removes it. It is kept if the slot
+        already has a save or it cannot be converted.
+
+        input:
+        - slot: the slot index
+
+        return: None
+        """
+        legacy_path = f"{SaveManager.MEMORY_DIR}/memo_{slot}.json"
+        try:
+            with open(legacy_path, "rb") as file:
+                data = file.read()
+        except OSError:
+            return
+        if data:
+            file_path = SaveManager.slot_path(slot)
+            if os.path.exists(file_path) and os.path.getsize(file_path) > 0:
+                return
+            try:
+                data = SaveFormat.migrate(data)
+                SaveFormat.decode(data)
+            except (ValueError, KeyError, TypeError, struct.error):
+                return
+            # Written at once and synced before the JSON save file is
+            # removed, so the save is never lost half converted. The index
+            # is not updated, as it is made again after the conversion.
+            SaveManager._replace(file_path, data)
+        os.remove(legacy_path)
+
+    @staticmethod
+    def _replace(file_path, data):
+        """
+        This method replaces a file at once: the data is written to a
+        temporary file, synced to the disk and renamed to the file.
+
+        input:
+        - file_path: the path of the file
+        - data: the bytes to write
+
+        return: None
+        """
+        with open(file_path + ".tmp", "wb") as file:
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(file_path + ".tmp", file_path)
+
+    @staticmethod
+    def _slot_entry(stat, game_state):
+        """
+        This method creates the metadata of a save slot.
+
+        input:
+        - stat: the os.stat result of the save file
+        - game_state: the game state in the file
+
+        return: dict
+        """
+        return {
+            "size": stat.st_size,
+            "mtime_ns": stat.st_mtime_ns,
+            "player_num": game_state.get("player_num"),
+            "turn": game_state.get("current_player")
+        }
+
+    @staticmethod
+    def _read_manifest():
+        """
+        This method reads the slot entries of the manifest file. A missing
+        or broken manifest has no entries.
+
+        return: list
+        """
+        try:
+            with open(f"{SaveManager.MEMORY_DIR}/{SaveManager.MANIFEST_FILE}",
+                      "r") as file:
+                slots = json.load(file)["slots"]
+        except (OSError, ValueError, KeyError, TypeError):
+            slots = []
+        slots = list(slots[:SaveManager.MEMORY_FILE_NUM])
+        return slots + [None] * (SaveManager.MEMORY_FILE_NUM - len(slots))
+
+    @staticmethod
+    def _write_manifest():
+        """
+        This method writes the index to the manifest file, replacing it
+        at once, and remembers the modified time of the directory after
+        the write, so the write does not look like a change.
+        The index is still kept in memory if the manifest cannot be
+        written. The lock must be held.
+
+        return: None
+        """
+        manifest_path = f"{SaveManager.MEMORY_DIR}/{SaveManager.MANIFEST_FILE}"
+        try:
+            with open(manifest_path + ".tmp", "w") as file:
+                json.dump({"slots": SaveManager.SLOTS}, file)
+            os.replace(manifest_path + ".tmp", manifest_path)
+        except OSError:
+            pass
+        SaveManager.DIR_MTIME = SaveManager._dir_mtime()
+
+    @staticmethod
+    def _dir_mtime():
+        """
+        This method returns the modified time of the save directory.
+
+        return: int (nanoseconds), or None if there is no directory
+        """
+        try:
+            return os.stat(SaveManager.MEMORY_DIR).st_mtime_ns
+        except OSError:
+            return None
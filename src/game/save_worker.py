@@ -0,0 +1,170 @@
+from collections import deque
+
+import threading
+
+
+class SaveWorker:
+    """
+    This class writes the save journals in a background thread, so a
+    save never blocks a frame of the game.
+    The game packs what it saves (a record or the bytes of a checkpoint)
+    and hands it to the worker, which writes the jobs in order. The
+    waiting jobs are merged: the records of a journal are written
+    together, and a checkpoint replaces the jobs of its journal still
+    waiting, as it already holds them. The queue is bounded, so a game
+    saving faster than the disk writes waits for room instead of growing
+    the queue.
+    A checkpoint with a tag gives a completion event once written (see
+    poll), e.g. to show that the game was saved, and a failed job always
+    gives one.
+    """
+    QUEUE_SIZE = 8      # Jobs waiting before a new job waits for room
+    RECORDS = "records"
+    CHECKPOINT = "checkpoint"
+
+    def __init__(self, queue_size=QUEUE_SIZE):
+        """
+        This method initializes the save worker. Its thread is started 
+        with the first job.
+
+        input:
+        - queue_size: the number of jobs waiting before a new job waits
+
+        return: None
+        """
+        self.queue_size = queue_size
+        # Jobs waiting: [journal, kind, data, sync, tags]
+        self.jobs = deque()
+        self.events = deque()   # Completion events not polled yet
+        self.busy = False       # The thread is writing a job
+        self.running = True
+        self.condition = threading.Condition()
+        self.thread = None
+
+    def append(self, journal, records, sync):
+        """
+        This method adds records to write to a journal.
+
+        input:
+        - journal: the SaveJournal
+        - records: the bytes of the records
+        - sync: True to sync the journal to the disk after them
+
+        return: None
+        """
+        with self.condition:
+            if self.jobs and self.jobs[-1][0] is journal and \
+                    self.jobs[-1][1] == SaveWorker.RECORDS:
+                self.jobs[-1][2] += records
+                self.jobs[-1][3] = self.jobs[-1][3] or sync
+                return
+            self._put([journal, SaveWorker.RECORDS, records, sync, []])
+
+    def checkpoint(self, journal, save, tag=None):
+        """
+        This method adds a checkpoint to write for a journal, which
+        replaces the jobs of the journal still waiting.
+
+        input:
+        - journal: the SaveJournal
+        - save: the bytes of the save (from SaveFormat.encode)
+        - tag: the tag of the completion event, None for no event
+
+        return: None
+        """
+        with self.condition:
+            tags = []
+            for job in [job for job in self.jobs if job[0] is journal]:
+                tags.extend(job[4])
+                self.jobs.remove(job)
+            if tag is not None:
+                tags.append(tag)
+            self._put([journal, SaveWorker.CHECKPOINT, save, True, tags])
+
+    def poll(self):
+        """
+        This method returns the completion events since the last poll.
+
+        return: list of (tag, save file path, error message or None)
+        """
+        events = []
+        while self.events:
+            events.append(self.events.popleft())
+        return events
+
+    def wait(self):
+        """
+        This method waits until every job is written.
+
+        return: None
+        """
+        with self.condition:
+            self.condition.wait_for(lambda: not self.jobs and not self.busy)
+
+    def close(self):
+        """
+        This method writes the jobs left and stops the thread. The thread
+        is a daemon, so the game closes the worker before it quits, or the
+        jobs left would be lost.
+
+        return: None
+        """
+        if self.thread is None:
+            return
+        self.wait()
+        with self.condition:
+            self.running = False
+            self.condition.notify_all()
+        self.thread.join()
+        self.thread = None
+
+    def _put(self, job):
+        """
+        This method adds a job to the queue, waiting for room. The
+        condition must be held.
+
+        input:
+        - job: the job
+
+        return: None
+        """
+        if self.thread is None:
+            self.running = True
+            self.thread = threading.Thread(target=self._run, daemon=True)
+            self.thread.start()
+        self.condition.wait_for(lambda: len(self.jobs) < self.queue_size)
+        self.jobs.append(job)
+        self.condition.notify_all()
+
+    def _run(self):
+        """
+        This method writes the jobs in order. It runs in the background
+        thread.
+
+        return: None
+        """
+        while True:
+            with self.condition:
+                self.condition.wait_for(lambda: self.jobs or not self.running)
+                if not self.jobs:
+                    return
+                journal, kind, data, sync, tags = self.jobs.popleft()
+                self.busy = True
+                self.condition.notify_all()
+
+            error = None
+            try:
+                if kind == SaveWorker.CHECKPOINT:
+                    journal.write_checkpoint(data)
+                else:
+                    journal.write_records(data, sync)
+            except (OSError, ValueError) as exception:
+                error = str(exception)
+            if error is not None and not tags:
+                tags = [None]
+            for tag in tags:
+                self.events.append((tag, journal.get_file_path(), error))
+
+            with self.condition:
+                self.busy = False
+                self.condition.notify_all()
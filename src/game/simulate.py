@@ -0,0 +1,134 @@
+from engine.simulator import Simulator
+from engine.simulation_stats import SimulationStats
+from engine.replay_policy import ReplayPolicy
+from engine.game_random import GameRandom
+
+import argparse
+import time
+
+
+class Simulate:
+    """
+    This class plays many games headless and prints the win rate of each 
+    seat. It is used to judge the fairness of the game settings.
+    Run this class with --help to see the options, e.g.
+    python src/game/simulate.py --games 100000 --players 4
+    """
+
+    def __init__(self, args=None):
+        """
+        This method initializes the simulation from the command line 
+        arguments.
+
+        input:
+        - args: the list of arguments, None for the command line
+
+        return: None
+        """
+        parser = argparse.ArgumentParser(
+            description="Simulate Fiery Dragons games headless.")
+        parser.add_argument("--games", type=int, default=10000,
+                            help="number of games")
+        parser.add_argument("--seed", type=int, default=0,
+                            help="seed of the first game")
+        parser.add_argument("--players", type=int, default=4,
+                            help="number of players")
+        parser.add_argument("--dragons", type=int, default=1,
+                            help="number of dragons per player")
+        parser.add_argument("--size", type=int, default=24,
+                            help="number of volcanoes")
+        parser.add_argument("--animals", type=int, default=4,
+                            help="number of animal types")
+        parser.add_argument("--policy", default="memory",
+                            choices=sorted(Simulator.POLICIES),
+                            help="card-pick policy of the players")
+        parser.add_argument("--max-turns", type=int,
+                            default=Simulator.MAX_TURNS,
+                            help="turns before a game is stopped")
+        parser.add_argument("--rng-mode", default=GameRandom.STREAMS,
+                            choices=GameRandom.MODES,
+                            help="random sub-streams of the games (legacy "
+                                 "for the layouts of the old saves)")
+        parser.add_argument("--workers", type=int, default=None,
+                            help="number of processes (default: CPUs)")
+        parser.add_argument("--batch", action="store_true",
+                            help="play the games in lockstep with NumPy")
+        parser.add_argument("--numpy-layouts", action="store_true",
+                            help="shuffle the batch layouts with NumPy "
+                                 "(faster, layouts do not follow the seeds)")
+        parser.add_argument("--validate", action="store_true",
+                            help="replay the batch games on the game engine "
+                                 "and count the games that differ")
+        self.args = parser.parse_args(args)
+        if self.args.validate and self.args.numpy_layouts:
+            parser.error("--validate needs the layouts of the seeds")
+        self.simulator = Simulator(self.args.players, self.args.dragons,
+                                   self.args.size, self.args.animals,
+                                   self.args.policy, self.args.max_turns,
+                                   self.args.rng_mode)
+        self.stats = SimulationStats(self.args.players)
+
+    def get_stats(self):
+        """
+        The getter method to return the statistics of the simulation.
+
+        return: SimulationStats
+        """
+        return self.stats
+
+    def run(self):
+        """
+        Run the simulation and print the results.
+
+        return: None
+        """
+        start = time.perf_counter()
+        if self.args.batch:
+            results = self._run_batch()
+        else:
+            results = self.simulator.run(self.args.games, self.args.seed,
+                                         self.args.workers)
+        for result in results:
+            self.stats.add(result)
+        elapsed = time.perf_counter() - start
+
+        print(self.stats.table())
+        print(f"{self.stats.get_game_num() / elapsed:.0f} games/s")
+
+    def _run_batch(self):
+        """
+        This method plays the games with the batch simulator, which needs
+        NumPy. When validating, every game is replayed on the game engine
+        with the same card picks and the differences are counted.
+
+        return: generator of tuples (the game results)
+        """
+        try:
+            from engine.batch_simulator import BatchSimulator
+        except ImportError:
+            raise SystemExit("--batch needs NumPy (pip install numpy)")
+
+        batch_simulator = BatchSimulator(
+            self.args.players, self.args.dragons, self.args.size,
+            self.args.animals, self.args.policy, self.args.max_turns,
+            not self.args.numpy_layouts, self.args.rng_mode)
+        mismatches = 0
+        for result in batch_simulator.run(self.args.games, self.args.seed,
+                                          self.args.seed,
+                                          self.args.validate):
+            if self.args.validate:
+                picks = result[-1]
+                result = result[:-1]
+                replay = self.simulator.play_game(result[0],
+                                                  ReplayPolicy(picks))
+                if replay != result:
+                    mismatches += 1
+            yield result
+        if self.args.validate:
+            print(f"validated: {mismatches} of {self.args.games} games "
+                  f"differ from the game engine")
+
+
+if __name__ == "__main__":
+    simulate = Simulate()
+    simulate.run()
@@ -0,0 +1,140 @@
+from engine.game_engine import GameEngine
+from engine.memory_policy import MemoryPolicy
+from engine.simulator import Simulator
+from engine.win_solver import WinSolver
+from save_manager import SaveManager
+
+import argparse
+import time
+
+
+class Solve:
+    """
+    This class prints the exact chance of each seat to win a game when
+    every player flips with the memory policy. The chances do not hold
+    for other players. The game is a saved game, or a new game played by
+    the memory policy for a number of flips first, as the first turns
+    have too many states to solve. When the solver gives up, it says so,
+    and the chances it found are only lower bounds.
+    Run this class with --help to see the options, e.g.
+    python src/game/solve.py --players 2 --flips 30
+    """
+
+    def __init__(self, args=None):
+        """
+        This method initializes the solve from the command line arguments.
+
+        input:
+        - args: the list of arguments, None for the command line
+
+        return: None
+        """
+        parser = argparse.ArgumentParser(
+            description="Solve the chance of each seat to win a Fiery "
+                        "Dragons game.")
+        parser.add_argument("--save", default=None,
+                            help="saved game to solve (the chit cards "
+                                 "revealed are the ones seen)")
+        parser.add_argument("--seed", type=int, default=0,
+                            help="seed of the new game")
+        parser.add_argument("--players", type=int, default=2,
+                            help="number of players")
+        parser.add_argument("--dragons", type=int, default=1,
+                            help="number of dragons per player")
+        parser.add_argument("--size", type=int, default=24,
+                            help="number of volcanoes")
+        parser.add_argument("--animals", type=int, default=4,
+                            help="number of animal types")
+        parser.add_argument("--flips", type=int, default=0,
+                            help="flips of the memory policy before the "
+                                 "new game is solved")
+        parser.add_argument("--max-states", type=int,
+                            default=WinSolver.MAX_STATES,
+                            help="states searched before giving up")
+        parser.add_argument("--steps-cap", type=int,
+                            default=WinSolver.STEPS_CAP,
+                            help="remaining steps of a state not solved")
+        self.args = parser.parse_args(args)
+        self.solver = WinSolver(self.args.max_states, self.args.steps_cap)
+
+    def get_solver(self):
+        """
+        The getter method to return the solver.
+
+        return: WinSolver
+        """
+        return self.solver
+
+    def run(self):
+        """
+        Solve the game and print the chance of each seat.
+
+        return: None
+        """
+        try:
+            engine, known = self._create_game()
+        except (OSError, ValueError) as exception:
+            print(f"cannot read the save: {exception}")
+            return
+        if engine.get_winner() is not None:
+            print(f"the game is over, seat "
+                  f"{engine.get_current_player().get_id() + 1} won")
+            return
+
+        start = time.perf_counter()
+        chances = self.solver.solve(engine, known)
+        elapsed = time.perf_counter() - start
+        if chances is None:
+            print(f"the solver gave up: more than {self.args.max_states} "
+                  f"states, flip more chit cards first ({elapsed:.1f}s)")
+            return
+
+        print(f"seat {engine.get_current_player().get_id() + 1} to move, "
+              f"{len(known)} chit cards seen")
+        bound = ""
+        if not self.solver.is_exact():
+            print(f"the solver gave up on "
+                  f"{self.solver.get_undecided():.2%} of the chance, the "
+                  f"chances are not exact but lower bounds")
+            bound = "at least "
+        for seat, chance in enumerate(chances):
+            print(f"seat {seat + 1}: {bound}{chance:.6f}")
+        print(f"undecided: {self.solver.get_undecided():.2e}")
+        print(f"{self.solver.get_state_num()} states, "
+              f"{self.solver.get_sweeps()} sweeps, {elapsed:.2f}s")
+
+    def _create_game(self):
+        """
+        This method loads the saved game, or creates the new game and
+        plays the flips of the memory policy.
+
+        return: GameEngine, set of int (the indexes of the chit cards seen)
+        """
+        if self.args.save is not None:
+            engine = GameEngine.from_state(SaveManager.load(self.args.save))
+            chit_cards = engine.get_chit_cards()
+            return engine, {i for i in range(len(chit_cards))
+                            if chit_cards[i].is_revealed()}
+
+        engine = GameEngine(self.args.seed, self.args.players,
+                            self.args.dragons, self.args.size,
+                            self.args.animals)
+        policy = MemoryPolicy(engine.get_rng().stream(Simulator.POLICY))
+        chit_cards = engine.get_chit_cards()
+        known = set()
+        for _ in range(self.args.flips):
+            index = policy.choose(engine)
+            end_turn, end_game = engine.flip(chit_cards[index],
+                                             policy.choose_move)
+            policy.observe(index, chit_cards[index])
+            known.add(index)
+            if end_game:
+                break
+            if end_turn:
+                engine.next_player()
+        return engine, known
+
+
+if __name__ == "__main__":
+    solve = Solve()
+    solve.run()
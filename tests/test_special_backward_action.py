@@ -0,0 +1,110 @@
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "src", "game"))
+
+from action.special_backward_action import SpecialBackwardAction
+from engine.game_engine import GameEngine
+
+
+class LoopBackwardAction(SpecialBackwardAction):
+    """
+    The Dragon Pirate penalty as it was played before the occupancy
+    lookup: the volcanoes behind the destination are checked one by one.
+    """
+
+    def _valid_destination(self, destination):
+        final_destination = None
+        while destination != self.dragon.get_board_pos():
+            # Check whether volcano is occupied
+            if not self.gameboard.is_free(destination):
+                destination = (destination - 1) % self.volcano_size
+                self.remaining_steps += 1
+            else:
+                final_destination = destination
+                break
+
+        if final_destination is None:
+            return False
+        else:
+            self.destination = final_destination
+            return True
+
+
+def loop_free_tile_behind(gameboard, tile):
+    """
+    This function finds the nearest unoccupied tile at or behind the tile
+    by checking the tiles one by one.
+    """
+    size = gameboard.get_size()
+    for distance in range(size):
+        free_tile = (tile - distance) % size
+        if gameboard.is_free(free_tile):
+            return free_tile, distance
+    return None, None
+
+
+def set_tiles(gameboard, dragon, pos, tiles):
+    """
+    This function puts the dragon on the tile pos and sets the occupancy
+    of the other tiles, keeping the occupancy of the caves.
+    """
+    dragon.move(pos, gameboard)
+    size = gameboard.get_size()
+    caves = gameboard.get_occupancy() >> size << size
+    gameboard.set_occupancy(caves | tiles | 1 << pos)
+
+
+def test_find_free_tile_behind_matches_loop():
+    rng = random.Random(11)
+    engine = GameEngine(11, 4)
+    gameboard = engine.get_gameboard()
+    size = gameboard.get_size()
+    for _ in range(500):
+        # Sparse, dense and full boards
+        tiles = rng.getrandbits(size) | rng.getrandbits(size) \
+            | rng.choice([0, rng.getrandbits(size), (1 << size) - 1])
+        gameboard.set_occupancy(tiles)
+        for tile in range(size):
+            assert gameboard.find_free_tile_behind(tile) == \
+                loop_free_tile_behind(gameboard, tile)
+
+
+def test_find_free_tile_behind_wraps_around():
+    engine = GameEngine(3, 2)
+    gameboard = engine.get_gameboard()
+    size = gameboard.get_size()
+    # Only the last tile is free, so every search but its own wraps
+    gameboard.set_occupancy(((1 << size) - 1) & ~(1 << (size - 1)))
+    assert gameboard.find_free_tile_behind(0) == (size - 1, 1)
+    assert gameboard.find_free_tile_behind(5) == (size - 1, 6)
+    assert gameboard.find_free_tile_behind(size - 1) == (size - 1, 0)
+
+
+def test_find_free_tile_behind_full_board():
+    engine = GameEngine(3, 2)
+    gameboard = engine.get_gameboard()
+    gameboard.set_occupancy((1 << gameboard.get_size()) - 1)
+    for tile in range(gameboard.get_size()):
+        assert gameboard.find_free_tile_behind(tile) == (None, None)
+
+
+def test_special_backward_action_matches_loop():
+    rng = random.Random(20)
+    for seed in range(20):
+        engine = GameEngine(seed, rng.choice([2, 3, 4]))
+        gameboard = engine.get_gameboard()
+        size = gameboard.get_size()
+        dragon = engine.get_dragons()[0]
+        for _ in range(200):
+            pos = rng.randrange(size)
+            tiles = rng.choice([0, rng.getrandbits(size),
+                                rng.getrandbits(size) | rng.getrandbits(size),
+                                (1 << size) - 1])
+            set_tiles(gameboard, dragon, pos, tiles)
+            dragon.set_remaining_steps(rng.randrange(1, 2 * size))
+            step = rng.randint(1, size)
+            expected = LoopBackwardAction(dragon, step, gameboard).outcome()
+            assert SpecialBackwardAction(dragon, step, gameboard).outcome() \
+                == expected